@@ -0,0 +1,284 @@
+"""
+generate_data.py
+Synthetic source workbooks for the pipeline benchmarks.
+
+The generated workbook has the same sheets and headers as
+raw_data_source.xlsx, with Customers, Products, Orders and OrderDetails
+scaled by an integer factor:
+
+    copy k of every customer / product / order gets a new natural key,
+    and copy k of an order only references copy k of customers and
+    products, so referential integrity holds at every scale.
+
+Small reference sheets (Categories, Employees, Region, Shippers,
+Suppliers, Territories) are copied as-is.
+
+A scale whose sheets would exceed Excel's row limit is split by
+generate_source into a directory of workbooks, each holding a range of
+copies (the reference sheets only in the first one); the pipeline
+stages such a directory as one source.
+
+`generation` produces controlled SCD changes: in generation g a fraction
+`change_rate` of customers, products, employees and territories changes
+its tracked attributes (deterministically, per key and generation), so
+loading generation 0 and then generation 1 exercises the SCD1/2/3 merges
+with a known change volume.
+
+Usage:
+    python -m benchmarks.generate_data --scale 10 --output benchmarks/data/scale_10.xlsx
+    python -m benchmarks.generate_data --scale 1000 --output benchmarks/data/scale_1000
+"""
+
+import os
+import glob
+import random
+import argparse
+
+import openpyxl
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(PROJECT_ROOT, "raw_data_source.xlsx")
+
+EXCEL_MAX_DATA_ROWS = 1048575   # 1,048,576 rows per sheet minus the header
+
+PRODUCT_ID_STRIDE = 1000        # copy k of product p -> k * 1000 + p
+ORDER_ID_STRIDE = 100000        # copy k of order o   -> k * 100000 + o
+
+SCALED_SHEETS = ("Customers", "Products", "Orders", "OrderDetails")
+
+
+def read_template(path: str = TEMPLATE_PATH) -> dict:
+    """Return {sheet: (header, [rows])} of the template workbook, in sheet order."""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            sheets[ws.title] = (header, [list(row) for row in rows if any(v is not None for v in row)])
+        return sheets
+    finally:
+        wb.close()
+
+
+def sheet_row_counts(template: dict, scale: int) -> dict:
+    """Rows per sheet of a generated workbook."""
+    return {
+        sheet: len(rows) * (scale if sheet in SCALED_SHEETS else 1)
+        for sheet, (_, rows) in template.items()
+    }
+
+
+def workbook_copies(template: dict, scale: int) -> list:
+    """
+    Split the `scale` copies into as few, evenly sized ranges as keep every
+    scaled sheet of a workbook within EXCEL_MAX_DATA_ROWS.
+    """
+    largest = max(len(rows) for sheet, (_, rows) in template.items() if sheet in SCALED_SHEETS)
+    per_workbook = max(1, EXCEL_MAX_DATA_ROWS // max(1, largest))
+    parts = -(-scale // per_workbook)
+    bounds = [scale * part // parts for part in range(parts + 1)]
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:])]
+
+
+def _last_change(seed, key, generation, change_rate) -> int:
+    """Latest generation (<= generation) in which `key` changed, 0 if never."""
+    for g in range(generation, 0, -1):
+        if random.Random(f"{seed}:{key}:{g}").random() < change_rate:
+            return g
+    return 0
+
+
+def _customer_key(customer_id, copy):
+    return customer_id if copy == 0 else f"{customer_id}{copy:04d}"
+
+
+def _customers(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for copy in copies:
+        for base in rows:
+            row = list(base)
+            key = _customer_key(base[col["CustomerID"]], copy)
+            row[col["CustomerID"]] = key
+            if copy:
+                row[col["CompanyName"]] = f"{base[col['CompanyName']]} #{copy}"
+            changed = _last_change(seed, f"C:{key}", generation, change_rate)
+            if changed:
+                # SCD2 tracked attributes
+                row[col["ContactTitle"]] = f"{base[col['ContactTitle']]} (rev {changed})"
+                row[col["Phone"]] = f"{base[col['Phone']]}-{changed}"
+            yield row
+
+
+def _products(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for copy in copies:
+        for base in rows:
+            row = list(base)
+            key = copy * PRODUCT_ID_STRIDE + base[col["ProductID"]]
+            row[col["ProductID"]] = key
+            if copy:
+                row[col["ProductName"]] = f"{base[col['ProductName']]} #{copy}"
+            changed = _last_change(seed, f"P:{key}", generation, change_rate)
+            if changed:
+                row[col["UnitPrice"]] = round(float(base[col["UnitPrice"]] or 0) * (1 + 0.1 * changed), 2)
+            yield row
+
+
+def _orders(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for copy in copies:
+        for base in rows:
+            row = list(base)
+            row[col["OrderID"]] = copy * ORDER_ID_STRIDE + base[col["OrderID"]]
+            row[col["CustomerID"]] = _customer_key(base[col["CustomerID"]], copy)
+            yield row
+
+
+def _order_details(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for copy in copies:
+        for base in rows:
+            row = list(base)
+            row[col["OrderID"]] = copy * ORDER_ID_STRIDE + base[col["OrderID"]]
+            row[col["ProductID"]] = copy * PRODUCT_ID_STRIDE + base[col["ProductID"]]
+            yield row
+
+
+def _employees(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for base in rows:
+        row = list(base)
+        changed = _last_change(seed, f"E:{base[col['EmployeeID']]}", generation, change_rate)
+        if changed:
+            row[col["Title"]] = f"{base[col['Title']]} (rev {changed})"
+        yield row
+
+
+def _territories(header, rows, copies, generation, change_rate, seed):
+    col = {name: i for i, name in enumerate(header)}
+    for base in rows:
+        row = list(base)
+        changed = _last_change(seed, f"T:{base[col['TerritoryID']]}", generation, change_rate)
+        if changed:
+            # SCD3: current description moves to prior
+            row[col["TerritoryDescription"]] = f"{base[col['TerritoryDescription']]} (rev {changed})"
+        yield row
+
+
+def _copy(header, rows, copies, generation, change_rate, seed):
+    return iter(rows)
+
+
+GENERATORS = {
+    "Customers": _customers,
+    "Products": _products,
+    "Orders": _orders,
+    "OrderDetails": _order_details,
+    "Employees": _employees,
+    "Territories": _territories,
+}
+
+
+def _check_scale(scale):
+    if scale < 1:
+        raise ValueError("scale must be >= 1")
+    if scale * PRODUCT_ID_STRIDE > 2 ** 31 or scale * ORDER_ID_STRIDE + ORDER_ID_STRIDE > 2 ** 31:
+        raise ValueError(f"scale {scale} overflows INT natural keys")
+
+
+def generate_workbook(output_path: str, scale: int = 1, generation: int = 0,
+                      change_rate: float = 0.05, seed: int = 206,
+                      template: dict = None, copies: range = None) -> dict:
+    """
+    Write a synthetic workbook and return its row count per sheet.
+
+    `copies` limits the scaled sheets to a range of copies (default: all
+    `scale` of them) and writes the reference sheets only when it starts
+    at copy 0; see generate_source.
+
+    Rows are streamed into a write-only workbook, so memory stays flat
+    apart from the (small) template itself.
+    """
+    _check_scale(scale)
+    copies = range(scale) if copies is None else copies
+
+    template = template or read_template()
+    counts = sheet_row_counts(template, len(copies))
+    if copies.start != 0:
+        counts = {sheet: rows if sheet in SCALED_SHEETS else 0 for sheet, rows in counts.items()}
+    too_large = {sheet: rows for sheet, rows in counts.items() if rows > EXCEL_MAX_DATA_ROWS}
+    if too_large:
+        raise ValueError(
+            f"scale {scale} exceeds the Excel sheet limit of {EXCEL_MAX_DATA_ROWS} rows: "
+            + ", ".join(f"{sheet}={rows}" for sheet, rows in too_large.items())
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet, (header, rows) in template.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(header)
+        if sheet not in SCALED_SHEETS and copies.start != 0:
+            continue
+        for row in GENERATORS.get(sheet, _copy)(header, rows, copies, generation, change_rate, seed):
+            ws.append(row)
+    wb.save(output_path)
+
+    return counts
+
+
+def generate_source(output_path: str, scale: int = 1, generation: int = 0,
+                    change_rate: float = 0.05, seed: int = 206,
+                    template: dict = None) -> (str, dict):
+    """
+    Write the synthetic source for `scale`: the workbook `output_path`.xlsx
+    if it fits Excel's row limit, otherwise the directory `output_path` of
+    workbooks part_001.xlsx, part_002.xlsx, ... (see workbook_copies).
+
+    Returns:
+        (str, dict): the source path to stage, row count per sheet over all workbooks
+    """
+    _check_scale(scale)
+    template = template or read_template()
+    parts = workbook_copies(template, scale)
+    if len(parts) == 1:
+        path = output_path + ".xlsx"
+        return path, generate_workbook(path, scale, generation, change_rate, seed, template)
+
+    os.makedirs(output_path, exist_ok=True)
+    for stale in glob.glob(os.path.join(output_path, "part_*.xlsx")):
+        os.remove(stale)
+    counts = {}
+    for number, copies in enumerate(parts, start=1):
+        part_path = os.path.join(output_path, f"part_{number:03d}.xlsx")
+        part_counts = generate_workbook(part_path, scale, generation, change_rate, seed, template, copies)
+        for sheet, rows in part_counts.items():
+            counts[sheet] = counts.get(sheet, 0) + rows
+    return output_path, counts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic source workbook")
+    parser.add_argument("--scale", type=int, default=1, help="Multiple of the template row counts")
+    parser.add_argument("--generation", type=int, default=0, help="SCD change generation (0 = baseline)")
+    parser.add_argument("--change_rate", type=float, default=0.05, help="Share of keys changed per generation")
+    parser.add_argument("--seed", type=int, default=206)
+    parser.add_argument("--output", required=True,
+                        help="Path of the .xlsx to write (without .xlsx: split into a directory if needed)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.output.endswith(".xlsx"):
+        counts = generate_workbook(args.output, args.scale, args.generation, args.change_rate, args.seed)
+    else:
+        path, counts = generate_source(args.output, args.scale, args.generation, args.change_rate, args.seed)
+        print(f"Wrote {path}")
+    for sheet, rows in counts.items():
+        print(f"{sheet}: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+/* ===========================================================
+   reset_warehouse.sql
+   Empties the fact, aggregate and dimension tables between
+   benchmark scales so every scale starts from the same (empty)
+   state.
+   DELETE rather than TRUNCATE: the dimensions are referenced
+   by foreign keys. Dim_SOR and SchemaVersion are kept.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+---------------------------------------------------------------
+
+TRUNCATE TABLE @database_name.@schema_name.FactOrders;
+TRUNCATE TABLE @database_name.@schema_name.FactOrders_Error;
+TRUNCATE TABLE @database_name.@schema_name.AggSalesDayCustomer;
+TRUNCATE TABLE @database_name.@schema_name.AggSalesProductMonth;
+TRUNCATE TABLE @database_name.@schema_name.AggSalesEmployeeTerritoryMonth;
+
+DELETE FROM @database_name.@schema_name.DimCategories;
+DELETE FROM @database_name.@schema_name.DimCustomers;
+DELETE FROM @database_name.@schema_name.DimEmployees;
+DELETE FROM @database_name.@schema_name.DimProducts;
+DELETE FROM @database_name.@schema_name.DimRegion;
+DELETE FROM @database_name.@schema_name.DimShippers;
+DELETE FROM @database_name.@schema_name.DimSuppliers;
+DELETE FROM @database_name.@schema_name.DimTerritories;
@@ -0,0 +1,212 @@
+"""
+run_benchmarks.py
+Scaling benchmark for the dimensional pipeline.
+
+For every scale factor the runner:
+  1. generates a synthetic source (generate_data.py, generation 0): one
+     workbook, or a directory of workbooks for a scale beyond Excel's
+     row limit
+  2. empties the warehouse (reset_warehouse.sql) and the staging
+     fingerprint manifest, so every scale starts cold
+  3. runs DimensionalDataFlow on it ("initial" phase)
+  4. if --change_rate > 0, generates generation 1 (a known share of
+     customers / products / employees / territories changed) and runs the
+     flow again ("incremental" phase: SCD merges over a loaded warehouse)
+
+Per task and per staging table it records wall time, rows and rows/s (and
+the peak traced Python memory per task: the runner keeps tracemalloc on,
+which the flow picks up whatever METRICS_TRACE_MEMORY says), and writes them to benchmarks/results/benchmark_<timestamp>.csv (one row per
+measurement, comparable across runs) and .json (the same plus run settings).
+
+Usage:
+    python -m benchmarks.run_benchmarks --start_date=1996-01-01 --end_date=1998-12-31
+    python -m benchmarks.run_benchmarks --scales 1 10 --change_rate 0.1
+    python -m benchmarks.run_benchmarks --backend sqlite     # no SQL Server needed
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.generate_data import generate_source, read_template
+from pipeline_dimensional_data.backends import BACKENDS, get_backend, set_backend
+from pipeline_dimensional_data.config import database_name, schema_name
+from pipeline_dimensional_data.fingerprints import invalidate_manifest
+from pipeline_dimensional_data.flow import DimensionalDataFlow
+from pipeline_dimensional_data.tasks import run_sql_task, staging_manifest_path, task_initialize_dimensional_db
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, "data")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+DEFAULT_SCALES = [1, 10, 100, 1000]
+
+RESULT_FIELDS = [
+    "run_id", "scale", "phase", "kind", "name", "success", "skipped",
+    "rows", "seconds", "rows_per_sec", "peak_python_memory_mb", "message",
+]
+
+
+def reset_warehouse() -> dict:
+    invalidate_manifest(staging_manifest_path())
+    return run_sql_task(
+        os.path.join(BENCHMARK_DIR, "reset_warehouse.sql"),
+        {"database_name": database_name, "schema_name": schema_name},
+    )
+
+
+def _rate(rows, seconds):
+    if not rows or not seconds:
+        return None
+    return round(rows / seconds, 1)
+
+
+def flow_records(result: dict, base: dict) -> list:
+    """Flatten one DimensionalDataFlow.exec result into benchmark records."""
+    records = [{
+        **base,
+        "kind": "flow",
+        "name": "total",
+        "success": result["success"],
+        "seconds": result["timings"]["wall_seconds"],
+        "message": "critical path: " + " -> ".join(result["timings"]["critical_path"]),
+    }]
+
+    for name, task in result["tasks"].items():
+        metrics = task.get("metrics") or {}
+        rows = metrics.get("rows_affected")
+        records.append({
+            **base,
+            "kind": "task",
+            "name": name,
+            "success": task.get("success", False),
+            "skipped": task.get("skipped", False),
+            "rows": rows,
+            "seconds": metrics.get("wall_seconds"),
+            "rows_per_sec": _rate(rows, metrics.get("wall_seconds")),
+            "peak_python_memory_mb": metrics.get("peak_python_memory_mb"),
+            "message": None if task.get("success") else task.get("message"),
+        })
+
+        for table_name, stats in task.get("tables", {}).items():
+            records.append({
+                **base,
+                "kind": "staging",
+                "name": table_name,
+                "success": stats.get("success", False),
+                "skipped": stats.get("skipped", False),
+                "rows": stats.get("rows"),
+                "seconds": stats.get("seconds"),
+                "rows_per_sec": stats.get("rows_per_sec"),
+                "message": stats.get("message"),
+            })
+
+    return records
+
+
+def run_scale(scale, start_date, end_date, change_rate, seed, template, run_id) -> list:
+    records = []
+    phases = [("initial", 0)]
+    if change_rate > 0:
+        phases.append(("incremental", 1))
+
+    for phase, generation in phases:
+        base = {"run_id": run_id, "scale": scale, "phase": phase}
+        started = time.perf_counter()
+        try:
+            path, counts = generate_source(os.path.join(DATA_DIR, f"scale_{scale}_gen{generation}"),
+                                           scale, generation, change_rate, seed, template)
+        except ValueError as e:
+            print(f"[scale {scale}] {e}")
+            records.append({**base, "kind": "generate", "name": "workbook", "success": False, "message": str(e)})
+            return records
+        generate_seconds = round(time.perf_counter() - started, 3)
+        records.append({
+            **base, "kind": "generate", "name": "workbook", "success": True,
+            "rows": sum(counts.values()), "seconds": generate_seconds,
+            "rows_per_sec": _rate(sum(counts.values()), generate_seconds),
+        })
+
+        if phase == "initial":
+            reset = reset_warehouse()
+            if not reset.get("success"):
+                records.append({**base, "kind": "reset", "name": "warehouse", "success": False,
+                                "message": reset.get("message")})
+                return records
+
+        print(f"[scale {scale}] {phase}: running pipeline on {path}")
+        result = DimensionalDataFlow(source_path=path).exec(start_date=start_date, end_date=end_date)
+        records.extend(flow_records(result, base))
+        print(f"[scale {scale}] {phase}: {'ok' if result['success'] else 'FAILED'} "
+              f"in {result['timings']['wall_seconds']}s")
+
+    return records
+
+
+def write_results(records: list, settings: dict) -> (str, str):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    csv_path = os.path.join(RESULTS_DIR, f"benchmark_{stamp}.csv")
+    json_path = os.path.join(RESULTS_DIR, f"benchmark_{stamp}.json")
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({field: record.get(field) for field in RESULT_FIELDS})
+
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "results": records}, f, indent=2, default=str)
+
+    return csv_path, json_path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the pipeline scaling benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Multiples of the raw_data_source.xlsx row counts")
+    parser.add_argument("--start_date", default="1996-01-01", help="Fact window start (YYYY-MM-DD)")
+    parser.add_argument("--end_date", default="1998-12-31", help="Fact window end (YYYY-MM-DD)")
+    parser.add_argument("--change_rate", type=float, default=0.05,
+                        help="Share of keys changed for the incremental phase (0 = skip it)")
+    parser.add_argument("--seed", type=int, default=206)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None,
+                        help="Database backend (default: DB_BACKEND in config.py)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.backend:
+        set_backend(args.backend)
+    settings = {**vars(args), "backend": get_backend().name}
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+
+    init = task_initialize_dimensional_db()
+    if not init.get("success"):
+        print(f"Schema bootstrap failed: {init.get('message')}")
+        sys.exit(1)
+
+    template = read_template()
+    records = []
+    tracemalloc.start()
+    try:
+        for scale in args.scales:
+            records.extend(run_scale(scale, args.start_date, args.end_date, args.change_rate,
+                                     args.seed, template, run_id))
+    finally:
+        tracemalloc.stop()
+
+    csv_path, json_path = write_results(records, settings)
+    print(f"Results written to {csv_path} and {json_path}")
+
+
+if __name__ == "__main__":
+    main()
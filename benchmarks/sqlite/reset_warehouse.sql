@@ -0,0 +1,23 @@
+/* ===========================================================
+   reset_warehouse.sql (SQLite port)
+   Empties the fact, aggregate and dimension tables between
+   benchmark scales so every scale starts from the same (empty)
+   state.
+   Facts first: the dimensions are referenced by foreign keys.
+   Dim_SOR and SchemaVersion are kept.
+   =========================================================== */
+
+DELETE FROM FactOrders;
+DELETE FROM FactOrders_Error;
+DELETE FROM AggSalesDayCustomer;
+DELETE FROM AggSalesProductMonth;
+DELETE FROM AggSalesEmployeeTerritoryMonth;
+
+DELETE FROM DimCategories;
+DELETE FROM DimCustomers;
+DELETE FROM DimEmployees;
+DELETE FROM DimProducts;
+DELETE FROM DimRegion;
+DELETE FROM DimShippers;
+DELETE FROM DimSuppliers;
+DELETE FROM DimTerritories;
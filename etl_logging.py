@@ -1,31 +1,104 @@
 """
-logging.py
+etl_logging.py
 
 Configures the logger used by DimensionalDataFlow.
 Logs are written to logs/logs_dimensional_data_pipeline.txt
-Each log entry includes execution_id (injected by flow.py).
+Each log entry includes execution_id.
+
+Task threads never write the file themselves: the logger's only handler
+is a QueueHandler feeding a bounded queue (LOG_QUEUE_SIZE records), and a
+QueueListener thread drains it into the FileHandler. When the queue is
+full, callers wait for room instead of dropping records, so memory stays
+bounded under a burst.
+
+Nothing is opened at import: the log file and the listener thread are
+created by the first get_pipeline_logger() call (DimensionalDataFlow and
+PipelineService make it), so importing the pipeline modules has no side
+effects. Records logged to LOGGER_NAME before that call do not reach the file.
+
+The execution_id comes from the EXECUTION_ID context variable, read when
+a record is logged. DimensionalDataFlow sets it for the duration of a run
+and submits its tasks with contextvars.copy_context().run, so concurrent
+tasks (and concurrent runs in one process) each log their own id. A
+record logged with extra={"execution_id": ...} keeps that id.
 """
 
-import logging
 import os
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
+
+from pipeline_dimensional_data.config import LOG_QUEUE_SIZE
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 LOG_PATH = os.path.join(PROJECT_ROOT, "logs", "logs_dimensional_data_pipeline.txt")
 
+LOGGER_NAME = "dimensional_data_flow"
+
+EXECUTION_ID = contextvars.ContextVar("execution_id", default="-")
+
+_LISTENER = None
+_QUEUE_HANDLER = None
+_LOCK = threading.Lock()
+
+
+class ExecutionIdFilter(logging.Filter):
+    """Tag each record with the execution_id of the logging context."""
+
+    def filter(self, record):
+        if not hasattr(record, "execution_id"):
+            record.execution_id = EXECUTION_ID.get()
+        return True
+
+
+class _BlockingQueueHandler(QueueHandler):
+    """QueueHandler that waits for room in a full queue instead of failing."""
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+
 def get_pipeline_logger():
     """
     Create and return a logger for the dimensional data pipeline.
-    flow.py will attach an execution_id filter at runtime.
+    The queue listener thread is started on the first call.
     """
-    logger = logging.getLogger("dimensional_data_flow")
-    logger.setLevel(logging.INFO)
-
-    if not logger.handlers:
-        file_handler = logging.FileHandler(LOG_PATH)
-        formatter = logging.Formatter(
-            "%(asctime)s | execution_id=%(execution_id)s | %(levelname)s | %(message)s"
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-    return logger
\ No newline at end of file
+    global _LISTENER, _QUEUE_HANDLER
+    logger = logging.getLogger(LOGGER_NAME)
+
+    with _LOCK:
+        if _LISTENER is None:
+            os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+            file_handler = logging.FileHandler(LOG_PATH)
+            formatter = logging.Formatter(
+                "%(asctime)s | execution_id=%(execution_id)s | %(levelname)s | %(message)s"
+            )
+            file_handler.setFormatter(formatter)
+
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _QUEUE_HANDLER = _BlockingQueueHandler(log_queue)
+            _QUEUE_HANDLER.addFilter(ExecutionIdFilter())
+
+            logger.setLevel(logging.INFO)
+            logger.addHandler(_QUEUE_HANDLER)
+
+            _LISTENER = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _LISTENER.start()
+            atexit.register(stop_pipeline_logging)
+
+    return logger
+
+
+def stop_pipeline_logging():
+    """Write out the queued records and stop the listener thread (also run at exit)."""
+    global _LISTENER, _QUEUE_HANDLER
+    with _LOCK:
+        if _LISTENER is not None:
+            logging.getLogger(LOGGER_NAME).removeHandler(_QUEUE_HANDLER)
+            _LISTENER.stop()
+            for handler in _LISTENER.handlers:
+                handler.close()
+            _LISTENER = _QUEUE_HANDLER = None
@@ -1,11 +1,14 @@
 -- ==========================================================
 -- Create ORDER_DDS Database
+-- The existence check and CREATE run from master: ORDER_DDS
+-- cannot be USEd before it exists. The session switches to it
+-- in a later batch, once the CREATE has run.
 -- ==========================================================
-USE ORDER_DDS;
+USE master;
 
 IF NOT EXISTS (
-    SELECT name 
-    FROM sys.databases 
+    SELECT name
+    FROM sys.databases
     WHERE name = 'ORDER_DDS'
 )
 BEGIN
@@ -15,4 +18,7 @@ END
 ELSE
 BEGIN
     PRINT 'ORDER_DDS database already exists.';
-END;
\ No newline at end of file
+END;
+GO
+
+USE ORDER_DDS;
@@ -0,0 +1,119 @@
+/* ===========================================================
+   DIMENSIONAL DATABASE INDEX CREATION
+   Run by task_initialize_dimensional_db after the table scripts.
+   Every index is created only if it does not exist yet.
+   =========================================================== */
+
+USE ORDER_DDS;
+GO
+
+/* ===========================================================
+   STAGING — join / lookup columns
+   =========================================================== */
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Orders_OrderID' AND object_id = OBJECT_ID('staging_Orders'))
+    CREATE INDEX IX_staging_Orders_OrderID ON staging_Orders (OrderID);
+
+-- window filters compare the computed DATE; the old index on the text OrderDate never seeks
+IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Orders_OrderDate' AND object_id = OBJECT_ID('staging_Orders'))
+    DROP INDEX IX_staging_Orders_OrderDate ON staging_Orders;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Orders_OrderDay' AND object_id = OBJECT_ID('staging_Orders'))
+    CREATE INDEX IX_staging_Orders_OrderDay ON staging_Orders (OrderDay) INCLUDE (OrderID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_OrderDetails_OrderID' AND object_id = OBJECT_ID('staging_OrderDetails'))
+    CREATE INDEX IX_staging_OrderDetails_OrderID ON staging_OrderDetails (OrderID) INCLUDE (ProductID);
+
+-- natural keys used by the soft-delete / delete-closing joins
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Categories_CategoryID' AND object_id = OBJECT_ID('staging_Categories'))
+    CREATE INDEX IX_staging_Categories_CategoryID ON staging_Categories (CategoryID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Employees_EmployeeID' AND object_id = OBJECT_ID('staging_Employees'))
+    CREATE INDEX IX_staging_Employees_EmployeeID ON staging_Employees (EmployeeID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Products_ProductID' AND object_id = OBJECT_ID('staging_Products'))
+    CREATE INDEX IX_staging_Products_ProductID ON staging_Products (ProductID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_staging_Customers_CustomerID' AND object_id = OBJECT_ID('staging_Customers'))
+    CREATE INDEX IX_staging_Customers_CustomerID ON staging_Customers (CustomerID);
+GO
+
+
+/* ===========================================================
+   DIMENSIONS — natural keys
+   SCD1 / SCD3 / SCD4 dimensions keep one row per NK (unique).
+   =========================================================== */
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimCategories_NK' AND object_id = OBJECT_ID('DimCategories'))
+    CREATE UNIQUE INDEX UX_DimCategories_NK ON DimCategories (Category_NK);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimEmployees_NK' AND object_id = OBJECT_ID('DimEmployees'))
+    CREATE UNIQUE INDEX UX_DimEmployees_NK ON DimEmployees (Employee_NK);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimSuppliers_NK' AND object_id = OBJECT_ID('DimSuppliers'))
+    CREATE UNIQUE INDEX UX_DimSuppliers_NK ON DimSuppliers (Supplier_NK);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimRegion_NK' AND object_id = OBJECT_ID('DimRegion'))
+    CREATE UNIQUE INDEX UX_DimRegion_NK ON DimRegion (Region_NK);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimShippers_NK' AND object_id = OBJECT_ID('DimShippers'))
+    CREATE UNIQUE INDEX UX_DimShippers_NK ON DimShippers (Shipper_NK);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimTerritories_NK' AND object_id = OBJECT_ID('DimTerritories'))
+    CREATE UNIQUE INDEX UX_DimTerritories_NK ON DimTerritories (Territory_NK);
+GO
+
+
+/* ===========================================================
+   DIMENSIONS — filtered indexes for the rows the loaders read
+   =========================================================== */
+
+-- Soft-delete dimensions: fact loads join on IsDeleted = 0
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_DimCategories_NK_Active' AND object_id = OBJECT_ID('DimCategories'))
+    CREATE INDEX IX_DimCategories_NK_Active ON DimCategories (Category_NK) WHERE IsDeleted = 0;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_DimEmployees_NK_Active' AND object_id = OBJECT_ID('DimEmployees'))
+    CREATE INDEX IX_DimEmployees_NK_Active ON DimEmployees (Employee_NK) WHERE IsDeleted = 0;
+
+-- SCD2 dimensions: at most one current version per NK
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimCustomers_NK_Current' AND object_id = OBJECT_ID('DimCustomers'))
+    CREATE UNIQUE INDEX UX_DimCustomers_NK_Current ON DimCustomers (Customer_NK) WHERE IsCurrent = 1;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_DimCustomers_NK_ValidFrom' AND object_id = OBJECT_ID('DimCustomers'))
+    CREATE INDEX IX_DimCustomers_NK_ValidFrom ON DimCustomers (Customer_NK, ValidFrom) INCLUDE (ValidTo, IsCurrent);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_DimProducts_NK_Current' AND object_id = OBJECT_ID('DimProducts'))
+    CREATE UNIQUE INDEX UX_DimProducts_NK_Current ON DimProducts (Product_NK) WHERE IsCurrent = 1;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_DimProducts_NK_ValidFrom' AND object_id = OBJECT_ID('DimProducts'))
+    CREATE INDEX IX_DimProducts_NK_ValidFrom ON DimProducts (Product_NK, ValidFrom) INCLUDE (ValidTo, IsCurrent);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_Dim_SOR_Name' AND object_id = OBJECT_ID('Dim_SOR'))
+    CREATE UNIQUE INDEX UX_Dim_SOR_Name ON Dim_SOR (SOR_Name);
+GO
+
+
+/* ===========================================================
+   FACT ORDERS
+   Rowstore lookup on the fact grain + nonclustered columnstore
+   for scans / aggregation (SQL Server 2016 SP1+).
+   =========================================================== */
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_FactOrders_Order_Product' AND object_id = OBJECT_ID('FactOrders'))
+    CREATE INDEX IX_FactOrders_Order_Product ON FactOrders (Order_NK, Product_NK);
+
+-- window deletes and aggregate refreshes seek on the computed OrderDay
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_FactOrders_OrderDay' AND object_id = OBJECT_ID('FactOrders'))
+    CREATE INDEX IX_FactOrders_OrderDay ON FactOrders (OrderDay);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_FactOrders_Error_OrderDay' AND object_id = OBJECT_ID('dbo.FactOrders_Error'))
+    CREATE INDEX IX_FactOrders_Error_OrderDay ON dbo.FactOrders_Error (OrderDay);
+
+IF CAST(SERVERPROPERTY('ProductMajorVersion') AS INT) >= 13
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'NCCI_FactOrders' AND object_id = OBJECT_ID('FactOrders'))
+    EXEC('CREATE NONCLUSTERED COLUMNSTORE INDEX NCCI_FactOrders ON FactOrders (
+            Order_NK, Product_NK,
+            Customer_SK, Employee_SK, Product_SK, Shipper_SK, Territory_SK, Region_SK,
+            OrderDate, Freight, UnitPrice, Quantity, Discount
+         )');
+GO
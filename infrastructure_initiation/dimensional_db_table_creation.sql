@@ -6,25 +6,18 @@ USE ORDER_DDS;
 GO
 
 /* ===========================================================
-   CLEANUP
+   Idempotent: every table is created only if it does not exist,
+   so re-running this script keeps existing dimension history.
+   Schema changes for existing databases go in the UPGRADES
+   section at the end (guarded by COL_LENGTH / OBJECT_ID).
    =========================================================== */
-DROP TABLE IF EXISTS FactOrders;
-DROP TABLE IF EXISTS DimTerritories;
-DROP TABLE IF EXISTS DimShippers;
-DROP TABLE IF EXISTS DimRegion;
-DROP TABLE IF EXISTS DimProducts;
-DROP TABLE IF EXISTS DimSuppliers;
-DROP TABLE IF EXISTS DimEmployees;
-DROP TABLE IF EXISTS DimCustomers;
-DROP TABLE IF EXISTS DimCategories;
-DROP TABLE IF EXISTS Dim_SOR;
-DROP TABLE IF EXISTS FactOrders_Error;
 
 
 /* ===========================================================
    DIM SOR — REQUIRED BY ASSIGNMENT
    =========================================================== */
 
+IF OBJECT_ID('Dim_SOR', 'U') IS NULL
 CREATE TABLE Dim_SOR (
     SOR_SK INT IDENTITY(1,1) PRIMARY KEY,
     SOR_Name NVARCHAR(255) NOT NULL
@@ -35,15 +28,19 @@ CREATE TABLE Dim_SOR (
    DimCategories — SCD1 + Delete Flag
    =========================================================== */
 
+IF OBJECT_ID('DimCategories', 'U') IS NULL
 CREATE TABLE DimCategories (
     Category_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Category_NK INT NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED BY ASSIGNMENT
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     CategoryName NVARCHAR(255),
     Description NVARCHAR(MAX),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     IsDeleted BIT DEFAULT 0,
 
     SOR_SK INT,
@@ -57,11 +54,13 @@ CREATE TABLE DimCategories (
    DimCustomers — SCD2 (Historical)
    =========================================================== */
 
+IF OBJECT_ID('DimCustomers', 'U') IS NULL
 CREATE TABLE DimCustomers (
     Customer_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Customer_NK NVARCHAR(50) NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     CompanyName NVARCHAR(255),
     ContactName NVARCHAR(255),
@@ -74,6 +73,8 @@ CREATE TABLE DimCustomers (
     Phone NVARCHAR(50),
     Fax NVARCHAR(50),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     ValidFrom DATETIME NOT NULL,
     ValidTo DATETIME NOT NULL,
     IsCurrent BIT NOT NULL,
@@ -89,11 +90,13 @@ CREATE TABLE DimCustomers (
    DimEmployees — SCD1 + Delete Flag
    =========================================================== */
 
+IF OBJECT_ID('DimEmployees', 'U') IS NULL
 CREATE TABLE DimEmployees (
     Employee_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Employee_NK INT NOT NULL,      
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     LastName NVARCHAR(255),
     FirstName NVARCHAR(255),
@@ -111,6 +114,8 @@ CREATE TABLE DimEmployees (
     Notes NVARCHAR(MAX),
     ReportsTo INT,
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     IsDeleted BIT DEFAULT 0,
 
     SOR_SK INT,
@@ -124,11 +129,13 @@ CREATE TABLE DimEmployees (
    DimSuppliers — SCD4 Dimension
    =========================================================== */
 
+IF OBJECT_ID('DimSuppliers', 'U') IS NULL
 CREATE TABLE DimSuppliers (
     Supplier_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Supplier_NK INT NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     CompanyName NVARCHAR(255),
     ContactName NVARCHAR(255),
@@ -142,6 +149,8 @@ CREATE TABLE DimSuppliers (
     Fax NVARCHAR(50),
     HomePage NVARCHAR(MAX),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     SOR_SK INT,
     LoadDate DATETIME DEFAULT GETDATE(),
 
@@ -153,11 +162,13 @@ CREATE TABLE DimSuppliers (
    DimProducts — SCD2 (with Closing)
    =========================================================== */
 
+IF OBJECT_ID('DimProducts', 'U') IS NULL
 CREATE TABLE DimProducts (
     Product_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Product_NK INT NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     ProductName NVARCHAR(255),
     Supplier_NK INT,
@@ -169,6 +180,8 @@ CREATE TABLE DimProducts (
     ReorderLevel INT,
     Discontinued NVARCHAR(10),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     ValidFrom DATETIME NOT NULL,
     ValidTo DATETIME NOT NULL,
     IsCurrent BIT NOT NULL,
@@ -185,16 +198,20 @@ CREATE TABLE DimProducts (
    DimRegion — SCD1
    =========================================================== */
 
+IF OBJECT_ID('DimRegion', 'U') IS NULL
 CREATE TABLE DimRegion (
     Region_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Region_NK INT NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     RegionDescription NVARCHAR(255),
     RegionCategory NVARCHAR(255),
     RegionImportance NVARCHAR(255),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     SOR_SK INT,
     LoadDate DATETIME DEFAULT GETDATE(),
 
@@ -206,15 +223,19 @@ CREATE TABLE DimRegion (
    DimShippers — SCD1
    =========================================================== */
 
+IF OBJECT_ID('DimShippers', 'U') IS NULL
 CREATE TABLE DimShippers (
     Shipper_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Shipper_NK INT NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     CompanyName NVARCHAR(255),
     Phone NVARCHAR(50),
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     SOR_SK INT,
     LoadDate DATETIME DEFAULT GETDATE(),
 
@@ -226,17 +247,21 @@ CREATE TABLE DimShippers (
    DimTerritories — SCD3
    =========================================================== */
 
+IF OBJECT_ID('DimTerritories', 'U') IS NULL
 CREATE TABLE DimTerritories (
     Territory_SK INT IDENTITY(1,1) PRIMARY KEY,
 
     Territory_NK NVARCHAR(50) NOT NULL,
     staging_raw_id_sk INT NOT NULL,     -- REQUIRED
+    SourceFile NVARCHAR(260),           -- workbook of the staging row
 
     TerritoryDescription_Current NVARCHAR(255),
     TerritoryDescription_Prior NVARCHAR(255),
     TerritoryCode NVARCHAR(10),
     Region_NK INT,
 
+    RowHash VARBINARY(32),             -- SHA2_256 over tracked attributes
+
     SOR_SK INT,
     LoadDate DATETIME DEFAULT GETDATE(),
 
@@ -248,6 +273,7 @@ CREATE TABLE DimTerritories (
    FACT ORDERS — SNAPSHOT FACT
    =========================================================== */
 
+IF OBJECT_ID('FactOrders', 'U') IS NULL
 CREATE TABLE FactOrders (
     FactOrder_SK INT IDENTITY(1,1) PRIMARY KEY,
 
@@ -262,6 +288,7 @@ CREATE TABLE FactOrders (
     Region_SK INT,
 
     OrderDate NVARCHAR(50),
+    OrderDay AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED,  -- window filters / index
     RequiredDate NVARCHAR(50),
     ShippedDate NVARCHAR(50),
     Freight FLOAT,
@@ -274,6 +301,7 @@ CREATE TABLE FactOrders (
 
     SOR_SK INT,
     staging_raw_id_sk INT,
+    SourceFile NVARCHAR(260),
 
     -- FOREIGN KEYS
     FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK),
@@ -285,6 +313,7 @@ CREATE TABLE FactOrders (
     FOREIGN KEY (Region_SK)   REFERENCES DimRegion(Region_SK)
 );
 
+IF OBJECT_ID('dbo.FactOrders_Error', 'U') IS NULL
 CREATE TABLE dbo.FactOrders_Error (
     ErrorID           INT IDENTITY(1,1) PRIMARY KEY,
     Order_NK          INT,
@@ -295,8 +324,155 @@ CREATE TABLE dbo.FactOrders_Error (
     Shipper_SK        INT,
     Territory_SK      INT,
     Region_SK         INT,
+    OrderDate         NVARCHAR(50),
+    OrderDay          AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED,
+    ErrorCode         NVARCHAR(50),
     ErrorMessage      NVARCHAR(255),
     SOR_SK            INT,
     staging_raw_id_sk INT,
+    SourceFile        NVARCHAR(260),
     LoadDate          DATETIME DEFAULT GETDATE()
-);
\ No newline at end of file
+);
+
+
+/* ===========================================================
+   AGGREGATES — dashboard summaries of FactOrders, refreshed for
+   the loaded OrderDate window by update_aggregates.sql
+   (GrossAmount = UnitPrice * Quantity, NetAmount after Discount)
+   =========================================================== */
+
+IF OBJECT_ID('dbo.AggSalesDayCustomer', 'U') IS NULL
+CREATE TABLE dbo.AggSalesDayCustomer (
+    OrderDate    DATE NOT NULL,
+    Customer_SK  INT  NOT NULL,
+    Orders       INT,
+    OrderLines   INT,
+    Quantity     INT,
+    GrossAmount  FLOAT,
+    NetAmount    FLOAT,
+    LoadDate     DATETIME DEFAULT GETDATE(),
+    PRIMARY KEY (OrderDate, Customer_SK)
+);
+
+IF OBJECT_ID('dbo.AggSalesProductMonth', 'U') IS NULL
+CREATE TABLE dbo.AggSalesProductMonth (
+    MonthStart   DATE NOT NULL,
+    Product_SK   INT  NOT NULL,
+    Orders       INT,
+    OrderLines   INT,
+    Quantity     INT,
+    GrossAmount  FLOAT,
+    NetAmount    FLOAT,
+    LoadDate     DATETIME DEFAULT GETDATE(),
+    PRIMARY KEY (MonthStart, Product_SK)
+);
+
+IF OBJECT_ID('dbo.AggSalesEmployeeTerritoryMonth', 'U') IS NULL
+CREATE TABLE dbo.AggSalesEmployeeTerritoryMonth (
+    MonthStart   DATE NOT NULL,
+    Employee_SK  INT  NOT NULL,
+    Territory_SK INT  NOT NULL,
+    Orders       INT,
+    OrderLines   INT,
+    Quantity     INT,
+    GrossAmount  FLOAT,
+    NetAmount    FLOAT,
+    LoadDate     DATETIME DEFAULT GETDATE(),
+    PRIMARY KEY (MonthStart, Employee_SK, Territory_SK)
+);
+
+
+/* ===========================================================
+   SCHEMA VERSION — one row per applied bootstrap
+   =========================================================== */
+
+IF OBJECT_ID('dbo.SchemaVersion', 'U') IS NULL
+CREATE TABLE dbo.SchemaVersion (
+    Version   INT NOT NULL PRIMARY KEY,
+    AppliedAt DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+);
+GO
+
+
+/* ===========================================================
+   UPGRADES — bring tables created by older versions up to date
+   =========================================================== */
+
+IF COL_LENGTH('DimCategories', 'RowHash') IS NULL  ALTER TABLE DimCategories  ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimCustomers', 'RowHash') IS NULL   ALTER TABLE DimCustomers   ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimEmployees', 'RowHash') IS NULL   ALTER TABLE DimEmployees   ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimSuppliers', 'RowHash') IS NULL   ALTER TABLE DimSuppliers   ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimProducts', 'RowHash') IS NULL    ALTER TABLE DimProducts    ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimRegion', 'RowHash') IS NULL      ALTER TABLE DimRegion      ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimShippers', 'RowHash') IS NULL    ALTER TABLE DimShippers    ADD RowHash VARBINARY(32);
+IF COL_LENGTH('DimTerritories', 'RowHash') IS NULL ALTER TABLE DimTerritories ADD RowHash VARBINARY(32);
+
+-- version 2: rejected fact rows carry their OrderDate (window reloads) and a reason code
+IF COL_LENGTH('dbo.FactOrders_Error', 'OrderDate') IS NULL ALTER TABLE dbo.FactOrders_Error ADD OrderDate NVARCHAR(50);
+IF COL_LENGTH('dbo.FactOrders_Error', 'ErrorCode') IS NULL ALTER TABLE dbo.FactOrders_Error ADD ErrorCode NVARCHAR(50);
+GO
+
+-- RowHash added to existing rows above is NULL, which matches no staged hash:
+-- backfill it with the expressions of the update_dim_*.sql scripts (over the
+-- dimension's copies of the tracked attributes), so the first load after the
+-- upgrade sees unchanged rows as unchanged. Only NULL hashes are written.
+UPDATE DimCategories SET RowHash = HASHBYTES('SHA2_256', CONCAT(CategoryName, '|', Description))
+WHERE RowHash IS NULL;
+
+UPDATE DimCustomers SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    CompanyName, '|', ContactName, '|', ContactTitle, '|', Address, '|',
+    City, '|', Region, '|', PostalCode, '|', Country, '|', Phone, '|', Fax
+))
+WHERE RowHash IS NULL;
+
+UPDATE DimEmployees SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    LastName, '|', FirstName, '|', Title, '|', TitleOfCourtesy, '|',
+    BirthDate, '|', HireDate, '|', Address, '|', City, '|', Region, '|',
+    PostalCode, '|', Country, '|', HomePhone, '|', Extension, '|',
+    Notes, '|', ReportsTo
+))
+WHERE RowHash IS NULL;
+
+UPDATE DimSuppliers SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    CompanyName, '|', ContactName, '|', ContactTitle, '|', Address, '|',
+    City, '|', Region, '|', PostalCode, '|', Country, '|',
+    Phone, '|', Fax, '|', HomePage
+))
+WHERE RowHash IS NULL;
+
+UPDATE DimProducts SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    ProductName, '|', Supplier_NK, '|', Category_NK, '|', QuantityPerUnit, '|',
+    CONVERT(VARCHAR(30), UnitPrice, 2), '|', UnitsInStock, '|',
+    UnitsOnOrder, '|', ReorderLevel, '|', Discontinued
+))
+WHERE RowHash IS NULL;
+
+UPDATE DimRegion SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    RegionDescription, '|', RegionCategory, '|', RegionImportance
+))
+WHERE RowHash IS NULL;
+
+UPDATE DimShippers SET RowHash = HASHBYTES('SHA2_256', CONCAT(CompanyName, '|', Phone))
+WHERE RowHash IS NULL;
+
+UPDATE DimTerritories SET RowHash = HASHBYTES('SHA2_256', CONCAT(
+    TerritoryDescription_Current, '|', TerritoryCode, '|', Region_NK
+))
+WHERE RowHash IS NULL;
+
+-- version 5: OrderDate as a persisted DATE for the window filters (computed
+-- from the version 2 OrderDate column, hence after the batch that adds it)
+IF COL_LENGTH('FactOrders', 'OrderDay') IS NULL       ALTER TABLE FactOrders       ADD OrderDay AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED;
+IF COL_LENGTH('dbo.FactOrders_Error', 'OrderDay') IS NULL ALTER TABLE dbo.FactOrders_Error ADD OrderDay AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED;
+
+-- version 6: dimension and fact rows record the workbook of their staging row
+IF COL_LENGTH('DimCategories', 'SourceFile') IS NULL        ALTER TABLE DimCategories        ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimCustomers', 'SourceFile') IS NULL         ALTER TABLE DimCustomers         ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimEmployees', 'SourceFile') IS NULL         ALTER TABLE DimEmployees         ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimSuppliers', 'SourceFile') IS NULL         ALTER TABLE DimSuppliers         ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimProducts', 'SourceFile') IS NULL          ALTER TABLE DimProducts          ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimRegion', 'SourceFile') IS NULL            ALTER TABLE DimRegion            ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimShippers', 'SourceFile') IS NULL          ALTER TABLE DimShippers          ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('DimTerritories', 'SourceFile') IS NULL       ALTER TABLE DimTerritories       ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('FactOrders', 'SourceFile') IS NULL           ALTER TABLE FactOrders           ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('dbo.FactOrders_Error', 'SourceFile') IS NULL ALTER TABLE dbo.FactOrders_Error ADD SourceFile NVARCHAR(260);
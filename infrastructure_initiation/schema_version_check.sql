@@ -0,0 +1,12 @@
+/* ===========================================================
+   APPLIED SCHEMA VERSION
+   Returns one row: schema_version (NULL on a cold database).
+   Dynamic SQL keeps the batch compilable when the database or
+   the SchemaVersion table does not exist yet.
+   =========================================================== */
+
+IF DB_ID('@database_name') IS NULL
+    OR OBJECT_ID('@database_name.@schema_name.SchemaVersion', 'U') IS NULL
+    SELECT CAST(NULL AS INT) AS schema_version;
+ELSE
+    EXEC('SELECT MAX(Version) AS schema_version FROM @database_name.@schema_name.SchemaVersion');
@@ -0,0 +1,9 @@
+/* ===========================================================
+   RECORD APPLIED SCHEMA VERSION
+   =========================================================== */
+
+USE @database_name;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM @schema_name.SchemaVersion WHERE Version = @schema_version)
+    INSERT INTO @schema_name.SchemaVersion (Version) VALUES (@schema_version);
@@ -0,0 +1,6 @@
+-- ==========================================================
+-- ORDER_DDS database (SQLite port)
+-- The database is the file at SQLITE_PATH (config.py); it is
+-- created by the first connection, so there is nothing to do.
+-- ==========================================================
+SELECT 1 AS database_ready;
@@ -0,0 +1,60 @@
+/* ===========================================================
+   DIMENSIONAL DATABASE INDEX CREATION (SQLite port)
+   Run by task_initialize_dimensional_db after the table scripts.
+   Every index is created only if it does not exist yet.
+   SQLite has no INCLUDE columns (they are added as trailing key
+   columns instead) and no columnstore indexes.
+   =========================================================== */
+
+/* ===========================================================
+   STAGING — join / lookup columns
+   =========================================================== */
+
+CREATE INDEX IF NOT EXISTS IX_staging_Orders_OrderID ON staging_Orders (OrderID);
+CREATE INDEX IF NOT EXISTS IX_staging_Orders_OrderDay ON staging_Orders (OrderDay, OrderID);
+CREATE INDEX IF NOT EXISTS IX_staging_OrderDetails_OrderID ON staging_OrderDetails (OrderID, ProductID);
+
+-- natural keys used by the soft-delete / delete-closing joins
+CREATE INDEX IF NOT EXISTS IX_staging_Categories_CategoryID ON staging_Categories (CategoryID);
+CREATE INDEX IF NOT EXISTS IX_staging_Employees_EmployeeID ON staging_Employees (EmployeeID);
+CREATE INDEX IF NOT EXISTS IX_staging_Products_ProductID ON staging_Products (ProductID);
+CREATE INDEX IF NOT EXISTS IX_staging_Customers_CustomerID ON staging_Customers (CustomerID);
+
+
+/* ===========================================================
+   DIMENSIONS — natural keys
+   SCD1 / SCD3 / SCD4 dimensions keep one row per NK (unique).
+   =========================================================== */
+
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimCategories_NK ON DimCategories (Category_NK);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimEmployees_NK ON DimEmployees (Employee_NK);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimSuppliers_NK ON DimSuppliers (Supplier_NK);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimRegion_NK ON DimRegion (Region_NK);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimShippers_NK ON DimShippers (Shipper_NK);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimTerritories_NK ON DimTerritories (Territory_NK);
+
+
+/* ===========================================================
+   DIMENSIONS — partial indexes for the rows the loaders read
+   =========================================================== */
+
+-- Soft-delete dimensions: fact loads join on IsDeleted = 0
+CREATE INDEX IF NOT EXISTS IX_DimCategories_NK_Active ON DimCategories (Category_NK) WHERE IsDeleted = 0;
+CREATE INDEX IF NOT EXISTS IX_DimEmployees_NK_Active ON DimEmployees (Employee_NK) WHERE IsDeleted = 0;
+
+-- SCD2 dimensions: at most one current version per NK
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimCustomers_NK_Current ON DimCustomers (Customer_NK) WHERE IsCurrent = 1;
+CREATE INDEX IF NOT EXISTS IX_DimCustomers_NK_ValidFrom ON DimCustomers (Customer_NK, ValidFrom, ValidTo, IsCurrent);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_DimProducts_NK_Current ON DimProducts (Product_NK) WHERE IsCurrent = 1;
+CREATE INDEX IF NOT EXISTS IX_DimProducts_NK_ValidFrom ON DimProducts (Product_NK, ValidFrom, ValidTo, IsCurrent);
+
+CREATE UNIQUE INDEX IF NOT EXISTS UX_Dim_SOR_Name ON Dim_SOR (SOR_Name);
+
+
+/* ===========================================================
+   FACT ORDERS — lookup on the fact grain, window deletes
+   =========================================================== */
+
+CREATE INDEX IF NOT EXISTS IX_FactOrders_Order_Product ON FactOrders (Order_NK, Product_NK);
+CREATE INDEX IF NOT EXISTS IX_FactOrders_OrderDay ON FactOrders (OrderDay);
+CREATE INDEX IF NOT EXISTS IX_FactOrders_Error_OrderDay ON FactOrders_Error (OrderDay);
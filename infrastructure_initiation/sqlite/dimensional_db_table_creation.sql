@@ -0,0 +1,376 @@
+/* ===========================================================
+   DIMENSIONAL DATABASE TABLE CREATION (SQLite port)
+   =========================================================== */
+
+/* ===========================================================
+   Idempotent: every table is created only if it does not exist,
+   so re-running this script keeps existing dimension history.
+   SQLite has no conditional ALTER TABLE, so there is no UPGRADES
+   section: the local database is disposable, and one created by
+   an older SCHEMA_VERSION is rebuilt by deleting SQLITE_PATH.
+   =========================================================== */
+
+
+/* ===========================================================
+   DIM SOR — REQUIRED BY ASSIGNMENT
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS Dim_SOR (
+    SOR_SK INTEGER PRIMARY KEY,
+    SOR_Name TEXT NOT NULL
+);
+
+
+/* ===========================================================
+   DimCategories — SCD1 + Delete Flag
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimCategories (
+    Category_SK INTEGER PRIMARY KEY,
+
+    Category_NK INTEGER NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED BY ASSIGNMENT
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    CategoryName TEXT,
+    Description TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    IsDeleted INTEGER DEFAULT 0,
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimCustomers — SCD2 (Historical)
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimCustomers (
+    Customer_SK INTEGER PRIMARY KEY,
+
+    Customer_NK TEXT NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    CompanyName TEXT,
+    ContactName TEXT,
+    ContactTitle TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    Phone TEXT,
+    Fax TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    ValidFrom TEXT NOT NULL,
+    ValidTo TEXT NOT NULL,
+    IsCurrent INTEGER NOT NULL,
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimEmployees — SCD1 + Delete Flag
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimEmployees (
+    Employee_SK INTEGER PRIMARY KEY,
+
+    Employee_NK INTEGER NOT NULL,      
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    LastName TEXT,
+    FirstName TEXT,
+    Title TEXT,
+    TitleOfCourtesy TEXT,
+    BirthDate TEXT,
+    HireDate TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    HomePhone TEXT,
+    Extension TEXT,
+    Notes TEXT,
+    ReportsTo INTEGER,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    IsDeleted INTEGER DEFAULT 0,
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimSuppliers — SCD4 Dimension
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimSuppliers (
+    Supplier_SK INTEGER PRIMARY KEY,
+
+    Supplier_NK INTEGER NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    CompanyName TEXT,
+    ContactName TEXT,
+    ContactTitle TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    Phone TEXT,
+    Fax TEXT,
+    HomePage TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimProducts — SCD2 (with Closing)
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimProducts (
+    Product_SK INTEGER PRIMARY KEY,
+
+    Product_NK INTEGER NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    ProductName TEXT,
+    Supplier_NK INTEGER,
+    Category_NK INTEGER,
+    QuantityPerUnit TEXT,
+    UnitPrice REAL,
+    UnitsInStock INTEGER,
+    UnitsOnOrder INTEGER,
+    ReorderLevel INTEGER,
+    Discontinued TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    ValidFrom TEXT NOT NULL,
+    ValidTo TEXT NOT NULL,
+    IsCurrent INTEGER NOT NULL,
+    IsClosed INTEGER DEFAULT 0,
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimRegion — SCD1
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimRegion (
+    Region_SK INTEGER PRIMARY KEY,
+
+    Region_NK INTEGER NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    RegionDescription TEXT,
+    RegionCategory TEXT,
+    RegionImportance TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimShippers — SCD1
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimShippers (
+    Shipper_SK INTEGER PRIMARY KEY,
+
+    Shipper_NK INTEGER NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    CompanyName TEXT,
+    Phone TEXT,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   DimTerritories — SCD3
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS DimTerritories (
+    Territory_SK INTEGER PRIMARY KEY,
+
+    Territory_NK TEXT NOT NULL,
+    staging_raw_id_sk INTEGER NOT NULL,     -- REQUIRED
+    SourceFile TEXT,                        -- workbook of the staging row
+
+    TerritoryDescription_Current TEXT,
+    TerritoryDescription_Prior TEXT,
+    TerritoryCode TEXT,
+    Region_NK INTEGER,
+
+    RowHash BLOB,             -- SHA2_256 over tracked attributes
+
+    SOR_SK INTEGER,
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK)
+);
+
+
+/* ===========================================================
+   FACT ORDERS — SNAPSHOT FACT
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS FactOrders (
+    FactOrder_SK INTEGER PRIMARY KEY,
+
+    Order_NK INTEGER NOT NULL,
+    Product_NK INTEGER NOT NULL,
+
+    Customer_SK INTEGER,
+    Employee_SK INTEGER,
+    Product_SK INTEGER,
+    Shipper_SK INTEGER,
+    Territory_SK INTEGER,
+    Region_SK INTEGER,
+
+    OrderDate TEXT,
+    OrderDay TEXT GENERATED ALWAYS AS (date(OrderDate)) STORED,  -- window filters / index
+    RequiredDate TEXT,
+    ShippedDate TEXT,
+    Freight REAL,
+
+    UnitPrice REAL,
+    Quantity INTEGER,
+    Discount REAL,
+
+    LoadDate TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    SOR_SK INTEGER,
+    staging_raw_id_sk INTEGER,
+    SourceFile TEXT,
+
+    -- FOREIGN KEYS
+    FOREIGN KEY (SOR_SK) REFERENCES Dim_SOR(SOR_SK),
+    FOREIGN KEY (Customer_SK) REFERENCES DimCustomers(Customer_SK),
+    FOREIGN KEY (Employee_SK) REFERENCES DimEmployees(Employee_SK),
+    FOREIGN KEY (Product_SK)  REFERENCES DimProducts(Product_SK),
+    FOREIGN KEY (Shipper_SK)  REFERENCES DimShippers(Shipper_SK),
+    FOREIGN KEY (Territory_SK) REFERENCES DimTerritories(Territory_SK),
+    FOREIGN KEY (Region_SK)   REFERENCES DimRegion(Region_SK)
+);
+
+CREATE TABLE IF NOT EXISTS FactOrders_Error (
+    ErrorID           INTEGER PRIMARY KEY,
+    Order_NK          INTEGER,
+    Product_NK        INTEGER,
+    Customer_SK       INTEGER,
+    Employee_SK       INTEGER,
+    Product_SK        INTEGER,
+    Shipper_SK        INTEGER,
+    Territory_SK      INTEGER,
+    Region_SK         INTEGER,
+    OrderDate         TEXT,
+    OrderDay          TEXT GENERATED ALWAYS AS (date(OrderDate)) STORED,
+    ErrorCode         TEXT,
+    ErrorMessage      TEXT,
+    SOR_SK            INTEGER,
+    staging_raw_id_sk INTEGER,
+    SourceFile        TEXT,
+    LoadDate          TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+
+/* ===========================================================
+   AGGREGATES — dashboard summaries of FactOrders, refreshed for
+   the loaded OrderDate window by update_aggregates.sql
+   (GrossAmount = UnitPrice * Quantity, NetAmount after Discount)
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS AggSalesDayCustomer (
+    OrderDate    TEXT    NOT NULL,
+    Customer_SK  INTEGER NOT NULL,
+    Orders       INTEGER,
+    OrderLines   INTEGER,
+    Quantity     INTEGER,
+    GrossAmount  REAL,
+    NetAmount    REAL,
+    LoadDate     TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (OrderDate, Customer_SK)
+);
+
+CREATE TABLE IF NOT EXISTS AggSalesProductMonth (
+    MonthStart   TEXT    NOT NULL,
+    Product_SK   INTEGER NOT NULL,
+    Orders       INTEGER,
+    OrderLines   INTEGER,
+    Quantity     INTEGER,
+    GrossAmount  REAL,
+    NetAmount    REAL,
+    LoadDate     TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (MonthStart, Product_SK)
+);
+
+CREATE TABLE IF NOT EXISTS AggSalesEmployeeTerritoryMonth (
+    MonthStart   TEXT    NOT NULL,
+    Employee_SK  INTEGER NOT NULL,
+    Territory_SK INTEGER NOT NULL,
+    Orders       INTEGER,
+    OrderLines   INTEGER,
+    Quantity     INTEGER,
+    GrossAmount  REAL,
+    NetAmount    REAL,
+    LoadDate     TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (MonthStart, Employee_SK, Territory_SK)
+);
+
+
+/* ===========================================================
+   SCHEMA VERSION — one row per applied bootstrap
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS SchemaVersion (
+    Version   INTEGER NOT NULL PRIMARY KEY,
+    AppliedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,13 @@
+/* ===========================================================
+   APPLIED SCHEMA VERSION (SQLite port)
+   Returns one row: schema_version (NULL on a cold database).
+   SQLite compiles the whole statement up front, so the empty
+   SchemaVersion table is created first on a cold database.
+   =========================================================== */
+
+CREATE TABLE IF NOT EXISTS SchemaVersion (
+    Version   INTEGER NOT NULL PRIMARY KEY,
+    AppliedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+SELECT MAX(Version) AS schema_version FROM SchemaVersion;
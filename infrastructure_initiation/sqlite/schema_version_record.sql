@@ -0,0 +1,5 @@
+/* ===========================================================
+   RECORD APPLIED SCHEMA VERSION (SQLite port)
+   =========================================================== */
+
+INSERT OR IGNORE INTO SchemaVersion (Version) VALUES (@schema_version);
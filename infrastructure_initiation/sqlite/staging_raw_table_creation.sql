@@ -0,0 +1,175 @@
+/* ===========================================================
+   STAGING RAW TABLES CREATION SCRIPT (SQLite port)
+   =========================================================== */
+
+-- Staging tables are created only if missing; task_populate_staging
+-- empties each table before loading it. SourceFile records the
+-- workbook each row was read from (several workbooks may feed a table).
+-- AUTOINCREMENT keeps staging_raw_id_sk counting up across those
+-- deletes, so the ids kept as lineage in the dimensions stay unique.
+
+---------------------------------------------------------------
+-- 1. Categories
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Categories (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    CategoryID INTEGER,
+    CategoryName TEXT,
+    Description TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 2. Customers
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Customers (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    CustomerID TEXT,
+    CompanyName TEXT,
+    ContactName TEXT,
+    ContactTitle TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    Phone TEXT,
+    Fax TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 3. Employees
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Employees (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    EmployeeID INTEGER,
+    LastName TEXT,
+    FirstName TEXT,
+    Title TEXT,
+    TitleOfCourtesy TEXT,
+    BirthDate TEXT,
+    HireDate TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    HomePhone TEXT,
+    Extension TEXT,
+    Notes TEXT,
+    ReportsTo INTEGER,
+    PhotoPath TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 4. Order Details
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_OrderDetails (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    OrderID INTEGER,
+    ProductID INTEGER,
+    UnitPrice REAL,
+    Quantity INTEGER,
+    Discount REAL,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 5. Orders
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Orders (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    OrderID INTEGER,
+    CustomerID TEXT,
+    EmployeeID INTEGER,
+    OrderDate TEXT,
+    RequiredDate TEXT,
+    ShippedDate TEXT,
+    ShipVia INTEGER,
+    Freight REAL,
+    ShipName TEXT,
+    ShipAddress TEXT,
+    ShipCity TEXT,
+    ShipRegion TEXT,
+    ShipPostalCode TEXT,
+    ShipCountry TEXT,
+    TerritoryID TEXT,
+    SourceFile TEXT,
+    -- OrderDate as a date, for the indexed fact window filters
+    OrderDay TEXT GENERATED ALWAYS AS (date(OrderDate)) STORED
+);
+
+---------------------------------------------------------------
+-- 6. Products
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Products (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    ProductID INTEGER,
+    ProductName TEXT,
+    SupplierID INTEGER,
+    CategoryID INTEGER,
+    QuantityPerUnit TEXT,
+    UnitPrice REAL,
+    UnitsInStock INTEGER,
+    UnitsOnOrder INTEGER,
+    ReorderLevel INTEGER,
+    Discontinued TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 7. Region
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Region (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    RegionID INTEGER,
+    RegionDescription TEXT,
+    RegionCategory TEXT,
+    RegionImportance TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 8. Shippers
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Shippers (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    ShipperID INTEGER,
+    CompanyName TEXT,
+    Phone TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 9. Suppliers
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Suppliers (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    SupplierID INTEGER,
+    CompanyName TEXT,
+    ContactName TEXT,
+    ContactTitle TEXT,
+    Address TEXT,
+    City TEXT,
+    Region TEXT,
+    PostalCode TEXT,
+    Country TEXT,
+    Phone TEXT,
+    Fax TEXT,
+    HomePage TEXT,
+    SourceFile TEXT
+);
+
+---------------------------------------------------------------
+-- 10. Territories
+---------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS staging_Territories (
+    staging_raw_id_sk INTEGER PRIMARY KEY AUTOINCREMENT,
+    TerritoryID TEXT,
+    TerritoryDescription TEXT,
+    TerritoryCode TEXT,
+    RegionID INTEGER,
+    SourceFile TEXT
+);
\ No newline at end of file
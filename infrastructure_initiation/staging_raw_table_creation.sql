@@ -2,31 +2,31 @@
    STAGING RAW TABLES CREATION SCRIPT
    =========================================================== */
 
--- Drop existing staging tables
-DROP TABLE IF EXISTS staging_Categories;
-DROP TABLE IF EXISTS staging_Customers;
-DROP TABLE IF EXISTS staging_Employees;
-DROP TABLE IF EXISTS staging_OrderDetails;
-DROP TABLE IF EXISTS staging_Orders;
-DROP TABLE IF EXISTS staging_Products;
-DROP TABLE IF EXISTS staging_Region;
-DROP TABLE IF EXISTS staging_Shippers;
-DROP TABLE IF EXISTS staging_Suppliers;
-DROP TABLE IF EXISTS staging_Territories;
+-- Staging tables are created only if missing; task_populate_staging
+-- truncates each table before loading it. SourceFile records the
+-- workbook each row was read from (several workbooks may feed a table).
+-- The truncate reseeds each IDENTITY past its last value (see the
+-- backend's truncate_table_sql), so the staging_raw_id_sk kept as
+-- lineage in the dimensions never points at a later, unrelated row.
+-- Date cells are staged as ISO text (YYYY-MM-DD hh:mm:ss), which the
+-- computed staging_Orders.OrderDay converts with the deterministic style 120.
 
 ---------------------------------------------------------------
 -- 1. Categories
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Categories', 'U') IS NULL
 CREATE TABLE staging_Categories (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     CategoryID INT,
     CategoryName NVARCHAR(255),
-    Description NVARCHAR(MAX)
+    Description NVARCHAR(MAX),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 2. Customers
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Customers', 'U') IS NULL
 CREATE TABLE staging_Customers (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     CustomerID NVARCHAR(50),
@@ -39,12 +39,14 @@ CREATE TABLE staging_Customers (
     PostalCode NVARCHAR(50),
     Country NVARCHAR(255),
     Phone NVARCHAR(50),
-    Fax NVARCHAR(50)
+    Fax NVARCHAR(50),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 3. Employees
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Employees', 'U') IS NULL
 CREATE TABLE staging_Employees (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     EmployeeID INT,
@@ -63,24 +65,28 @@ CREATE TABLE staging_Employees (
     Extension NVARCHAR(10),
     Notes NVARCHAR(MAX),
     ReportsTo INT,
-    PhotoPath NVARCHAR(255)
+    PhotoPath NVARCHAR(255),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 4. Order Details
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_OrderDetails', 'U') IS NULL
 CREATE TABLE staging_OrderDetails (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     OrderID INT,
     ProductID INT,
     UnitPrice FLOAT,
     Quantity INT,
-    Discount FLOAT
+    Discount FLOAT,
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 5. Orders
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Orders', 'U') IS NULL
 CREATE TABLE staging_Orders (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     OrderID INT,
@@ -97,12 +103,16 @@ CREATE TABLE staging_Orders (
     ShipRegion NVARCHAR(255),
     ShipPostalCode NVARCHAR(50),
     ShipCountry NVARCHAR(255),
-    TerritoryID NVARCHAR(50)
+    TerritoryID NVARCHAR(50),
+    SourceFile NVARCHAR(260),
+    -- OrderDate (ISO text) as a DATE, for the sargable fact window filters
+    OrderDay AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED
 );
 
 ---------------------------------------------------------------
 -- 6. Products
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Products', 'U') IS NULL
 CREATE TABLE staging_Products (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     ProductID INT,
@@ -114,33 +124,39 @@ CREATE TABLE staging_Products (
     UnitsInStock INT,
     UnitsOnOrder INT,
     ReorderLevel INT,
-    Discontinued NVARCHAR(10)
+    Discontinued NVARCHAR(10),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 7. Region
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Region', 'U') IS NULL
 CREATE TABLE staging_Region (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     RegionID INT,
     RegionDescription NVARCHAR(255),
     RegionCategory NVARCHAR(255),
-    RegionImportance NVARCHAR(255)
+    RegionImportance NVARCHAR(255),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 8. Shippers
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Shippers', 'U') IS NULL
 CREATE TABLE staging_Shippers (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     ShipperID INT,
     CompanyName NVARCHAR(255),
-    Phone NVARCHAR(50)
+    Phone NVARCHAR(50),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 9. Suppliers
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Suppliers', 'U') IS NULL
 CREATE TABLE staging_Suppliers (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     SupplierID INT,
@@ -154,16 +170,40 @@ CREATE TABLE staging_Suppliers (
     Country NVARCHAR(255),
     Phone NVARCHAR(50),
     Fax NVARCHAR(50),
-    HomePage NVARCHAR(MAX)
+    HomePage NVARCHAR(MAX),
+    SourceFile NVARCHAR(260)
 );
 
 ---------------------------------------------------------------
 -- 10. Territories
 ---------------------------------------------------------------
+IF OBJECT_ID('staging_Territories', 'U') IS NULL
 CREATE TABLE staging_Territories (
     staging_raw_id_sk INT IDENTITY(1,1) PRIMARY KEY,
     TerritoryID NVARCHAR(50),
     TerritoryDescription NVARCHAR(255),
     TerritoryCode NVARCHAR(10),
-    RegionID INT
-);
\ No newline at end of file
+    RegionID INT,
+    SourceFile NVARCHAR(260)
+);
+GO
+
+
+/* ===========================================================
+   UPGRADES — bring tables created by older versions up to date
+   =========================================================== */
+
+-- version 4: rows record their source workbook
+IF COL_LENGTH('staging_Categories', 'SourceFile') IS NULL   ALTER TABLE staging_Categories   ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Customers', 'SourceFile') IS NULL    ALTER TABLE staging_Customers    ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Employees', 'SourceFile') IS NULL    ALTER TABLE staging_Employees    ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_OrderDetails', 'SourceFile') IS NULL ALTER TABLE staging_OrderDetails ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Orders', 'SourceFile') IS NULL       ALTER TABLE staging_Orders       ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Products', 'SourceFile') IS NULL     ALTER TABLE staging_Products     ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Region', 'SourceFile') IS NULL       ALTER TABLE staging_Region       ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Shippers', 'SourceFile') IS NULL     ALTER TABLE staging_Shippers     ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Suppliers', 'SourceFile') IS NULL    ALTER TABLE staging_Suppliers    ADD SourceFile NVARCHAR(260);
+IF COL_LENGTH('staging_Territories', 'SourceFile') IS NULL  ALTER TABLE staging_Territories  ADD SourceFile NVARCHAR(260);
+
+-- version 5: OrderDate as a persisted DATE for the window filters
+IF COL_LENGTH('staging_Orders', 'OrderDay') IS NULL ALTER TABLE staging_Orders ADD OrderDay AS TRY_CONVERT(DATE, LEFT(OrderDate, 10), 120) PERSISTED;
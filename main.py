@@ -5,10 +5,31 @@ Entry point for executing the dimensional ETL pipeline from the command line.
 
 Usage:
     python main.py --start_date=1995-01-01 --end_date=1997-12-31
+    python main.py --start_date=1995-01-01 --end_date=1997-12-31 --backend=sqlite
+    python main.py --resume=<execution_id>     # restart a failed run at its first incomplete task
+
+    # stage from several workbooks (a directory or a glob), e.g. one extract per region
+    python main.py --source=extracts/ --start_date=1995-01-01 --end_date=1997-12-31
+    python main.py --source="extracts/orders_*.xlsx" --start_date=1995-01-01 --end_date=1997-12-31
+
+    # reload years of facts as monthly partitions (several ranges may be given)
+    python main.py --backfill=month --start_date=1996-01-01 --end_date=1998-12-31
+    python main.py --backfill=quarter --range=1996-07-01:1996-12-31 --range=1998-01-01:1998-05-31
+
+    # stay up, and run whenever raw_data_source.xlsx (or an .xlsx in a drop directory) changes
+    python main.py --watch --start_date=1995-01-01 --end_date=1997-12-31
+    python main.py --watch=incoming/ --start_date=1995-01-01 --end_date=1997-12-31
 """
 
+import sys
+import signal
 import argparse
+from pipeline_dimensional_data.backends import BACKENDS, set_backend
+from pipeline_dimensional_data.config import FACT_BACKFILL_MAX_WORKERS
 from pipeline_dimensional_data.flow import DimensionalDataFlow
+from pipeline_dimensional_data.service import PipelineService
+from pipeline_dimensional_data.tasks import SOURCE_PATH
+from utils import close_connection_pool
 
 
 def parse_args():
@@ -16,35 +37,154 @@ def parse_args():
 
     parser.add_argument(
         "--start_date",
-        required=True,
         type=str,
         help="Start date for fact ingestion (YYYY-MM-DD)"
     )
 
     parser.add_argument(
         "--end_date",
-        required=True,
         type=str,
         help="End date for fact ingestion (YYYY-MM-DD)"
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--backfill",
+        choices=["month", "quarter"],
+        default=None,
+        help="Load facts as month / quarter partitions in parallel instead of one window"
+    )
+
+    parser.add_argument(
+        "--range",
+        dest="ranges",
+        action="append",
+        default=[],
+        metavar="START:END",
+        help="Backfill date range (YYYY-MM-DD:YYYY-MM-DD); repeatable, used with --backfill"
+    )
+
+    parser.add_argument(
+        "--backfill_workers",
+        type=int,
+        default=FACT_BACKFILL_MAX_WORKERS,
+        help="Backfill partitions loading concurrently"
+    )
+
+    parser.add_argument(
+        "--resume",
+        metavar="EXECUTION_ID",
+        default=None,
+        help="Resume a failed run with its original dates; completed tasks are skipped"
+    )
+
+    parser.add_argument(
+        "--source",
+        default=None,
+        metavar="PATH",
+        help="Workbook, directory or glob of workbooks to stage (default: raw_data_source.xlsx)"
+    )
+
+    parser.add_argument(
+        "--watch",
+        nargs="?",
+        const=SOURCE_PATH,
+        default=None,
+        metavar="PATH",
+        help="Keep running and load the workbook (default: raw_data_source.xlsx), "
+             "or any .xlsx in a directory, whenever it changes"
+    )
+
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="Database backend (default: DB_BACKEND in pipeline_dimensional_data/config.py)"
+    )
+
+    args = parser.parse_args()
+    if args.resume:
+        if args.start_date or args.end_date or args.backfill or args.ranges or args.source:
+            parser.error("--resume reuses the dates and source of the resumed run; "
+                         "drop the date / backfill / source options")
+        return args
+
+    if bool(args.start_date) != bool(args.end_date):
+        parser.error("--start_date and --end_date go together")
+    if args.watch and (args.backfill or args.ranges):
+        parser.error("--watch runs the plain start_date / end_date load; drop the backfill options")
+    if args.watch and args.source:
+        parser.error("--watch loads the watched path; drop --source")
+    if args.ranges and not args.backfill:
+        parser.error("--range requires --backfill")
+
+    ranges = [range_arg.split(":", 1) for range_arg in args.ranges]
+    if any(len(pair) != 2 for pair in ranges):
+        parser.error("--range expects START:END")
+    if args.start_date:
+        ranges.insert(0, [args.start_date, args.end_date])
+    if not ranges:
+        parser.error("--start_date and --end_date are required unless --resume is given")
+    args.ranges = ranges
+
+    return args
 
 
 def main():
     args = parse_args()
 
-    pipeline = DimensionalDataFlow()
+    if args.backend:
+        set_backend(args.backend)
 
-    result = pipeline.exec(
-        start_date=args.start_date,
-        end_date=args.end_date
-    )
+    if args.watch:
+        watch(args)
+        return
+
+    if args.resume:
+        pipeline = DimensionalDataFlow(execution_id=args.resume)
+        try:
+            result = pipeline.resume(backend=args.backend)
+        except ValueError as e:
+            print(f"Cannot resume: {e}")
+            sys.exit(1)
+    elif args.backfill:
+        pipeline = DimensionalDataFlow(source_path=args.source)
+        try:
+            result = pipeline.backfill(
+                args.ranges,
+                partition=args.backfill,
+                partition_workers=args.backfill_workers
+            )
+        except ValueError as e:
+            print(f"Invalid backfill range: {e}")
+            sys.exit(1)
+    else:
+        pipeline = DimensionalDataFlow(source_path=args.source)
+        result = pipeline.exec(
+            start_date=args.start_date,
+            end_date=args.end_date
+        )
 
     if result["success"]:
         print(f"Pipeline executed successfully. Execution ID: {result['execution_id']}")
     else:
         print(f"Pipeline FAILED. Execution ID: {result['execution_id']}")
+        print(f"Resume with: python main.py --resume={result['execution_id']}")
+
+
+def watch(args):
+    service = PipelineService(args.start_date, args.end_date, watch_path=args.watch)
+    signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+
+    stats = service.warm()
+    print(f"Warmed {stats['connections']} connections and {stats['templates']} SQL templates "
+          f"in {stats['seconds']}s")
+    try:
+        service.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_connection_pool()
+    print(f"Stopped after {service.runs} runs.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,380 @@
+"""
+backends.py
+Database backends for the dimensional pipeline (DB_BACKEND in config.py).
+
+A backend covers everything that differs between database engines:
+  - connect()                      open one connection (pooled by utils.ConnectionPool)
+  - execute(conn, sql, ...)        run one rendered script batch (and commit,
+                                   unless the caller owns the transaction)
+  - set_session(conn, ...)         isolation level / lock timeout for a task
+  - savepoint / rollback_to_savepoint
+  - bulk_insert(cursor, ...)       load row batches into a table
+  - script_path(path)              the engine's version of a .sql script; the
+                                   dimension merges live there (T-SQL MERGE on
+                                   SQL Server, UPDATE ... FROM + INSERT on SQLite)
+  - qualify / temp_table / truncate_table_sql / update_statistics_sql
+  - parallel_writes                whether concurrent loads into the same
+                                   database actually run in parallel
+  - identity                       backend and database the pipeline writes
+                                   to (keys the staging fingerprint manifest)
+  - options                        constructor options that reopen the same
+                                   database (set_backend(name, **options))
+
+SqlServerBackend is the original pyodbc path. SqliteBackend runs the
+pipeline against an embedded database file (Python's built-in sqlite3),
+using the SQLite ports of the scripts in each script folder's sqlite/
+directory, so the pipeline and its benchmarks run without SQL Server.
+"""
+
+import os
+import re
+import sys
+import hashlib
+import datetime
+import itertools
+import threading
+import sqlite3
+
+from pipeline_dimensional_data.config import (
+    database_name,
+    schema_name,
+    DB_BACKEND,
+    DB_POOL_SIZE,
+    SQLITE_PATH
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils import (
+    get_connection_pool,
+    close_connection_pool,
+    create_db_connection,
+    load_db_config,
+    execute_sql,
+    bulk_insert
+)
+
+
+SQLSERVER_ISOLATION_LEVELS = ("READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SNAPSHOT", "SERIALIZABLE")
+
+
+class SqlServerBackend:
+    """ORDER_DDS on SQL Server (pyodbc, sql_server_config.cfg)."""
+
+    name = "sqlserver"
+    parallel_writes = True
+
+    @property
+    def identity(self) -> str:
+        """The database the pipeline writes to: server and ORDER_DDS database name."""
+        server = (load_db_config().get("server") or "").lower()
+        return f"sqlserver:{server}/{database_name}"
+
+    @property
+    def options(self) -> dict:
+        return {}
+
+    def connect(self):
+        return create_db_connection(load_db_config())
+
+    def pool(self):
+        return get_connection_pool(DB_POOL_SIZE, connect=self.connect)
+
+    def script_path(self, sql_path: str) -> str:
+        return sql_path
+
+    def qualify(self, table_name: str) -> str:
+        return f"{database_name}.{schema_name}.{table_name}"
+
+    def temp_table(self, name: str) -> str:
+        return f"#{name}"
+
+    def truncate_table_sql(self, table_name: str) -> str:
+        # TRUNCATE restarts the IDENTITY at its seed; reseed it past the last
+        # value, so ids kept as lineage (staging_raw_id_sk) are never reused
+        return (
+            f"DECLARE @next_id BIGINT = IDENT_CURRENT('{table_name}') + 1; "
+            f"TRUNCATE TABLE {table_name}; "
+            f"IF @next_id IS NOT NULL DBCC CHECKIDENT ('{table_name}', RESEED, @next_id) WITH NO_INFOMSGS;"
+        )
+
+    def update_statistics_sql(self, table_name: str) -> str:
+        return f"UPDATE STATISTICS {self.qualify(table_name)};"
+
+    def execute(self, conn, sql_text: str, rowcounts: list = None, params: list = None,
+                commit: bool = True) -> list:
+        return execute_sql(conn, sql_text, rowcounts=rowcounts, params=params, commit=commit)
+
+    def set_session(self, conn, isolation_level: str = "READ COMMITTED", lock_timeout: float = None,
+                    xact_abort: bool = True):
+        """
+        Set the session options of a task. They outlive the task on a pooled
+        connection, so every task sets all of them.
+
+        XACT_ABORT ON rolls the whole transaction back on any runtime error;
+        it is turned off only for savepoints (which need the transaction to
+        survive a failed batch).
+        """
+        level = isolation_level.upper()
+        if level not in SQLSERVER_ISOLATION_LEVELS:
+            raise ValueError(f"Unknown isolation level: {isolation_level}")
+        timeout_ms = -1 if lock_timeout is None else int(lock_timeout * 1000)
+        conn.cursor().execute(
+            f"SET XACT_ABORT {'ON' if xact_abort else 'OFF'}; "
+            f"SET TRANSACTION ISOLATION LEVEL {level}; "
+            f"SET LOCK_TIMEOUT {timeout_ms};"
+        )
+
+    def savepoint(self, conn, name: str):
+        # SAVE TRANSACTION needs an open transaction, which implicit
+        # transactions only start at the first data statement
+        conn.cursor().execute(f"IF @@TRANCOUNT = 0 BEGIN TRANSACTION; SAVE TRANSACTION {name};")
+
+    def rollback_to_savepoint(self, conn, name: str):
+        # fails if the error doomed the transaction; the caller then rolls back everything
+        conn.cursor().execute(f"ROLLBACK TRANSACTION {name};")
+
+    def bulk_insert(self, cursor, table_name: str, rows, num_cols: int,
+                    batch_size: int = 5000, columns: list = None) -> int:
+        return bulk_insert(cursor, table_name, rows, num_cols, batch_size=batch_size, columns=columns)
+
+
+# ==============================================================
+# SQLite (embedded)
+# ==============================================================
+
+# "?" outside string literals, i.e. a bind parameter of the statement
+_BIND_MARKER_PATTERN = re.compile(r"'(?:[^']|'')*'|\?")
+
+
+def _row_hash(text):
+    """SQL function row_hash(text): SHA-256 digest, the HASHBYTES('SHA2_256', ...) of the ports."""
+    if text is None:
+        return None
+    return hashlib.sha256(str(text).encode("utf-8")).digest()
+
+
+def _split_statements(sql_text: str) -> list:
+    """Split a batch into complete SQLite statements (semicolons inside literals are kept)."""
+    statements = []
+    pending = ""
+    for piece in sql_text.split(";"):
+        pending += piece + ";"
+        if sqlite3.complete_statement(pending):
+            if pending.strip(" \t\r\n;"):
+                statements.append(pending.strip())
+            pending = ""
+    if pending.strip(" \t\r\n;"):
+        statements.append(pending.strip())
+    return statements
+
+
+def _bind_count(statement: str) -> int:
+    return sum(1 for match in _BIND_MARKER_PATTERN.finditer(statement) if match.group(0) == "?")
+
+
+# openpyxl yields datetime values; store them as ISO text so date() and
+# BETWEEN work on them (the implicit sqlite3 adapters are deprecated)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+
+
+class SqliteBackend:
+    """
+    ORDER_DDS as a local SQLite file (no server, stdlib only).
+
+    - One file, WAL journal: readers never block the single writer; parallel
+      writers queue on the database lock (busy timeout) instead of failing.
+    - Every script batch runs in a BEGIN IMMEDIATE transaction (or in the
+      caller's transaction, see execute).
+    - Transactions are always serializable; set_session only sets the lock
+      (busy) timeout.
+    - @database_name / @schema_name do not exist in SQLite: the ports use
+      bare table names, and qualify() returns the bare name.
+    """
+
+    name = "sqlite"
+    parallel_writes = False     # one writer per database file
+
+    def __init__(self, path: str = SQLITE_PATH, busy_timeout: float = 60.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    @property
+    def identity(self) -> str:
+        """The database the pipeline writes to: the absolute path of its file."""
+        return f"sqlite:{os.path.abspath(self.path)}"
+
+    @property
+    def options(self) -> dict:
+        return {"path": os.path.abspath(self.path), "busy_timeout": self.busy_timeout}
+
+    def connect(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # autocommit mode: transactions are opened explicitly (execute / bulk_insert)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                               check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.create_function("row_hash", 1, _row_hash, deterministic=True)
+        return conn
+
+    def pool(self):
+        return get_connection_pool(DB_POOL_SIZE, connect=self.connect)
+
+    def script_path(self, sql_path: str) -> str:
+        """Return the SQLite port of a script: <script dir>/sqlite/<script name>."""
+        ported = os.path.join(os.path.dirname(sql_path), "sqlite", os.path.basename(sql_path))
+        if not os.path.exists(ported):
+            raise FileNotFoundError(f"No SQLite port of {sql_path} (expected {ported})")
+        return ported
+
+    def qualify(self, table_name: str) -> str:
+        return table_name
+
+    def temp_table(self, name: str) -> str:
+        return f"temp.{name}"
+
+    def truncate_table_sql(self, table_name: str) -> str:
+        # no TRUNCATE in SQLite; an unfiltered DELETE uses the truncate optimization,
+        # and AUTOINCREMENT keys (the staging ids) keep counting from sqlite_sequence
+        return f"DELETE FROM {table_name}"
+
+    def update_statistics_sql(self, table_name: str) -> str:
+        return f"ANALYZE {table_name};"
+
+    def execute(self, conn, sql_text: str, rowcounts: list = None, params: list = None,
+                commit: bool = True) -> list:
+        """
+        Same contract as utils.execute_sql: run every statement of the batch
+        in one transaction, append DML row counts to `rowcounts`, commit
+        (unless commit=False) and return the rows of the last result set as
+        dicts.
+
+        sqlite3 runs one statement per call, so the batch is split and the
+        "?" parameters are handed out to the statements in order.
+        """
+        params = list(params or [])
+        cursor = conn.cursor()
+        try:
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            rows = []
+            position = 0
+            for statement in _split_statements(sql_text):
+                count = _bind_count(statement)
+                cursor.execute(statement, params[position:position + count])
+                position += count
+                if cursor.description:
+                    columns = [column[0] for column in cursor.description]
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                elif rowcounts is not None and cursor.rowcount >= 0:
+                    rowcounts.append(cursor.rowcount)
+            if commit:
+                conn.commit()
+            return rows
+        except Exception as e:
+            if commit:
+                conn.rollback()
+            raise RuntimeError(f"SQL execution failed: {e}")
+
+    def set_session(self, conn, isolation_level: str = "SERIALIZABLE", lock_timeout: float = None,
+                    xact_abort: bool = True):
+        """Set the lock timeout of a task (busy_timeout if None); SQLite has no other isolation levels."""
+        timeout = self.busy_timeout if lock_timeout is None else lock_timeout
+        conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+
+    def savepoint(self, conn, name: str):
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"SAVEPOINT {name}")
+
+    def rollback_to_savepoint(self, conn, name: str):
+        conn.execute(f"ROLLBACK TO {name}")
+
+    @staticmethod
+    def _insert_columns(cursor, table_name: str) -> list:
+        schema, _, table = table_name.rpartition(".")
+        pragma = f"PRAGMA {schema}.table_info({table})" if schema else f"PRAGMA table_info({table})"
+        return [
+            name for _, name, column_type, _, _, pk in cursor.execute(pragma).fetchall()
+            if not (pk and column_type.upper() == "INTEGER")
+        ]
+
+    def bulk_insert(self, cursor, table_name: str, rows, num_cols: int,
+                    batch_size: int = 5000, columns: list = None) -> int:
+        """
+        executemany per batch, each batch in its own transaction: SQLite has
+        a single writer, so the write lock is taken only once a batch has been
+        read from `rows` (e.g. streamed from a workbook) and released right
+        after, letting parallel staging loads interleave. A transaction the
+        caller already opened is left to the caller to commit.
+
+        Without `columns`, the rows fill the table's columns in order after
+        its INTEGER PRIMARY KEY, as SQL Server skips an IDENTITY column.
+        """
+        if columns is None:
+            columns = self._insert_columns(cursor, table_name)
+        columns_sql = f" ({', '.join(columns)})"
+        placeholders = ", ".join(["?"] * num_cols)
+        query = f"INSERT INTO {table_name}{columns_sql} VALUES ({placeholders})"
+
+        conn = cursor.connection
+        rows = iter(rows)
+        total = 0
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            own_transaction = not conn.in_transaction
+            if own_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(query, batch)
+            except Exception:
+                if own_transaction:
+                    conn.rollback()
+                raise
+            if own_transaction:
+                conn.commit()
+            total += len(batch)
+        return total
+
+
+BACKENDS = {
+    "sqlserver": SqlServerBackend,
+    "sqlite": SqliteBackend,
+}
+
+_BACKEND = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide backend (DB_BACKEND in config.py unless set_backend was called)."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = _create_backend(DB_BACKEND)
+        return _BACKEND
+
+
+def set_backend(name: str, **options):
+    """
+    Switch the process to another backend (e.g. from a --backend flag); closes
+    the old pool. `options` go to the backend's constructor (e.g. path= for SQLite).
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        _BACKEND = _create_backend(name, **options)
+    close_connection_pool()
+    return _BACKEND
+
+
+def _create_backend(name: str, **options):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown database backend: {name} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
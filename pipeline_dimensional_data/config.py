@@ -6,12 +6,26 @@ Contains:
     - database_name
     - schema_name
     - mapping of dimension tables to staging tables
-    - fact table names
+    - fact and aggregate table names
+    - staging load tuning
+    - database backend selection
+    - run state (resume) settings
 """
 
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 database_name = "ORDER_DDS"
 schema_name = "dbo"
 
+# Database backend (see backends.py):
+#   "sqlserver" — ORDER_DDS on SQL Server via pyodbc (sql_server_config.cfg)
+#   "sqlite"    — embedded local database file at SQLITE_PATH, no server needed;
+#                 runs the SQLite ports in each script folder's sqlite/ directory
+DB_BACKEND = "sqlserver"
+SQLITE_PATH = os.path.join(PROJECT_ROOT, ".pipeline_cache", "order_dds.sqlite")
+
 # Dimension table mapping
 DIM_TABLES = {
     "DimCategories": "staging_Categories",
@@ -27,4 +41,98 @@ DIM_TABLES = {
 # Fact tables
 FACT_TABLE = "FactOrders"
 FACT_ERROR_TABLE = "FactOrders_Error"
-STAGING_FACT_TABLE = "staging_Orders"
\ No newline at end of file
+STAGING_FACT_TABLE = "staging_Orders"
+STAGING_FACT_DETAILS_TABLE = "staging_OrderDetails"
+
+# Dashboard aggregates of FactOrders (task_update_aggregates, after each fact load)
+AGG_DAY_CUSTOMER_TABLE = "AggSalesDayCustomer"
+AGG_PRODUCT_MONTH_TABLE = "AggSalesProductMonth"
+AGG_EMPLOYEE_TERRITORY_MONTH_TABLE = "AggSalesEmployeeTerritoryMonth"
+
+# Fact load mode:
+#   "incremental" — delete + reload only the start_date/end_date OrderDate window (update_fact.sql)
+#   "full"        — truncate and reload the whole fact table (update_factorders.sql)
+FACT_LOAD_MODE = "incremental"
+
+# Where fact surrogate keys are resolved:
+#   "sql"    — server-side dimension joins (update_fact.sql / update_factorders.sql)
+#   "python" — in-memory NK -> SK lookups in fact_assembly.py (needs pandas + numpy)
+FACT_ASSEMBLY_ENGINE = "sql"
+
+# Which version of the SCD2 dimensions (DimCustomers, DimProducts) a fact row gets:
+#   "current" — the current version (IsCurrent = 1), whatever the OrderDate
+#   "as_of"   — the version valid on the OrderDate (ValidFrom <= OrderDate < ValidTo);
+#               a key's first version counts from 1900-01-01, so orders older
+#               than the first dimension load resolve to it. Use this for backfills.
+FACT_KEY_RESOLUTION = "current"
+
+# Fact backfill (main.py --backfill / DimensionalDataFlow.backfill): a long date
+# range is reloaded as calendar partitions, each its own window load and commit
+FACT_BACKFILL_PARTITION = "month"     # "month" or "quarter"
+FACT_BACKFILL_MAX_WORKERS = 4         # partitions loading concurrently
+FACT_BACKFILL_RETRIES = 2             # retries of a failed partition
+FACT_BACKFILL_RETRY_BACKOFF = 2.0     # seconds before the first retry, doubled per retry
+
+# Version of the infrastructure_initiation DDL. Bump it whenever those scripts
+# change; task_initialize_dimensional_db skips all DDL while ORDER_DDS already
+# records this version in dbo.SchemaVersion.
+SCHEMA_VERSION = 6
+
+# Staging load tuning
+STAGING_BATCH_SIZE = 5000   # rows sent per executemany / INSERT batch
+STAGING_MAX_WORKERS = 4     # parallel staging loads (1 = sequential, single connection)
+# Processes parsing the source workbooks, one workbook per process (0 = parse in
+# the loading threads). Only a directory of several workbooks gains from them.
+STAGING_PARSE_PROCESSES = 0
+
+# Skip staging tables (and their dimension loads) whose source sheet is unchanged
+STAGING_SKIP_UNCHANGED = True
+STAGING_FINGERPRINT_PATH = os.path.join(PROJECT_ROOT, ".pipeline_cache", "staging_fingerprints.json")
+
+# Typed validation of staging rows against staging_raw_table_creation.sql
+# (staging_validation.py, needs pandas + numpy): rows that cannot be coerced
+# to their column types are written to STAGING_REJECTS_PATH instead of
+# failing the load. Off by default so the pipeline needs no pandas; without
+# it an order whose OrderDate does not parse still lands in FactOrders_Error
+# (INVALID_ORDER_DATE) rather than being dropped
+STAGING_VALIDATION = False
+STAGING_REJECTS_PATH = os.path.join(PROJECT_ROOT, "logs", "staging_rejects.jsonl")
+
+# Refresh optimizer statistics (UPDATE STATISTICS) after each load
+REFRESH_STATISTICS = True
+
+# Connection pool shared by all tasks in a process
+DB_POOL_SIZE = 8
+
+# Transactions of run_sql_task (see tasks.run_sql_task):
+#   "task"  — all GO batches of a script in one transaction with one commit;
+#             a failure rolls the whole script back
+#   "batch" — commit after every GO batch (the schema bootstrap always uses this)
+SQL_TRANSACTION_MODE = "task"
+SQL_SAVEPOINTS = False                  # "task" mode: a failed batch rolls back to its savepoint
+                                        # and the batches before it are committed
+SQL_ISOLATION_LEVEL = "READ COMMITTED"  # SQL Server; SQLite transactions are always serializable
+SQL_LOCK_TIMEOUT = None                 # seconds to wait for a lock (None = backend default)
+
+# Flow scheduling
+FLOW_MAX_WORKERS = 4        # concurrent tasks in the DimensionalDataFlow task graph
+
+# Per-task metrics (JSON lines next to the text log, keyed by execution_id)
+METRICS_PATH = os.path.join(PROJECT_ROOT, "logs", "metrics_dimensional_data_pipeline.jsonl")
+METRICS_TRACE_MEMORY = False  # tracemalloc peak per task; adds allocation overhead (the benchmarks trace anyway)
+
+# Run state per execution_id (task completion + input fingerprints), used by
+# `main.py --resume <execution_id>` to restart a failed run at its first
+# incomplete task (see run_state.py)
+RUN_STATE_DIR = os.path.join(PROJECT_ROOT, ".pipeline_cache", "runs")
+RUN_STATE_KEEP = 100          # most recent run state files kept
+
+# Watch mode (`main.py --watch`, see service.py): a long-running process that
+# keeps connections and compiled SQL templates warm and runs the pipeline
+# whenever the watched workbook (or an .xlsx in a watched directory) changes
+WATCH_POLL_INTERVAL = 0.2     # seconds between file scans
+WATCH_DEBOUNCE = 0.5          # a changed file must stay unchanged this long before a run
+
+# Pipeline log (etl_logging.py): records are queued and written by a listener
+# thread; a full queue makes the logging thread wait rather than drop records
+LOG_QUEUE_SIZE = 10000
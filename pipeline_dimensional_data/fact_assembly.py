@@ -0,0 +1,392 @@
+"""
+fact_assembly.py
+Python-side FactOrders assembly (FACT_ASSEMBLY_ENGINE = "python" in config.py).
+
+Instead of resolving surrogate keys with six server-side LEFT JOINs, the
+engine:
+  - loads each dimension's current NK -> SK map once into a KeyLookup
+    (pandas Index + NumPy array)
+  - reads the staged order lines for the window and resolves every key
+    column in one vectorized get_indexer call per dimension
+  - with as_of (FACT_KEY_RESOLUTION = "as_of"), loads every version of the
+    SCD2 dimensions into a VersionLookup instead and resolves each line to
+    the version valid on its OrderDate with one pandas merge_asof
+  - bulk-writes the assembled rows (the backend's bulk insert) into a
+    session work table and moves them into FactOrders / FactOrders_Error
+    in a single transaction (fact_assembly_apply.sql), with the same
+    ErrorCode rules as update_fact.sql
+
+pandas and NumPy are optional dependencies, only needed for this engine.
+"""
+
+import os
+import time
+
+# optional, imported on first use by _require_pandas: only the "python"
+# fact engine needs them
+np = pd = None
+
+from pipeline_dimensional_data.config import (
+    database_name,
+    schema_name,
+    FACT_TABLE,
+    FACT_ERROR_TABLE,
+    STAGING_FACT_TABLE,
+    STAGING_FACT_DETAILS_TABLE,
+    STAGING_BATCH_SIZE
+)
+from pipeline_dimensional_data.backends import get_backend
+from utils import load_sql_template
+
+QUERIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries")
+
+# (dimension, NK column, SK column, filter, staged column resolved against it)
+DIMENSION_LOOKUPS = [
+    ("DimCustomers", "Customer_NK", "Customer_SK", "IsCurrent = 1", "CustomerID"),
+    ("DimEmployees", "Employee_NK", "Employee_SK", "IsDeleted = 0", "EmployeeID"),
+    ("DimProducts", "Product_NK", "Product_SK", "IsCurrent = 1", "Product_NK"),
+    ("DimShippers", "Shipper_NK", "Shipper_SK", None, "ShipVia"),
+    ("DimTerritories", "Territory_NK", "Territory_SK", None, "TerritoryID"),
+    ("DimRegion", "Region_NK", "Region_SK", None, "ShipRegion"),
+]
+
+# first unresolved key wins, in this order (same as update_fact.sql); an
+# order without an OrderDay (OrderDate missing or unparseable) is
+# INVALID_ORDER_DATE before any key
+ERROR_CODES = [
+    ("Customer_SK", "MISSING_CUSTOMER"),
+    ("Employee_SK", "MISSING_EMPLOYEE"),
+    ("Product_SK", "MISSING_PRODUCT"),
+    ("Shipper_SK", "MISSING_SHIPPER"),
+    ("Territory_SK", "MISSING_TERRITORY"),
+]
+
+ASSEMBLED_COLUMNS = [
+    "Order_NK", "Product_NK",
+    "Customer_SK", "Employee_SK", "Product_SK", "Shipper_SK", "Territory_SK", "Region_SK",
+    "OrderDate", "RequiredDate", "ShippedDate", "Freight",
+    "UnitPrice", "Quantity", "Discount",
+    "staging_raw_id_sk", "SourceFile", "ErrorCode",
+]
+
+# dimensions with SCD2 history (ValidFrom / ValidTo), resolved by date with as_of
+SCD2_DIMENSIONS = ("DimCustomers", "DimProducts")
+
+MISSING_SK = -1
+FETCH_SIZE = 50000
+
+
+def _load_query(file_name: str):
+    """Compiled template of a fact-assembly script, in the backend's dialect."""
+    return load_sql_template(get_backend().script_path(os.path.join(QUERIES_DIR, file_name)))
+
+
+def _require_pandas():
+    global np, pd
+    if pd is None or np is None:
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                'FACT_ASSEMBLY_ENGINE = "python" needs pandas and numpy '
+                "(pip install pandas numpy)"
+            )
+
+
+class KeyLookup:
+    """
+    NK -> SK map of one dimension.
+
+    Natural keys live in a pandas Index (hash table), surrogate keys in a
+    parallel int64 array, so a whole column of natural keys is resolved
+    with one get_indexer call and one array take.
+    """
+
+    def __init__(self, name: str, natural_keys, surrogate_keys):
+        series = pd.Series(np.asarray(surrogate_keys, dtype=np.int64), index=pd.Index(natural_keys))
+        # a natural key should be current once; keep the latest SK if not
+        series = series[~series.index.duplicated(keep="last")]
+        self.name = name
+        self.index = series.index
+        self.values = series.to_numpy()
+
+    def __len__(self):
+        return len(self.values)
+
+    def resolve(self, natural_keys, key_dates=None) -> "np.ndarray":
+        """Return the SK per natural key, MISSING_SK where it is unknown."""
+        positions = self.index.get_indexer(natural_keys)
+        if len(self.values) == 0:
+            return np.full(len(positions), MISSING_SK, dtype=np.int64)
+        return np.where(positions >= 0, self.values[positions], MISSING_SK)
+
+
+class VersionLookup:
+    """
+    (NK, date) -> SK map of an SCD2 dimension, over all of its versions.
+
+    Each version covers [ValidFrom, ValidTo); a key's first version is
+    extended back to 1900-01-01 (as in the SQL scripts), and a ValidTo
+    beyond pandas' date range (9999-12-31) is open-ended. resolve() sorts
+    the lines by date once and matches them to their key's latest version
+    starting on or before that date with one merge_asof.
+    """
+
+    def __init__(self, name: str, natural_keys, surrogate_keys, valid_from, valid_to):
+        versions = pd.DataFrame({
+            "natural_key": pd.Series(natural_keys, dtype=object),
+            "surrogate_key": np.asarray(surrogate_keys, dtype=np.int64),
+            "valid_from": pd.to_datetime(pd.Series(valid_from, dtype=object), errors="coerce"),
+            "valid_to": pd.to_datetime(pd.Series(valid_to, dtype=object), errors="coerce"),
+        })
+        versions = versions.sort_values(["natural_key", "valid_from"], kind="stable")
+        versions.loc[~versions["natural_key"].duplicated(), "valid_from"] = pd.Timestamp("1900-01-01")
+        self.name = name
+        self.versions = versions.dropna(subset=["valid_from"]).sort_values("valid_from", kind="stable")
+
+    def __len__(self):
+        return len(self.versions)
+
+    def resolve(self, natural_keys, key_dates) -> "np.ndarray":
+        """
+        Return the SK of the version valid on each line's date, MISSING_SK
+        where there is none. A line without a date gets the current version.
+        """
+        # object keys on both sides: merge_asof needs the same "by" dtype
+        lines = pd.DataFrame({
+            "natural_key": pd.Series(np.asarray(natural_keys, dtype=object), dtype=object),
+            "key_date": key_dates.fillna(pd.Timestamp.max).to_numpy(),
+            "position": np.arange(len(key_dates)),
+        }).sort_values("key_date", kind="stable")
+
+        matched = pd.merge_asof(
+            lines, self.versions,
+            left_on="key_date", right_on="valid_from", by="natural_key", direction="backward",
+        )
+        valid = matched["surrogate_key"].notna() & (
+            matched["valid_to"].isna() | (matched["key_date"] < matched["valid_to"])
+        )
+
+        resolved = np.full(len(lines), MISSING_SK, dtype=np.int64)
+        resolved[matched.loc[valid, "position"].to_numpy()] = matched.loc[valid, "surrogate_key"].to_numpy(np.int64)
+        return resolved
+
+
+def load_key_lookups(cursor, as_of: bool = False) -> dict:
+    """
+    Read every dimension's current NK -> SK map into KeyLookup tables;
+    with as_of, every version of the SCD2 dimensions into VersionLookups.
+    """
+    backend = get_backend()
+    lookups = {}
+    for dim_table, nk_column, sk_column, row_filter, _ in DIMENSION_LOOKUPS:
+        if as_of and dim_table in SCD2_DIMENSIONS:
+            cursor.execute(
+                f"SELECT {nk_column}, {sk_column}, ValidFrom, ValidTo "
+                f"FROM {backend.qualify(dim_table)}"
+            )
+            rows = cursor.fetchall()
+            lookups[sk_column] = VersionLookup(
+                dim_table,
+                [row[0] for row in rows],
+                [row[1] for row in rows],
+                [row[2] for row in rows],
+                [row[3] for row in rows],
+            )
+            continue
+
+        where = f" WHERE {row_filter}" if row_filter else ""
+        cursor.execute(
+            f"SELECT {nk_column}, {sk_column} "
+            f"FROM {backend.qualify(dim_table)}{where}"
+        )
+        rows = cursor.fetchall()
+        lookups[sk_column] = KeyLookup(
+            dim_table,
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+        )
+    return lookups
+
+
+def read_staged_lines(cursor, full_refresh: bool, start_date=None, end_date=None,
+                      undated=True) -> "pd.DataFrame":
+    """
+    Read the staged order lines of the window (or all of them) into a
+    DataFrame; `undated` adds the lines without an OrderDay to a window.
+    """
+    template = _load_query("fact_assembly_source.sql")
+    [(sql_text, values)] = template.render(
+        {
+            "database_name": database_name,
+            "schema_name": schema_name,
+            "orders_staging_table": STAGING_FACT_TABLE,
+            "details_staging_table": STAGING_FACT_DETAILS_TABLE,
+        },
+        {"full_refresh": int(full_refresh), "start_date": start_date, "end_date": end_date,
+         "undated": int(undated)},
+    )
+    cursor.execute(sql_text, values)
+    columns = [column[0] for column in cursor.description]
+
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        chunks.append(pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns))
+
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def resolve_keys(lines: "pd.DataFrame", lookups: dict) -> (dict, dict):
+    """
+    Resolve every SK column of the staged lines.
+
+    Returns:
+        (dict, dict): SK arrays per SK column, lookup stats per dimension
+                      (rows, resolved, missing, seconds, lookups_per_sec)
+    """
+    keys = {}
+    stats = {}
+    key_dates = None
+    if any(isinstance(lookup, VersionLookup) for lookup in lookups.values()):
+        key_dates = pd.to_datetime(lines["OrderDate"], errors="coerce")
+
+    for dim_table, _, sk_column, _, staged_column in DIMENSION_LOOKUPS:
+        natural_keys = lines[staged_column]
+        if staged_column == "ShipRegion":
+            # free text in the source; only numeric values are region ids
+            natural_keys = pd.to_numeric(natural_keys, errors="coerce")
+
+        started = time.perf_counter()
+        resolved = lookups[sk_column].resolve(natural_keys, key_dates)
+        elapsed = time.perf_counter() - started
+
+        keys[sk_column] = resolved
+        missing = int((resolved == MISSING_SK).sum())
+        stats[dim_table] = {
+            "map_size": len(lookups[sk_column]),
+            "rows": len(resolved),
+            "resolved": len(resolved) - missing,
+            "missing": missing,
+            "seconds": round(elapsed, 6),
+            "lookups_per_sec": round(len(resolved) / elapsed, 1) if elapsed > 0 else None,
+        }
+    return keys, stats
+
+
+def assemble_rows(lines: "pd.DataFrame", keys: dict) -> "pd.DataFrame":
+    """Build the #fact_assembled rows: resolved SKs, measures and ErrorCode."""
+    # nullable ints: a NULL in an INT staging column would otherwise turn it into floats
+    assembled = pd.DataFrame({
+        "Order_NK": lines["Order_NK"].astype("Int64"),
+        "Product_NK": lines["Product_NK"].astype("Int64"),
+    })
+    for sk_column, values in keys.items():
+        assembled[sk_column] = pd.array(np.where(values == MISSING_SK, None, values), dtype="Int64")
+
+    conditions = [lines["OrderDay"].isna().to_numpy()]
+    codes = ["INVALID_ORDER_DATE"]
+    conditions += [keys[sk_column] == MISSING_SK for sk_column, _ in ERROR_CODES]
+    codes += [code for _, code in ERROR_CODES]
+    region_ids = pd.to_numeric(lines["ShipRegion"], errors="coerce")
+    conditions.append((keys["Region_SK"] == MISSING_SK) & region_ids.notna().to_numpy())
+    codes.append("MISSING_REGION")
+    error_codes = np.select(conditions, codes, default="")
+
+    for column in ("OrderDate", "RequiredDate", "ShippedDate", "Freight", "UnitPrice", "Discount", "SourceFile"):
+        assembled[column] = lines[column]
+    for column in ("Quantity", "staging_raw_id_sk"):
+        assembled[column] = lines[column].astype("Int64")
+    assembled["ErrorCode"] = pd.Series(error_codes, index=lines.index).replace("", None)
+
+    return assembled[ASSEMBLED_COLUMNS]
+
+
+def _native_rows(frame: "pd.DataFrame"):
+    """Yield row tuples of plain Python values (neither pyodbc nor sqlite3 binds NumPy scalars)."""
+    columns = [
+        [None if pd.isna(value) else value for value in frame[column].astype(object).tolist()]
+        for column in frame.columns
+    ]
+    return zip(*columns)
+
+
+def assemble_fact_orders(start_date=None, end_date=None, full_refresh=False, as_of=False,
+                         undated=True) -> dict:
+    """
+    Load FactOrders / FactOrders_Error with keys resolved in Python
+    (SCD2 keys as of each OrderDate with `as_of`). A window load with
+    `undated` also replaces the rejects of the orders without an OrderDay.
+
+    Returns the task result dict: counts (loaded / rejected rows), per
+    dimension lookup stats under "lookups", and timing metrics.
+    """
+    _require_pandas()
+
+    metrics = {"connect_seconds": 0.0, "execute_seconds": 0.0, "rows_affected": 0}
+    backend = get_backend()
+    pool = backend.pool()
+
+    started = time.perf_counter()
+    with pool.connection() as conn:
+        metrics["connect_seconds"] = round(time.perf_counter() - started, 4)
+        cursor = conn.cursor()
+
+        started = time.perf_counter()
+        lookups = load_key_lookups(cursor, as_of=as_of)
+        lines = read_staged_lines(cursor, full_refresh, start_date, end_date, undated)
+        conn.commit()
+        read_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        keys, lookup_stats = resolve_keys(lines, lookups)
+        assembled = assemble_rows(lines, keys)
+        assemble_seconds = time.perf_counter() - started
+
+        for dim_table, stats in lookup_stats.items():
+            print(f"{dim_table}: {stats['resolved']}/{stats['rows']} keys resolved "
+                  f"({stats['lookups_per_sec']} lookups/s, map size {stats['map_size']})")
+
+        started = time.perf_counter()
+        stage_sql = _load_query("fact_assembly_stage.sql")
+        for sql_text, values in stage_sql.render({}):
+            backend.execute(conn, sql_text, params=values)
+
+        backend.bulk_insert(
+            cursor, backend.temp_table("fact_assembled"), _native_rows(assembled), len(ASSEMBLED_COLUMNS),
+            batch_size=STAGING_BATCH_SIZE, columns=ASSEMBLED_COLUMNS,
+        )
+        conn.commit()
+
+        apply_sql = _load_query("fact_assembly_apply.sql")
+        counts = {}
+        for sql_text, values in apply_sql.render(
+            {
+                "database_name": database_name,
+                "schema_name": schema_name,
+                "fact_table_name": FACT_TABLE,
+                "fact_error_table_name": FACT_ERROR_TABLE,
+            },
+            {"full_refresh": int(full_refresh), "start_date": start_date, "end_date": end_date,
+             "undated": int(undated)},
+        ):
+            rows = backend.execute(conn, sql_text, params=values)
+            if len(rows) == 1:
+                counts = rows[0]
+        write_seconds = time.perf_counter() - started
+
+    metrics["execute_seconds"] = round(read_seconds + write_seconds, 4)
+    metrics["assemble_seconds"] = round(assemble_seconds, 4)
+    metrics["rows_affected"] = len(assembled)
+
+    return {
+        "success": True,
+        "counts": counts,
+        "lookups": lookup_stats,
+        "metrics": metrics,
+    }
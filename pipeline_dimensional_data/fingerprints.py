@@ -0,0 +1,162 @@
+"""
+fingerprints.py
+Content fingerprints of the staging source sheets.
+
+A small JSON manifest per database (manifest_path: STAGING_FINGERPRINT_PATH
+in config.py, suffixed with the backend and a hash of the database
+identity, so a SQLite file and a SQL Server database never share
+fingerprints) records, per staging table, the sheet and, for each source
+workbook feeding it, the SHA-256 of the workbook file and of the
+sheet's values as of the last successful load. task_populate_staging
+skips tables whose workbooks are all byte-identical, and hashes the
+sheet values of the others as they stream into staging (RowsFingerprint),
+so a re-saved workbook with the same values still counts as unchanged.
+
+The manifest also records, per dimension task, the fingerprints of the
+staging tables it last loaded and committed (record_load).
+DimensionalDataFlow skips a dimension load only when its staging tables
+are unchanged and that record matches their current fingerprints, so a
+dimension load that failed or rolled back runs again on the next run even
+though its staging tables are unchanged.
+
+Manifest layout:
+    {
+      "tables": {
+        "staging_Orders": {
+          "sheet": "Orders",
+          "sources": {
+            "/abs/path/raw_data_source.xlsx": {
+              "file_fingerprint": "<sha256 of the workbook file>",
+              "fingerprint": "<sha256 of the sheet values>",
+              "rows": 830
+            },
+            ...
+          }
+        },
+        ...
+      },
+      "loads": {
+        "task_update_dim_shippers": {"staging_Shippers": "<table_fingerprint>"},
+        ...
+      }
+    }
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+# reentrant: record_load saves while holding it
+_manifest_lock = threading.RLock()
+
+
+def manifest_path(path: str, identity: str) -> str:
+    """
+    The manifest of one database: `path` with the backend name and a hash
+    of `identity` (e.g. "sqlite:/abs/order_dds.sqlite") before its extension.
+    """
+    root, ext = os.path.splitext(path)
+    backend = identity.partition(":")[0]
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:12]
+    return f"{root}.{backend}-{digest}{ext}"
+
+
+def load_manifest(path: str) -> dict:
+    """Return the fingerprint manifest, or an empty one if missing / unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"tables": {}, "loads": {}}
+
+    manifest.setdefault("tables", {})
+    manifest.setdefault("loads", {})
+    return manifest
+
+
+def save_manifest(path: str, manifest: dict):
+    """Atomically write the manifest (temp file + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with _manifest_lock:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def table_fingerprint(entry: dict) -> str:
+    """SHA-256 over the sheet fingerprints of one manifest table entry (all of its workbooks)."""
+    digest = hashlib.sha256(entry.get("sheet", "").encode("utf-8"))
+    for source, fingerprints in sorted(entry.get("sources", {}).items()):
+        digest.update(f"\n{source}\t{fingerprints.get('fingerprint')}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def record_load(path: str, task_name: str, fingerprints: dict = None):
+    """
+    Record that `task_name` committed a load of staging tables with these
+    {table: table_fingerprint}; with no fingerprints, forget its record.
+    """
+    with _manifest_lock:
+        manifest = load_manifest(path)
+        if fingerprints:
+            manifest["loads"][task_name] = dict(fingerprints)
+        elif manifest["loads"].pop(task_name, None) is None:
+            return
+        save_manifest(path, manifest)
+
+
+def invalidate_manifest(path: str):
+    """Forget all fingerprints (e.g. after the staging tables were recreated)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def file_fingerprint(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RowsFingerprint:
+    """
+    SHA-256 over row tuples, fed one row at a time, so a sheet can be
+    fingerprinted while it streams into its staging table (see tap).
+    """
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self.rows = 0
+
+    def update(self, row):
+        self._digest.update(repr(row).encode("utf-8"))
+        self._digest.update(b"\n")
+        self.rows += 1
+
+    def tap(self, rows, numbered=False):
+        """Yield `rows` unchanged, hashing each (the row of each (number, row) pair with `numbered`)."""
+        for item in rows:
+            self.update(item[1] if numbered else item)
+            yield item
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def rows_fingerprint(rows) -> (str, int):
+    """
+    SHA-256 over an iterable of row tuples.
+
+    Returns:
+        (str, int): hex digest and number of rows hashed
+    """
+    fingerprint = RowsFingerprint()
+    for row in rows:
+        fingerprint.update(row)
+    return fingerprint.hexdigest(), fingerprint.rows
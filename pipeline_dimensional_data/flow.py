@@ -1,26 +1,54 @@
 """
 flow.py
-Coordinates the execution of all dimensional ETL tasks (strict sequence).
+Coordinates the execution of all dimensional ETL tasks as a dependency graph.
 
 Class:
     DimensionalDataFlow
 
 Responsibilities:
     - Generate execution_id (uuid)
-    - Run tasks sequentially
+    - Run tasks once their upstream dependencies succeed
+      (independent dimension loads run concurrently on a bounded pool)
+    - Skip only the tasks downstream of a failure
     - Handle start_date / end_date
-    - Log each step
+    - Log each step (tagged with the run's execution_id through
+      etl_logging.EXECUTION_ID) and report critical-path timing
+    - Record per-task metrics (wall time, rows affected, connect vs
+      execute time, peak Python memory) as JSON lines in METRICS_PATH
+    - Persist each task's completion and input fingerprint per
+      execution_id (run_state.py), so a failed run can be resumed at its
+      first incomplete task
 """
 
 import os
 import sys
+import json
+import time
+import threading
+import logging
+import contextvars
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
 from utils import get_uuid
-from logging import getLogger
-import logging
+from etl_logging import EXECUTION_ID, LOGGER_NAME, get_pipeline_logger
+
+from pipeline_dimensional_data.config import (
+    FLOW_MAX_WORKERS,
+    FACT_BACKFILL_PARTITION,
+    FACT_BACKFILL_MAX_WORKERS,
+    METRICS_PATH,
+    METRICS_TRACE_MEMORY,
+    RUN_STATE_DIR,
+    RUN_STATE_KEEP,
+    SCHEMA_VERSION,
+)
+from pipeline_dimensional_data.backends import get_backend, set_backend
+from pipeline_dimensional_data.fingerprints import file_fingerprint, load_manifest, record_load
+from pipeline_dimensional_data.run_state import RunState, input_fingerprint, prune_run_states
 
 from pipeline_dimensional_data.tasks import (
     task_initialize_dimensional_db,
@@ -33,42 +61,87 @@ from pipeline_dimensional_data.tasks import (
     task_update_dim_shippers,
     task_update_dim_suppliers,
     task_update_dim_territories,
-    task_update_factorders
-    # task_update_fact_error
+    task_update_factorders,
+    task_backfill_factorders,
+    task_update_aggregates,
+    merge_date_ranges,
+    staging_manifest_path,
+    staging_source_files
 )
 
 
-logger = logging.getLogger("dimensional_data_flow")
-logger.setLevel(logging.INFO)
+# handlers are attached by get_pipeline_logger() when the first flow is created
+logger = logging.getLogger(LOGGER_NAME)
 
-log_file_path = os.path.join(
-    PROJECT_ROOT, "logs", "logs_dimensional_data_pipeline.txt"
-)
+_metrics_lock = threading.Lock()
 
-file_handler = logging.FileHandler(log_file_path)
-formatter = logging.Formatter(
-    "%(asctime)s | execution_id=%(execution_id)s | %(levelname)s | %(message)s"
-)
-file_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
+def write_metrics_record(record: dict, path: str = METRICS_PATH):
+    """Append one metrics record as a JSON line."""
+    line = json.dumps(record, default=str)
+    with _metrics_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
 
 
-class DimensionalDataFlow:
+def _metric(value, unit: str = "") -> str:
+    """Format one metric for the log line; a metric the task did not report is "-"."""
+    return "-" if value is None else f"{value}{unit}"
+
+
+class _MemoryPeaks:
+    """
+    Peak traced Python memory per running task.
+
+    tracemalloc only keeps one process-wide peak, so whenever a task starts
+    or stops the current peak is folded into every running task and reset.
+    With concurrent tasks the figure is the process peak seen during the
+    task's lifetime, not memory owned by the task alone.
+    """
+
     def __init__(self):
-        self.execution_id = get_uuid()
-        for handler in logger.handlers:
-            handler.addFilter(self._ContextFilter(self.execution_id))
-        logger.info("Pipeline initialized")
+        self._lock = threading.Lock()
+        self._peaks = {}
+
+    def _fold(self):
+        _, peak = tracemalloc.get_traced_memory()
+        for name in self._peaks:
+            self._peaks[name] = max(self._peaks[name], peak)
+        tracemalloc.reset_peak()
 
-    class _ContextFilter(logging.Filter):
-        def __init__(self, execution_id):
-            super().__init__()
-            self.execution_id = execution_id
+    def start(self, name):
+        if not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            self._fold()
+            self._peaks[name] = tracemalloc.get_traced_memory()[0]
 
-        def filter(self, record):
-            record.execution_id = self.execution_id
-            return True
+    def stop(self, name):
+        """Return the peak in MB, or None if memory is not traced."""
+        with self._lock:
+            if name not in self._peaks:
+                return None
+            if tracemalloc.is_tracing():
+                self._fold()
+            return round(self._peaks.pop(name) / (1024 * 1024), 3)
+
+
+class DimensionalDataFlow:
+    def __init__(self, source_path=None, execution_id=None):
+        """
+        Args:
+            source_path (str): workbook, directory or glob of workbooks to stage
+                               instead of tasks.SOURCE_PATH
+            execution_id (str): id of an earlier run to resume (see resume());
+                                a new id is generated by default
+        """
+        self.execution_id = execution_id or get_uuid()
+        self.source_path = source_path
+        self._memory = _MemoryPeaks()
+        self._run_state = None
+        self._fingerprints = {}
+        get_pipeline_logger()
+        logger.info("Pipeline initialized", extra={"execution_id": self.execution_id})
 
     def _run_task(self, task_fn, prereq=None, **kwargs):
         if prereq and not prereq.get("success", False):
@@ -97,40 +170,438 @@ class DimensionalDataFlow:
 
         return result
 
-    def exec(self, start_date, end_date):
-        logger.info(f"Pipeline execution started | start_date={start_date} end_date={end_date}")
+    def _build_task_graph(self, start_date, end_date, backfill=None):
+        """
+        Return the pipeline as
+        {task_name: (task_fn, [upstream task names], kwargs, [source staging tables])}.
+
+        Every dimension depends only on staging; the fact load depends on
+        all dimensions, and the dashboard aggregates on the fact load. A
+        task with source staging tables is skipped when staging reports all
+        of them unchanged and the task last committed a load of those same
+        table fingerprints (see _run_graph). With `backfill` (kwargs of
+        task_backfill_factorders) the fact load is a partitioned backfill
+        instead of one start_date / end_date window.
+        """
+        dim_tasks = [
+            (task_update_dim_categories, "staging_Categories"),
+            (task_update_dim_customers, "staging_Customers"),
+            (task_update_dim_employees, "staging_Employees"),
+            (task_update_dim_products, "staging_Products"),
+            (task_update_dim_region, "staging_Region"),
+            (task_update_dim_shippers, "staging_Shippers"),
+            (task_update_dim_suppliers, "staging_Suppliers"),
+            (task_update_dim_territories, "staging_Territories"),
+        ]
+
+        graph = {
+            "task_initialize_dimensional_db": (task_initialize_dimensional_db, [], {}, None),
+            "task_populate_staging": (
+                task_populate_staging,
+                ["task_initialize_dimensional_db"],
+                {"source_path": self.source_path} if self.source_path else {},
+                None,
+            ),
+        }
+        for task_fn, staging_table in dim_tasks:
+            graph[task_fn.__name__] = (task_fn, ["task_populate_staging"], {}, [staging_table])
+
+        if backfill:
+            graph["task_backfill_factorders"] = (
+                task_backfill_factorders,
+                [task_fn.__name__ for task_fn, _ in dim_tasks],
+                backfill,
+                None,
+            )
+            fact_task, window = "task_backfill_factorders", {"ranges": backfill["ranges"]}
+        else:
+            graph["task_update_factorders"] = (
+                task_update_factorders,
+                [task_fn.__name__ for task_fn, _ in dim_tasks],
+                {"start_date": start_date, "end_date": end_date},
+                None,
+            )
+            fact_task, window = "task_update_factorders", {"start_date": start_date, "end_date": end_date}
+
+        # refreshed for the OrderDate ranges the fact load just reloaded
+        graph["task_update_aggregates"] = (task_update_aggregates, [fact_task], window, None)
+
+        # rejected rows are routed to FactOrders_Error by the fact load itself
+        # (task_update_fact_error is only for standalone re-checks)
+
+        return graph
+
+    def _input_fingerprints(self, graph):
+        """
+        Return {task_name: input fingerprint}. A task's fingerprint covers
+        its kwargs, the backend and schema version, and its upstream tasks'
+        fingerprints; the staging load also covers its source workbooks.
+        """
+        fingerprints = {}
+        backend_name = get_backend().name
+
+        def _visit(name):
+            if name not in fingerprints:
+                _, deps, kwargs, _ = graph[name]
+                inputs = {
+                    "task": name,
+                    "kwargs": kwargs,
+                    "backend": backend_name,
+                    "schema_version": SCHEMA_VERSION,
+                    "upstream": [_visit(dep) for dep in sorted(deps)],
+                }
+                if name == "task_populate_staging":
+                    inputs["sources"] = {
+                        path: file_fingerprint(path) if os.path.exists(path) else None
+                        for path in staging_source_files(self.source_path)
+                    }
+                fingerprints[name] = input_fingerprint(inputs)
+            return fingerprints[name]
+
+        for name in graph:
+            _visit(name)
+        return fingerprints
+
+    def _run_graph(self, graph, max_workers=FLOW_MAX_WORKERS, completed=()):
+        """
+        Execute a task graph on a bounded thread pool.
+
+        A task starts as soon as all of its upstream tasks succeeded.
+        If any upstream task failed or was skipped, the task is skipped
+        without running; unrelated branches continue. A task whose source
+        staging tables were all reported unchanged upstream is skipped as
+        successful if the staging manifest records that it committed a load
+        of exactly those table fingerprints; the record is written when
+        such a task succeeds and dropped when it fails. A task in
+        `completed` (finished by the run being resumed) is skipped as
+        successful too.
+
+        Returns:
+            (dict, dict): results per task, durations (seconds) per task
+        """
+        results = {}
+        durations = {}
+        running = {}
+        remaining = dict(graph)
+
+        def _timed(name, task_fn, prereq, kwargs):
+            self._memory.start(name)
+            started = time.perf_counter()
+            try:
+                result = self._run_task(task_fn, prereq=prereq, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                peak_mb = self._memory.stop(name)
+            self._attach_metrics(name, result, seconds, peak_mb)
+            return result, seconds
+
+        def _unchanged_sources(deps):
+            unchanged = set()
+            for dep in deps:
+                for table_name, stats in results[dep].get("tables", {}).items():
+                    if stats.get("unchanged"):
+                        unchanged.add(table_name)
+            return unchanged
+
+        def _source_fingerprints(deps, sources):
+            """{table: fingerprint} of the task's staging tables, None unless staging reported all of them."""
+            fingerprints = {}
+            for dep in deps:
+                for table_name, stats in results[dep].get("tables", {}).items():
+                    if table_name in sources and stats.get("fingerprint"):
+                        fingerprints[table_name] = stats["fingerprint"]
+            return fingerprints if set(fingerprints) == set(sources) else None
 
-        t_init = self._run_task(task_initialize_dimensional_db)
+        def _loaded_unchanged(name, deps, sources):
+            if not set(sources) <= _unchanged_sources(deps):
+                return False
+            fingerprints = _source_fingerprints(deps, sources)
+            recorded = load_manifest(staging_manifest_path())["loads"].get(name)
+            return fingerprints is not None and recorded == fingerprints
 
-        t0 = self._run_task(task_populate_staging, prereq=t_init)
+        def _record_load(name, result):
+            _, deps, _, sources = graph[name]
+            if not sources or result.get("skipped"):
+                return
+            fingerprints = _source_fingerprints(deps, sources) if result.get("success") else None
+            try:
+                record_load(staging_manifest_path(), name, fingerprints)
+            except OSError as e:
+                logger.error(f"Could not record the load of {name} in the staging manifest: {e}")
 
-        t2 = self._run_task(task_update_dim_categories, prereq=t0)
-        t3 = self._run_task(task_update_dim_customers, prereq=t2)
-        t4 = self._run_task(task_update_dim_employees, prereq=t3)
-        t5 = self._run_task(task_update_dim_products, prereq=t4)
-        t6 = self._run_task(task_update_dim_region, prereq=t5)
-        t7 = self._run_task(task_update_dim_shippers, prereq=t6)
-        t8 = self._run_task(task_update_dim_suppliers, prereq=t7)
-        t9 = self._run_task(task_update_dim_territories, prereq=t8)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while remaining or running:
+                # schedule every task whose upstream tasks are resolved
+                for name, (task_fn, deps, kwargs, sources) in list(remaining.items()):
+                    if not all(dep in results for dep in deps):
+                        continue
+                    del remaining[name]
 
-        t_fact = self._run_task(
-            task_update_factorders,
-            prereq=t9,
-            start_date=start_date,
-            end_date=end_date,
+                    failed = [dep for dep in deps if not results[dep].get("success", False)]
+                    if failed:
+                        msg = f"Task skipped due to failed prerequisite: {name} (upstream: {', '.join(failed)})"
+                        logger.error(msg)
+                        results[name] = {"success": False, "skipped": True, "message": msg}
+                        durations[name] = 0.0
+                        self._attach_metrics(name, results[name], 0.0, None)
+                        continue
+
+                    if name in completed:
+                        msg = f"Task skipped, completed before resume: {name}"
+                        logger.info(msg)
+                        results[name] = {"success": True, "skipped": True, "resumed": True, "message": msg}
+                        durations[name] = 0.0
+                        self._attach_metrics(name, results[name], 0.0, None)
+                        continue
+
+                    if sources and _loaded_unchanged(name, deps, sources):
+                        msg = f"Task skipped, source unchanged: {name} ({', '.join(sources)})"
+                        logger.info(msg)
+                        results[name] = {"success": True, "skipped": True, "unchanged": True, "message": msg}
+                        durations[name] = 0.0
+                        self._attach_metrics(name, results[name], 0.0, None)
+                        continue
+
+                    prereq = {"success": True} if deps else None
+                    # run in a copy of this context, so the task logs this run's execution_id
+                    context = contextvars.copy_context()
+                    running[pool.submit(context.run, _timed, name, task_fn, prereq, kwargs)] = name
+
+                if not running:
+                    if remaining:
+                        # only happens if the graph has unknown dependencies or a cycle
+                        for name in remaining:
+                            results[name] = {"success": False, "message": "Unresolvable task dependencies"}
+                            durations[name] = 0.0
+                        remaining.clear()
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name], durations[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Task failed: {name} | {e}")
+                        results[name] = {"success": False, "message": str(e)}
+                        durations[name] = 0.0
+                        self._attach_metrics(name, results[name], 0.0, None)
+                    _record_load(name, results[name])
+
+        return results, durations
+
+    def _attach_metrics(self, name, result, seconds, peak_mb):
+        """
+        Complete the task's own metrics (rows affected, connect / execute /
+        commit time) with wall time and peak memory, store them under
+        result["metrics"] and append them to the metrics log. The task's
+        outcome is also recorded in the run state.
+        """
+        metrics = dict(result.get("metrics") or {})
+        metrics.setdefault("rows_affected", None)
+        metrics.setdefault("connect_seconds", None)
+        metrics.setdefault("execute_seconds", None)
+        metrics.setdefault("commit_seconds", None)
+        metrics["wall_seconds"] = round(seconds, 4)
+        metrics["peak_python_memory_mb"] = peak_mb
+        result["metrics"] = metrics
+
+        record = {
+            "execution_id": self.execution_id,
+            "task": name,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "success": result.get("success", False),
+            "skipped": result.get("skipped", False),
+            **metrics,
+        }
+        try:
+            write_metrics_record(record)
+        except OSError as e:
+            logger.error(f"Could not write metrics for {name}: {e}")
+
+        if self._run_state is not None:
+            try:
+                self._run_state.record(name, result, self._fingerprints.get(name))
+            except OSError as e:
+                logger.error(f"Could not record run state for {name}: {e}")
+
+        logger.info(
+            f"Metrics | {name} | wall={_metric(metrics['wall_seconds'], 's')} "
+            f"rows={_metric(metrics['rows_affected'])} "
+            f"connect={_metric(metrics['connect_seconds'], 's')} "
+            f"execute={_metric(metrics['execute_seconds'], 's')} "
+            f"commit={_metric(metrics['commit_seconds'], 's')} "
+            f"peak_mem={_metric(peak_mb, 'MB')}"
+        )
+
+    @staticmethod
+    def _critical_path(graph, durations):
+        """Return (seconds, [task names]) of the longest dependency chain."""
+        finish = {}
+        path = {}
+
+        def _visit(name):
+            if name not in finish:
+                deps = graph[name][1]
+                longest = max(deps, key=_visit, default=None)
+                finish[name] = durations.get(name, 0.0) + (finish[longest] if longest else 0.0)
+                path[name] = (path[longest] if longest else []) + [name]
+            return finish[name]
+
+        end = max(graph, key=_visit)
+        return finish[end], path[end]
+
+    def resume(self, max_workers=FLOW_MAX_WORKERS, backend=None):
+        """
+        Resume the recorded run of self.execution_id with its original
+        dates, workbook and backend (switched to with set_backend and the
+        recorded backend options when the process uses another one).
+        Tasks that completed on unchanged inputs are skipped; the run
+        restarts at the first incomplete task.
+
+        Args:
+            backend (str): backend the caller asked for (e.g. --backend);
+                           must match the recorded one
+
+        Raises:
+            ValueError: no run state is recorded for the execution_id, or
+                        the run was recorded on another backend or database
+        """
+        run_state = RunState.load(RUN_STATE_DIR, self.execution_id)
+        if run_state is None:
+            raise ValueError(f"No run state recorded for execution_id {self.execution_id} in {RUN_STATE_DIR}")
+
+        recorded_backend = run_state.state.get("backend")
+        if recorded_backend:
+            if backend and backend != recorded_backend:
+                raise ValueError(f"Run {self.execution_id} ran on the {recorded_backend} backend, "
+                                 f"not {backend}")
+            options = run_state.state.get("backend_options") or {}
+            if get_backend().name != recorded_backend or (options and get_backend().options != options):
+                set_backend(recorded_backend, **options)
+        # its completed tasks only hold for the database they ran against
+        recorded_database = run_state.state.get("database")
+        if recorded_database and recorded_database != get_backend().identity:
+            raise ValueError(f"Run {self.execution_id} ran against {recorded_database}, "
+                             f"not {get_backend().identity}")
+
+        self.source_path = run_state.source_path
+        return self.exec(run_state.start_date, run_state.end_date, max_workers=max_workers,
+                         run_state=run_state, backfill=run_state.state.get("backfill"))
+
+    def backfill(self, ranges, partition=FACT_BACKFILL_PARTITION,
+                 partition_workers=FACT_BACKFILL_MAX_WORKERS, max_workers=FLOW_MAX_WORKERS):
+        """
+        Run the pipeline with the fact load split into month / quarter
+        partitions over one or more date ranges (task_backfill_factorders).
+
+        Args:
+            ranges (list): [(start_date, end_date)], YYYY-MM-DD, inclusive
+            partition (str): "month" or "quarter"
+            partition_workers (int): partitions loading concurrently
+        """
+        merged = [(start.isoformat(), end.isoformat()) for start, end in merge_date_ranges(ranges)]
+        if not merged:
+            raise ValueError("No backfill range given")
+        backfill = {"ranges": merged, "partition": partition, "max_workers": partition_workers}
+        return self.exec(merged[0][0], merged[-1][1], max_workers=max_workers, backfill=backfill)
+
+    def exec(self, start_date, end_date, max_workers=FLOW_MAX_WORKERS, run_state=None, backfill=None):
+        """
+        Run the pipeline for the start_date / end_date fact window.
+
+        Args:
+            run_state (RunState): recorded state of the run being resumed
+                                  (use resume()); None starts a new run
+            backfill (dict): task_backfill_factorders kwargs (use backfill())
+        """
+        # every record logged during the run (task threads included) carries its execution_id
+        token = EXECUTION_ID.set(self.execution_id)
+        try:
+            return self._exec(start_date, end_date, max_workers, run_state, backfill)
+        finally:
+            EXECUTION_ID.reset(token)
+
+    def _exec(self, start_date, end_date, max_workers, run_state, backfill):
+        logger.info(f"Pipeline execution started | start_date={start_date} end_date={end_date}"
+                    + (f" | backfill={backfill}" if backfill else ""))
+
+        graph = self._build_task_graph(start_date, end_date, backfill=backfill)
+
+        completed = []
+        try:
+            self._fingerprints = self._input_fingerprints(graph)
+            if run_state is None:
+                prune_run_states(RUN_STATE_DIR, RUN_STATE_KEEP)
+                run_state = RunState(RUN_STATE_DIR, self.execution_id)
+            else:
+                completed = [name for name in graph if run_state.completed(name, self._fingerprints[name])]
+                logger.info(f"Resuming run | completed tasks skipped: {', '.join(completed) or 'none'}")
+            run_state.start(start_date=start_date, end_date=end_date, source_path=self.source_path,
+                            backend=get_backend().name, backend_options=get_backend().options,
+                            database=get_backend().identity, backfill=backfill)
+            self._run_state = run_state
+        except OSError as e:
+            # resume support is best effort; the run itself does not depend on it
+            logger.error(f"Run state unavailable, the run cannot be resumed: {e}")
+            self._run_state = None
+
+        started_tracing = METRICS_TRACE_MEMORY and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        started = time.perf_counter()
+        try:
+            results, durations = self._run_graph(graph, max_workers=max_workers, completed=completed)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+        wall_seconds = time.perf_counter() - started
+
+        critical_seconds, critical_path = self._critical_path(graph, durations)
+        serial_seconds = sum(durations.values())
+        timings = {
+            "wall_seconds": round(wall_seconds, 3),
+            "serial_seconds": round(serial_seconds, 3),
+            "critical_path_seconds": round(critical_seconds, 3),
+            "critical_path": critical_path,
+            "parallel_savings_seconds": round(serial_seconds - wall_seconds, 3),
+        }
+        logger.info(
+            f"Timing | wall={timings['wall_seconds']}s serial={timings['serial_seconds']}s "
+            f"critical_path={timings['critical_path_seconds']}s ({' -> '.join(critical_path)})"
         )
 
-        # t_error = self._run_task(
-        #     task_update_fact_error,
-        #     prereq=t_fact,
-        #     start_date=start_date,
-        #     end_date=end_date,
-        # )
+        try:
+            pool_stats = get_backend().pool().stats()
+            logger.info(
+                f"Connection pool | created={pool_stats['created']} reused={pool_stats['reused']} "
+                f"discarded={pool_stats['discarded']}"
+            )
+        except Exception as e:
+            pool_stats = None
+            logger.error(f"Connection pool unavailable: {e}")
 
-        final_success = t_fact.get("success", False)
+        final_success = all(result.get("success", False) for result in results.values())
         if final_success:
             logger.info("Pipeline completed successfully.")
         else:
             logger.error("Pipeline failed before completion.")
 
-        return {"success": final_success, "execution_id": self.execution_id}
\ No newline at end of file
+        if self._run_state is not None:
+            try:
+                self._run_state.finish(final_success)
+            except OSError as e:
+                logger.error(f"Could not record run state: {e}")
+
+        return {
+            "success": final_success,
+            "execution_id": self.execution_id,
+            "resumed_tasks": completed,
+            "tasks": results,
+            "timings": timings,
+            "connection_pool": pool_stats,
+            "metrics": {
+                self.execution_id: {name: result.get("metrics") for name, result in results.items()}
+            },
+        }
@@ -0,0 +1,176 @@
+/* ===========================================================
+   fact_assembly_apply.sql
+   Moves rows assembled in Python (#fact_assembled, keys already
+   resolved, ErrorCode set) into the fact and error tables in one
+   transaction: same SOR, window and routing rules as update_fact.sql.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+-- @fact_table_name
+-- @fact_error_table_name
+-- @full_refresh          (1 = truncate both tables, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also the orders with a NULL OrderDay, in a window)
+---------------------------------------------------------------
+
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entries exist
+---------------------------------------------------------------
+INSERT INTO @database_name.@schema_name.Dim_SOR (SOR_Name)
+SELECT sor.SOR_Name
+FROM (VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')) AS sor (SOR_Name)
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM @database_name.@schema_name.Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
+);
+
+
+---------------------------------------------------------------
+-- 2. Load SOR_SK and the date window
+---------------------------------------------------------------
+DECLARE @SOR_SK INT;
+DECLARE @ERROR_SOR_SK INT;
+DECLARE @window_start DATE = CAST(@start_date AS DATE);
+DECLARE @window_end   DATE = CAST(@end_date AS DATE);
+DECLARE @with_undated BIT  = @undated;
+
+SELECT @SOR_SK = SOR_SK
+FROM @database_name.@schema_name.Dim_SOR
+WHERE SOR_Name = 'FACT_ORDERS_SNAPSHOT';
+
+SELECT @ERROR_SOR_SK = SOR_SK
+FROM @database_name.@schema_name.Dim_SOR
+WHERE SOR_Name = 'FACT_ORDERS_ERROR';
+
+
+---------------------------------------------------------------
+-- 3. Clear the window (or everything on a full refresh)
+---------------------------------------------------------------
+IF @full_refresh = 1
+BEGIN
+    TRUNCATE TABLE @database_name.@schema_name.@fact_table_name;
+    TRUNCATE TABLE @database_name.@schema_name.@fact_error_table_name;
+END
+ELSE
+BEGIN
+    DELETE FROM @database_name.@schema_name.@fact_table_name
+    WHERE OrderDay BETWEEN @window_start AND @window_end
+       OR (@with_undated = 1 AND OrderDay IS NULL);
+
+    DELETE FROM @database_name.@schema_name.@fact_error_table_name
+    WHERE OrderDay BETWEEN @window_start AND @window_end
+       OR (@with_undated = 1 AND OrderDay IS NULL);
+END;
+
+
+---------------------------------------------------------------
+-- 4. Valid rows -> fact table
+---------------------------------------------------------------
+INSERT INTO @database_name.@schema_name.@fact_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    @SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    GETDATE()
+FROM #fact_assembled
+WHERE ErrorCode IS NULL;
+
+
+---------------------------------------------------------------
+-- 5. Rejected rows -> error table
+---------------------------------------------------------------
+INSERT INTO @database_name.@schema_name.@fact_error_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    ErrorMessage,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    CASE ErrorCode
+        WHEN 'INVALID_ORDER_DATE' THEN 'Missing or invalid OrderDate'
+        WHEN 'MISSING_CUSTOMER' THEN 'Missing Customer_SK'
+        WHEN 'MISSING_EMPLOYEE' THEN 'Missing Employee_SK'
+        WHEN 'MISSING_PRODUCT' THEN 'Missing Product_SK'
+        WHEN 'MISSING_SHIPPER' THEN 'Missing Shipper_SK'
+        WHEN 'MISSING_TERRITORY' THEN 'Missing Territory_SK'
+        WHEN 'MISSING_REGION' THEN 'Missing Region_SK'
+    END,
+    @ERROR_SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    GETDATE()
+FROM #fact_assembled
+WHERE ErrorCode IS NOT NULL;
+
+
+---------------------------------------------------------------
+-- 6. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN ErrorCode IS NULL THEN 1 END) AS loaded_rows,
+    COUNT(ErrorCode)                              AS rejected_rows
+FROM #fact_assembled;
+
+DROP TABLE #fact_assembled;
@@ -0,0 +1,43 @@
+/* ===========================================================
+   fact_assembly_source.sql
+   Staged order lines read by the Python fact-assembly engine
+   (fact_assembly.py). @full_refresh = 1 ignores the window.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+-- @orders_staging_table
+-- @details_staging_table
+-- @full_refresh          (1 = all rows, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also the orders with a NULL OrderDay, in a window)
+---------------------------------------------------------------
+
+SELECT
+    o.OrderID   AS Order_NK,
+    d.ProductID AS Product_NK,
+    o.CustomerID,
+    o.EmployeeID,
+    o.ShipVia,
+    o.TerritoryID,
+    o.ShipRegion,
+    o.OrderDay,
+    o.OrderDate,
+    o.RequiredDate,
+    o.ShippedDate,
+    o.Freight,
+    d.UnitPrice,
+    d.Quantity,
+    d.Discount,
+    d.staging_raw_id_sk,
+    d.SourceFile
+FROM @database_name.@schema_name.@details_staging_table d
+JOIN @database_name.@schema_name.@orders_staging_table o
+      ON o.OrderID = d.OrderID
+WHERE @full_refresh = 1
+   OR o.OrderDay BETWEEN CAST(@start_date AS DATE) AND CAST(@end_date AS DATE)
+   OR (@undated = 1 AND o.OrderDay IS NULL)
+OPTION (RECOMPILE);  -- plan for the actual @full_refresh: an OrderDay seek for a window
@@ -0,0 +1,29 @@
+/* ===========================================================
+   fact_assembly_stage.sql
+   Session work table for rows assembled in Python.
+   Created (and committed) before the bulk insert so a driver
+   fallback rollback never undoes it.
+   =========================================================== */
+
+DROP TABLE IF EXISTS #fact_assembled;
+
+CREATE TABLE #fact_assembled (
+    Order_NK          INT,
+    Product_NK        INT,
+    Customer_SK       INT,
+    Employee_SK       INT,
+    Product_SK        INT,
+    Shipper_SK        INT,
+    Territory_SK      INT,
+    Region_SK         INT,
+    OrderDate         NVARCHAR(50),
+    RequiredDate      NVARCHAR(50),
+    ShippedDate       NVARCHAR(50),
+    Freight           FLOAT,
+    UnitPrice         FLOAT,
+    Quantity          INT,
+    Discount          FLOAT,
+    staging_raw_id_sk INT,
+    SourceFile        NVARCHAR(260),
+    ErrorCode         NVARCHAR(50)
+);
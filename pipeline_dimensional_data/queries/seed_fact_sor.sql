@@ -0,0 +1,22 @@
+/* ===========================================================
+   seed_fact_sor.sql
+   Ensures the fact SOR entries exist before a backfill starts,
+   so its concurrent partitions only read Dim_SOR (each window
+   load's own seed then finds both rows) instead of racing to
+   insert them on UX_Dim_SOR_Name.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+---------------------------------------------------------------
+
+INSERT INTO @database_name.@schema_name.Dim_SOR (SOR_Name)
+SELECT sor.SOR_Name
+FROM (VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')) AS sor (SOR_Name)
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM @database_name.@schema_name.Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
+);
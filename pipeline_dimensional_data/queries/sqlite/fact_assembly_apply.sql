@@ -0,0 +1,172 @@
+/* ===========================================================
+   fact_assembly_apply.sql (SQLite port)
+   Moves rows assembled in Python (temp.fact_assembled, keys
+   already resolved, ErrorCode set) into the fact and error tables
+   in one transaction: same SOR, window and routing rules as
+   update_fact.sql.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @fact_table_name
+-- @fact_error_table_name
+-- @full_refresh          (1 = empty both tables, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also the orders with a NULL OrderDay, in a window)
+---------------------------------------------------------------
+
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entries exist
+---------------------------------------------------------------
+WITH sor (SOR_Name) AS (
+    VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')
+)
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT sor.SOR_Name
+FROM sor
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
+);
+
+
+---------------------------------------------------------------
+-- 2. Load SOR_SK and the date window
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = 'FACT_ORDERS_SNAPSHOT') AS SOR_SK,
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = 'FACT_ORDERS_ERROR')    AS ERROR_SOR_SK,
+    datetime('now', 'localtime')                                         AS load_time,
+    @full_refresh                                                        AS full_refresh,
+    date(@start_date)                                                    AS window_start,
+    date(@end_date)                                                      AS window_end,
+    @undated                                                             AS undated;
+
+
+---------------------------------------------------------------
+-- 3. Clear the window (or everything on a full refresh)
+---------------------------------------------------------------
+DELETE FROM @fact_table_name
+WHERE (SELECT full_refresh FROM load_ctx) = 1
+   OR OrderDay BETWEEN (SELECT window_start FROM load_ctx)
+                          AND (SELECT window_end FROM load_ctx)
+   OR ((SELECT undated FROM load_ctx) = 1 AND OrderDay IS NULL);
+
+DELETE FROM @fact_error_table_name
+WHERE (SELECT full_refresh FROM load_ctx) = 1
+   OR OrderDay BETWEEN (SELECT window_start FROM load_ctx)
+                          AND (SELECT window_end FROM load_ctx)
+   OR ((SELECT undated FROM load_ctx) = 1 AND OrderDay IS NULL);
+
+
+---------------------------------------------------------------
+-- 4. Valid rows -> fact table
+---------------------------------------------------------------
+INSERT INTO @fact_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    F.Order_NK,
+    F.Product_NK,
+    F.Customer_SK,
+    F.Employee_SK,
+    F.Product_SK,
+    F.Shipper_SK,
+    F.Territory_SK,
+    F.Region_SK,
+    F.OrderDate,
+    F.RequiredDate,
+    F.ShippedDate,
+    F.Freight,
+    F.UnitPrice,
+    F.Quantity,
+    F.Discount,
+    X.SOR_SK,
+    F.staging_raw_id_sk,
+    F.SourceFile,
+    X.load_time
+FROM fact_assembled F, load_ctx X
+WHERE F.ErrorCode IS NULL;
+
+
+---------------------------------------------------------------
+-- 5. Rejected rows -> error table
+---------------------------------------------------------------
+INSERT INTO @fact_error_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    ErrorMessage,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    F.Order_NK,
+    F.Product_NK,
+    F.Customer_SK,
+    F.Employee_SK,
+    F.Product_SK,
+    F.Shipper_SK,
+    F.Territory_SK,
+    F.Region_SK,
+    F.OrderDate,
+    F.ErrorCode,
+    CASE F.ErrorCode
+        WHEN 'INVALID_ORDER_DATE' THEN 'Missing or invalid OrderDate'
+        WHEN 'MISSING_CUSTOMER' THEN 'Missing Customer_SK'
+        WHEN 'MISSING_EMPLOYEE' THEN 'Missing Employee_SK'
+        WHEN 'MISSING_PRODUCT' THEN 'Missing Product_SK'
+        WHEN 'MISSING_SHIPPER' THEN 'Missing Shipper_SK'
+        WHEN 'MISSING_TERRITORY' THEN 'Missing Territory_SK'
+        WHEN 'MISSING_REGION' THEN 'Missing Region_SK'
+    END,
+    X.ERROR_SOR_SK,
+    F.staging_raw_id_sk,
+    F.SourceFile,
+    X.load_time
+FROM fact_assembled F, load_ctx X
+WHERE F.ErrorCode IS NOT NULL;
+
+
+---------------------------------------------------------------
+-- 6. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN ErrorCode IS NULL THEN 1 END) AS loaded_rows,
+    COUNT(ErrorCode)                              AS rejected_rows
+FROM fact_assembled;
+
+DROP TABLE temp.fact_assembled;
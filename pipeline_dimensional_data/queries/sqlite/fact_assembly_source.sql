@@ -0,0 +1,40 @@
+/* ===========================================================
+   fact_assembly_source.sql (SQLite port)
+   Staged order lines read by the Python fact-assembly engine
+   (fact_assembly.py). @full_refresh = 1 ignores the window.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @orders_staging_table
+-- @details_staging_table
+-- @full_refresh          (1 = all rows, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also the orders with a NULL OrderDay, in a window)
+---------------------------------------------------------------
+
+SELECT
+    o.OrderID   AS Order_NK,
+    d.ProductID AS Product_NK,
+    o.CustomerID,
+    o.EmployeeID,
+    o.ShipVia,
+    o.TerritoryID,
+    o.ShipRegion,
+    o.OrderDay,
+    o.OrderDate,
+    o.RequiredDate,
+    o.ShippedDate,
+    o.Freight,
+    d.UnitPrice,
+    d.Quantity,
+    d.Discount,
+    d.staging_raw_id_sk,
+    d.SourceFile
+FROM @details_staging_table d
+JOIN @orders_staging_table o
+      ON o.OrderID = d.OrderID
+WHERE @full_refresh = 1
+   OR o.OrderDay BETWEEN date(@start_date) AND date(@end_date)
+   OR (@undated = 1 AND o.OrderDay IS NULL);
@@ -0,0 +1,28 @@
+/* ===========================================================
+   fact_assembly_stage.sql (SQLite port)
+   Connection-local work table (temp schema) for rows assembled
+   in Python; created before the bulk insert.
+   =========================================================== */
+
+DROP TABLE IF EXISTS temp.fact_assembled;
+
+CREATE TEMP TABLE fact_assembled (
+    Order_NK          INTEGER,
+    Product_NK        INTEGER,
+    Customer_SK       INTEGER,
+    Employee_SK       INTEGER,
+    Product_SK        INTEGER,
+    Shipper_SK        INTEGER,
+    Territory_SK      INTEGER,
+    Region_SK         INTEGER,
+    OrderDate         TEXT,
+    RequiredDate      TEXT,
+    ShippedDate       TEXT,
+    Freight           REAL,
+    UnitPrice         REAL,
+    Quantity          INTEGER,
+    Discount          REAL,
+    staging_raw_id_sk INTEGER,
+    SourceFile        TEXT,
+    ErrorCode         TEXT
+);
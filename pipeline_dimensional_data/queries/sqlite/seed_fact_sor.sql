@@ -0,0 +1,18 @@
+/* ===========================================================
+   seed_fact_sor.sql (SQLite port)
+   Ensures the fact SOR entries exist before a backfill starts,
+   so its partitions only read Dim_SOR (each window load's own
+   seed then finds both rows).
+   =========================================================== */
+
+WITH sor (SOR_Name) AS (
+    VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')
+)
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT sor.SOR_Name
+FROM sor
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
+);
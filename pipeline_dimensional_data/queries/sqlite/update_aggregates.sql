@@ -0,0 +1,158 @@
+/* ===========================================================
+   update_aggregates.sql (SQLite port)
+   Dashboard aggregates of FactOrders, refreshed for the OrderDate
+   window of the last fact load (or rebuilt on a full refresh):
+     - day x customer
+     - month x product
+     - month x employee x territory
+   Month-grain tables are recomputed for every month the window
+   touches, first to last day, so a partial month stays complete.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @fact_table_name
+-- @day_customer_table
+-- @product_month_table
+-- @employee_territory_month_table
+-- @full_refresh          (1 = rebuild, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+---------------------------------------------------------------
+
+
+---------------------------------------------------------------
+-- 1. Window, widened to whole months for the month grain
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    @full_refresh                                           AS rebuild,
+    date(@start_date)                                       AS window_start,
+    date(@end_date)                                         AS window_end,
+    date(@start_date, 'start of month')                     AS month_start,
+    date(@end_date, 'start of month', '+1 month', '-1 day') AS month_end,
+    datetime('now', 'localtime')                            AS load_time,
+    0                                                       AS day_customer_rows,
+    0                                                       AS product_month_rows,
+    0                                                       AS employee_territory_month_rows;
+
+
+---------------------------------------------------------------
+-- 2. Fact lines of the touched months (by the generated OrderDay)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.agg_lines;
+
+CREATE TEMP TABLE agg_lines AS
+SELECT
+    f.OrderDay                                                AS OrderDate,
+    date(f.OrderDay, 'start of month')                        AS MonthStart,
+    f.Order_NK,
+    f.Customer_SK,
+    f.Product_SK,
+    f.Employee_SK,
+    f.Territory_SK,
+    f.Quantity,
+    f.UnitPrice * f.Quantity                                  AS GrossAmount,
+    f.UnitPrice * f.Quantity * (1 - IFNULL(f.Discount, 0))    AS NetAmount
+FROM @fact_table_name f, load_ctx X
+WHERE f.OrderDay IS NOT NULL
+  AND (X.rebuild = 1 OR f.OrderDay BETWEEN X.month_start AND X.month_end);
+
+
+---------------------------------------------------------------
+-- 3. Day x customer (the window's days)
+---------------------------------------------------------------
+DELETE FROM @day_customer_table
+WHERE (SELECT rebuild FROM load_ctx) = 1
+   OR OrderDate BETWEEN (SELECT window_start FROM load_ctx)
+                    AND (SELECT window_end FROM load_ctx);
+
+INSERT INTO @day_customer_table (
+    OrderDate, Customer_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    A.OrderDate,
+    A.Customer_SK,
+    COUNT(DISTINCT A.Order_NK),
+    COUNT(*),
+    SUM(A.Quantity),
+    SUM(A.GrossAmount),
+    SUM(A.NetAmount),
+    X.load_time
+FROM agg_lines A, load_ctx X
+WHERE A.Customer_SK IS NOT NULL
+  AND (X.rebuild = 1 OR A.OrderDate BETWEEN X.window_start AND X.window_end)
+GROUP BY A.OrderDate, A.Customer_SK;
+
+UPDATE load_ctx SET day_customer_rows = changes();
+
+
+---------------------------------------------------------------
+-- 4. Month x product (the window's months)
+---------------------------------------------------------------
+DELETE FROM @product_month_table
+WHERE (SELECT rebuild FROM load_ctx) = 1
+   OR MonthStart BETWEEN (SELECT month_start FROM load_ctx)
+                     AND (SELECT month_end FROM load_ctx);
+
+INSERT INTO @product_month_table (
+    MonthStart, Product_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    A.MonthStart,
+    A.Product_SK,
+    COUNT(DISTINCT A.Order_NK),
+    COUNT(*),
+    SUM(A.Quantity),
+    SUM(A.GrossAmount),
+    SUM(A.NetAmount),
+    X.load_time
+FROM agg_lines A, load_ctx X
+WHERE A.Product_SK IS NOT NULL
+GROUP BY A.MonthStart, A.Product_SK;
+
+UPDATE load_ctx SET product_month_rows = changes();
+
+
+---------------------------------------------------------------
+-- 5. Month x employee x territory (the window's months)
+---------------------------------------------------------------
+DELETE FROM @employee_territory_month_table
+WHERE (SELECT rebuild FROM load_ctx) = 1
+   OR MonthStart BETWEEN (SELECT month_start FROM load_ctx)
+                     AND (SELECT month_end FROM load_ctx);
+
+INSERT INTO @employee_territory_month_table (
+    MonthStart, Employee_SK, Territory_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    A.MonthStart,
+    A.Employee_SK,
+    A.Territory_SK,
+    COUNT(DISTINCT A.Order_NK),
+    COUNT(*),
+    SUM(A.Quantity),
+    SUM(A.GrossAmount),
+    SUM(A.NetAmount),
+    X.load_time
+FROM agg_lines A, load_ctx X
+WHERE A.Employee_SK IS NOT NULL
+  AND A.Territory_SK IS NOT NULL
+GROUP BY A.MonthStart, A.Employee_SK, A.Territory_SK;
+
+UPDATE load_ctx SET employee_territory_month_rows = changes();
+
+
+---------------------------------------------------------------
+-- 6. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    (SELECT COUNT(*) FROM agg_lines)          AS fact_lines,
+    X.day_customer_rows,
+    X.product_month_rows,
+    X.employee_territory_month_rows
+FROM load_ctx X;
+
+DROP TABLE temp.agg_lines;
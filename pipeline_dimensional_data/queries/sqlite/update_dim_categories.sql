@@ -0,0 +1,127 @@
+/* ===========================================================
+   update_dim_categories.sql (SQLite port)
+   SCD1 with Delete Handling — DimCategories
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows, then updated (UPDATE ... FROM) or inserted.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time,
+    0                                                                   AS deleted_rows;
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash, not deleted)
+--    are filtered out; existing_sk marks the rows to update
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH STAGED AS (
+    SELECT
+        CategoryID AS Category_NK,
+        CategoryName,
+        Description,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(IFNULL(CategoryName, '') || '|' || IFNULL(Description, '')) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Category_SK AS existing_sk
+FROM STAGED S
+LEFT JOIN @dim_table_name D
+       ON D.Category_NK = S.Category_NK
+WHERE D.Category_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash
+   OR D.IsDeleted = 1;
+
+-- Update changed or previously deleted rows
+UPDATE @dim_table_name
+SET    CategoryName      = C.CategoryName,
+       Description       = C.Description,
+       RowHash           = C.RowHash,
+       IsDeleted         = 0,
+       SOR_SK            = X.SOR_SK,
+       staging_raw_id_sk = C.staging_raw_id_sk,
+       SourceFile        = C.SourceFile,
+       LoadDate          = X.load_time
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Category_SK = C.existing_sk;
+
+-- Insert new rows
+INSERT INTO @dim_table_name (
+    Category_NK,
+    CategoryName,
+    Description,
+    RowHash,
+    IsDeleted,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Category_NK,
+    C.CategoryName,
+    C.Description,
+    C.RowHash,
+    0,
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X
+WHERE C.existing_sk IS NULL;
+
+---------------------------------------------------------------
+-- 4. Soft-delete rows missing in staging
+---------------------------------------------------------------
+UPDATE @dim_table_name
+SET    IsDeleted = 1,
+       LoadDate  = X.load_time,
+       SOR_SK    = X.SOR_SK
+FROM   load_ctx X
+WHERE  @dim_table_name.IsDeleted = 0
+  AND  NOT EXISTS (
+           SELECT 1
+           FROM @staging_table_name S
+           WHERE S.CategoryID = @dim_table_name.Category_NK
+       );
+
+UPDATE load_ctx SET deleted_rows = changes();
+
+---------------------------------------------------------------
+-- 5. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows,
+    (SELECT deleted_rows FROM load_ctx)              AS deleted_rows
+FROM changed_rows;
@@ -0,0 +1,138 @@
+/* ===========================================================
+   update_dim_customers.sql (SQLite port)
+   SCD2 (Historical) — DimCustomers
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows; their current versions are closed
+   (UPDATE ... FROM) and every changed row gets a new version.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time;
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash as the current
+--    version) are filtered out; existing_sk is the current
+--    version to close (NULL for a new Customer_NK)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH INCOMING AS (
+    SELECT
+        CustomerID AS Customer_NK,
+        CompanyName,
+        ContactName,
+        ContactTitle,
+        Address,
+        City,
+        Region,
+        PostalCode,
+        Country,
+        Phone,
+        Fax,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(
+            IFNULL(CompanyName, '') || '|' || IFNULL(ContactName, '') || '|' || IFNULL(ContactTitle, '') || '|' ||
+            IFNULL(Address, '') || '|' || IFNULL(City, '') || '|' || IFNULL(Region, '') || '|' ||
+            IFNULL(PostalCode, '') || '|' || IFNULL(Country, '') || '|' || IFNULL(Phone, '') || '|' || IFNULL(Fax, '')
+        ) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Customer_SK AS existing_sk
+FROM INCOMING S
+LEFT JOIN @dim_table_name D
+       ON D.Customer_NK = S.Customer_NK
+      AND D.IsCurrent = 1
+WHERE D.Customer_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash;
+
+-- 3A. Change detected → close the current version
+UPDATE @dim_table_name
+SET    ValidTo   = X.load_time,
+       IsCurrent = 0
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Customer_SK = C.existing_sk;
+
+---------------------------------------------------------------
+-- 4. New version for every changed row (new Customer_NKs and the
+--    rows closed above)
+---------------------------------------------------------------
+INSERT INTO @dim_table_name (
+    Customer_NK,
+    CompanyName,
+    ContactName,
+    ContactTitle,
+    Address,
+    City,
+    Region,
+    PostalCode,
+    Country,
+    Phone,
+    Fax,
+    RowHash,
+    ValidFrom,
+    ValidTo,
+    IsCurrent,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Customer_NK,
+    C.CompanyName,
+    C.ContactName,
+    C.ContactTitle,
+    C.Address,
+    C.City,
+    C.Region,
+    C.PostalCode,
+    C.Country,
+    C.Phone,
+    C.Fax,
+    C.RowHash,
+    X.load_time,        -- ValidFrom
+    '9999-12-31',       -- ValidTo open-ended
+    1,                  -- IsCurrent
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X;
+
+---------------------------------------------------------------
+-- 5. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows
+FROM changed_rows;
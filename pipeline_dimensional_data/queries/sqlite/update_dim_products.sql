@@ -0,0 +1,158 @@
+/* ===========================================================
+   update_dim_products.sql (SQLite port)
+   SCD2 (with Closing) — DimProducts
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows; their current versions are closed
+   (UPDATE ... FROM) and every changed row gets a new version.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time,
+    0                                                                   AS deleted_rows;
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash as the current
+--    version) are filtered out; existing_sk is the current
+--    version to close (NULL for a new Product_NK)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH INCOMING AS (
+    SELECT
+        ProductID AS Product_NK,
+        ProductName,
+        SupplierID AS Supplier_NK,
+        CategoryID AS Category_NK,
+        QuantityPerUnit,
+        UnitPrice,
+        UnitsInStock,
+        UnitsOnOrder,
+        ReorderLevel,
+        Discontinued,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(
+            IFNULL(ProductName, '') || '|' || IFNULL(SupplierID, '') || '|' || IFNULL(CategoryID, '') || '|' ||
+            IFNULL(QuantityPerUnit, '') || '|' || IFNULL(UnitPrice, '') || '|' || IFNULL(UnitsInStock, '') || '|' ||
+            IFNULL(UnitsOnOrder, '') || '|' || IFNULL(ReorderLevel, '') || '|' || IFNULL(Discontinued, '')
+        ) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Product_SK AS existing_sk
+FROM INCOMING S
+LEFT JOIN @dim_table_name D
+       ON D.Product_NK = S.Product_NK
+      AND D.IsCurrent = 1
+WHERE D.Product_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash;
+
+-- 3A. Change detected → close the current version
+UPDATE @dim_table_name
+SET    ValidTo   = X.load_time,
+       IsCurrent = 0
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Product_SK = C.existing_sk;
+
+---------------------------------------------------------------
+-- 4. New version for every changed row (new Product_NKs and the
+--    rows closed above)
+---------------------------------------------------------------
+INSERT INTO @dim_table_name (
+    Product_NK,
+    ProductName,
+    Supplier_NK,
+    Category_NK,
+    QuantityPerUnit,
+    UnitPrice,
+    UnitsInStock,
+    UnitsOnOrder,
+    ReorderLevel,
+    Discontinued,
+    RowHash,
+    ValidFrom,
+    ValidTo,
+    IsCurrent,
+    IsClosed,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Product_NK,
+    C.ProductName,
+    C.Supplier_NK,
+    C.Category_NK,
+    C.QuantityPerUnit,
+    C.UnitPrice,
+    C.UnitsInStock,
+    C.UnitsOnOrder,
+    C.ReorderLevel,
+    C.Discontinued,
+    C.RowHash,
+    X.load_time,        -- ValidFrom
+    '9999-12-31',       -- ValidTo open-ended
+    1,                  -- IsCurrent
+    0,                  -- IsClosed
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X;
+
+---------------------------------------------------------------
+-- 5. Delete Closing — Close products missing from staging
+---------------------------------------------------------------
+UPDATE @dim_table_name
+SET    ValidTo   = X.load_time,
+       IsCurrent = 0,
+       IsClosed  = 1,
+       SOR_SK    = X.SOR_SK,
+       LoadDate  = X.load_time
+FROM   load_ctx X
+WHERE  @dim_table_name.IsCurrent = 1
+  AND  NOT EXISTS (
+           SELECT 1
+           FROM @staging_table_name S
+           WHERE S.ProductID = @dim_table_name.Product_NK
+       );
+
+UPDATE load_ctx SET deleted_rows = changes();
+
+---------------------------------------------------------------
+-- 6. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows,
+    (SELECT deleted_rows FROM load_ctx)              AS deleted_rows
+FROM changed_rows;
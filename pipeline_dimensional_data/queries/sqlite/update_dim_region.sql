@@ -0,0 +1,110 @@
+/* ===========================================================
+   update_dim_region.sql (SQLite port)
+   SCD1 — DimRegion
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows, then updated (UPDATE ... FROM) or inserted.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time;
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash) are
+--    filtered out; existing_sk marks the rows to update
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH STAGED AS (
+    SELECT
+        RegionID AS Region_NK,
+        RegionDescription,
+        RegionCategory,
+        RegionImportance,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(
+            IFNULL(RegionDescription, '') || '|' || IFNULL(RegionCategory, '') || '|' || IFNULL(RegionImportance, '')
+        ) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Region_SK AS existing_sk
+FROM STAGED S
+LEFT JOIN @dim_table_name D
+       ON D.Region_NK = S.Region_NK
+WHERE D.Region_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash;
+
+-- Update changed rows
+UPDATE @dim_table_name
+SET    RegionDescription = C.RegionDescription,
+       RegionCategory    = C.RegionCategory,
+       RegionImportance  = C.RegionImportance,
+       RowHash           = C.RowHash,
+       SOR_SK            = X.SOR_SK,
+       staging_raw_id_sk = C.staging_raw_id_sk,
+       SourceFile        = C.SourceFile,
+       LoadDate          = X.load_time
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Region_SK = C.existing_sk;
+
+-- Insert new rows
+INSERT INTO @dim_table_name (
+    Region_NK,
+    RegionDescription,
+    RegionCategory,
+    RegionImportance,
+    RowHash,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Region_NK,
+    C.RegionDescription,
+    C.RegionCategory,
+    C.RegionImportance,
+    C.RowHash,
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X
+WHERE C.existing_sk IS NULL;
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows
+FROM changed_rows;
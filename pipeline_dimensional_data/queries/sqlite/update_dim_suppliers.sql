@@ -0,0 +1,144 @@
+/* ===========================================================
+   update_dim_suppliers.sql (SQLite port)
+   SCD4 (overwrite existing record) — DimSuppliers
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows, then updated (UPDATE ... FROM) or inserted.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time;
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash) are
+--    filtered out; existing_sk marks the rows to update
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH STAGED AS (
+    SELECT
+        SupplierID AS Supplier_NK,
+        CompanyName,
+        ContactName,
+        ContactTitle,
+        Address,
+        City,
+        Region,
+        PostalCode,
+        Country,
+        Phone,
+        Fax,
+        HomePage,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(
+            IFNULL(CompanyName, '') || '|' || IFNULL(ContactName, '') || '|' || IFNULL(ContactTitle, '') || '|' || IFNULL(Address, '') || '|' ||
+            IFNULL(City, '') || '|' || IFNULL(Region, '') || '|' || IFNULL(PostalCode, '') || '|' || IFNULL(Country, '') || '|' ||
+            IFNULL(Phone, '') || '|' || IFNULL(Fax, '') || '|' || IFNULL(HomePage, '')
+        ) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Supplier_SK AS existing_sk
+FROM STAGED S
+LEFT JOIN @dim_table_name D
+       ON D.Supplier_NK = S.Supplier_NK
+WHERE D.Supplier_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash;
+
+-- Update changed rows
+UPDATE @dim_table_name
+SET    CompanyName       = C.CompanyName,
+       ContactName       = C.ContactName,
+       ContactTitle      = C.ContactTitle,
+       Address           = C.Address,
+       City              = C.City,
+       Region            = C.Region,
+       PostalCode        = C.PostalCode,
+       Country           = C.Country,
+       Phone             = C.Phone,
+       Fax               = C.Fax,
+       HomePage          = C.HomePage,
+       RowHash           = C.RowHash,
+       SOR_SK            = X.SOR_SK,
+       staging_raw_id_sk = C.staging_raw_id_sk,
+       SourceFile        = C.SourceFile,
+       LoadDate          = X.load_time
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Supplier_SK = C.existing_sk;
+
+-- Insert new rows
+INSERT INTO @dim_table_name (
+    Supplier_NK,
+    CompanyName,
+    ContactName,
+    ContactTitle,
+    Address,
+    City,
+    Region,
+    PostalCode,
+    Country,
+    Phone,
+    Fax,
+    HomePage,
+    RowHash,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Supplier_NK,
+    C.CompanyName,
+    C.ContactName,
+    C.ContactTitle,
+    C.Address,
+    C.City,
+    C.Region,
+    C.PostalCode,
+    C.Country,
+    C.Phone,
+    C.Fax,
+    C.HomePage,
+    C.RowHash,
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X
+WHERE C.existing_sk IS NULL;
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows
+FROM changed_rows;
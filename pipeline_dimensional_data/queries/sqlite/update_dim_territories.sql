@@ -0,0 +1,124 @@
+/* ===========================================================
+   update_dim_territories.sql (SQLite port)
+   SCD3 — DimTerritories
+   Change detection via RowHash (row_hash = SHA-256 over tracked
+   attributes, registered by backends.SqliteBackend)
+   SQLite has no MERGE: changed rows are collected once into
+   temp.changed_rows, then updated (UPDATE ... FROM) or inserted.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS (from Python)
+-- @dim_table_name
+-- @staging_table_name
+---------------------------------------------------------------
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entry exists
+---------------------------------------------------------------
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT '@staging_table_name'
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR
+    WHERE SOR_Name = '@staging_table_name'
+);
+
+---------------------------------------------------------------
+-- 2. Fetch SOR_SK (load_ctx holds the script's variables)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = '@staging_table_name') AS SOR_SK,
+    (SELECT COUNT(*) FROM @staging_table_name)                          AS staged_rows,
+    datetime('now', 'localtime')                                        AS load_time;
+
+
+---------------------------------------------------------------
+-- 3. Changed rows — unchanged rows (same hash) are
+--    filtered out; existing_sk marks the rows to update
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.changed_rows;
+
+CREATE TEMP TABLE changed_rows AS
+WITH STAGED AS (
+    SELECT
+        TerritoryID AS Territory_NK,
+        TerritoryDescription,
+        TerritoryCode,
+        RegionID AS Region_NK,
+        staging_raw_id_sk,
+        SourceFile,
+        row_hash(
+            IFNULL(TerritoryDescription, '') || '|' || IFNULL(TerritoryCode, '') || '|' || IFNULL(RegionID, '')
+        ) AS RowHash
+    FROM @staging_table_name
+)
+SELECT S.*, D.Territory_SK AS existing_sk
+FROM STAGED S
+LEFT JOIN @dim_table_name D
+       ON D.Territory_NK = S.Territory_NK
+WHERE D.Territory_SK IS NULL
+   OR D.RowHash IS NOT S.RowHash;
+
+-- Update changed rows (SCD3)
+UPDATE @dim_table_name
+SET    -- Only shift prior value when description actually changed
+       TerritoryDescription_Prior =
+            CASE
+                WHEN IFNULL(TerritoryDescription_Current, '')
+                        <> IFNULL(C.TerritoryDescription, '')
+                THEN TerritoryDescription_Current
+                ELSE TerritoryDescription_Prior
+            END,
+
+       -- Always update current values
+       TerritoryDescription_Current = C.TerritoryDescription,
+       TerritoryCode                = C.TerritoryCode,
+       Region_NK                    = C.Region_NK,
+       RowHash                      = C.RowHash,
+
+       SOR_SK                       = X.SOR_SK,
+       staging_raw_id_sk            = C.staging_raw_id_sk,
+       SourceFile                   = C.SourceFile,
+       LoadDate                     = X.load_time
+FROM   changed_rows C, load_ctx X
+WHERE  @dim_table_name.Territory_SK = C.existing_sk;
+
+-- Insert new rows
+INSERT INTO @dim_table_name (
+    Territory_NK,
+    TerritoryDescription_Current,
+    TerritoryDescription_Prior,
+    TerritoryCode,
+    Region_NK,
+    RowHash,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    C.Territory_NK,
+    C.TerritoryDescription,
+    NULL,
+    C.TerritoryCode,
+    C.Region_NK,
+    C.RowHash,
+    X.SOR_SK,
+    C.staging_raw_id_sk,
+    C.SourceFile,
+    X.load_time
+FROM changed_rows C, load_ctx X
+WHERE C.existing_sk IS NULL;
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN existing_sk IS NULL THEN 1 END)  AS inserted_rows,
+    COUNT(existing_sk)                               AS updated_rows,
+    (SELECT staged_rows FROM load_ctx) - COUNT(*)    AS unchanged_rows
+FROM changed_rows;
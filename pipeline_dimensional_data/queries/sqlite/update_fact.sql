@@ -0,0 +1,303 @@
+/* ===========================================================
+   update_fact.sql (SQLite port)
+   SNAPSHOT FACT LOADER WITH DATE FILTERING (incremental)
+   Only the requested OrderDate window is deleted and reloaded
+   (with @undated = 1 also the orders without a parseable OrderDate,
+   which no window covers; they are all rejected).
+   Dimension keys are resolved once into temp.fact_stage; rows
+   with every key resolved go to the fact table, the rest go to
+   the error table with a reason code (no second join pass).
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @fact_table_name
+-- @fact_error_table_name
+-- @orders_staging_table
+-- @details_staging_table
+-- @as_of                 (1 = SCD2 keys as of OrderDate, 0 = current versions)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also reload the orders with a NULL OrderDay)
+---------------------------------------------------------------
+
+
+---------------------------------------------------------------
+-- 1. Ensure SOR entries exist
+---------------------------------------------------------------
+WITH sor (SOR_Name) AS (
+    VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')
+)
+INSERT INTO Dim_SOR (SOR_Name)
+SELECT sor.SOR_Name
+FROM sor
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
+);
+
+
+---------------------------------------------------------------
+-- 2. Load SOR_SK and the date window
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.load_ctx;
+
+CREATE TEMP TABLE load_ctx AS
+SELECT
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = 'FACT_ORDERS_SNAPSHOT') AS SOR_SK,
+    (SELECT SOR_SK FROM Dim_SOR WHERE SOR_Name = 'FACT_ORDERS_ERROR')    AS ERROR_SOR_SK,
+    datetime('now', 'localtime')                                         AS load_time,
+    date(@start_date)                                                    AS window_start,
+    date(@end_date)                                                      AS window_end,
+    @undated                                                             AS undated,
+    @as_of                                                               AS as_of;
+
+
+---------------------------------------------------------------
+-- 3. Version intervals of the SCD2 dimensions, [ValidFrom, ValidTo)
+--    as_of = 0: only the current version of each key
+--    as_of = 1: every version; a key's first version is extended
+--               back to 1900-01-01, so orders older than the first
+--               dimension load still resolve
+--    Keys are looked up at KeyDate: the OrderDate when resolving as
+--    of the order, otherwise (or without an OrderDate) 9999-12-30,
+--    which only a current version covers.
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.customer_versions;
+
+CREATE TEMP TABLE customer_versions AS
+SELECT
+    Customer_NK,
+    Customer_SK,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Customer_NK ORDER BY ValidFrom) = 1
+        THEN '1900-01-01 00:00:00'
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+FROM DimCustomers
+WHERE (SELECT as_of FROM load_ctx) = 1 OR IsCurrent = 1;
+
+CREATE INDEX temp.IX_customer_versions ON customer_versions (Customer_NK, ValidFrom);
+
+DROP TABLE IF EXISTS temp.product_versions;
+
+CREATE TEMP TABLE product_versions AS
+SELECT
+    Product_NK,
+    Product_SK,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Product_NK ORDER BY ValidFrom) = 1
+        THEN '1900-01-01 00:00:00'
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+FROM DimProducts
+WHERE (SELECT as_of FROM load_ctx) = 1 OR IsCurrent = 1;
+
+CREATE INDEX temp.IX_product_versions ON product_versions (Product_NK, ValidFrom);
+
+
+---------------------------------------------------------------
+-- 4. Resolve dimension keys once for the window
+--    ShipRegion is free text in the source; only values that are
+--    region ids (all digits) are looked up (and rejected if unknown).
+---------------------------------------------------------------
+DROP TABLE IF EXISTS temp.fact_stage;
+
+CREATE TEMP TABLE fact_stage AS
+WITH ORDERS AS (
+    SELECT
+        o.*,
+        CASE
+            WHEN o.ShipRegion GLOB '[0-9]*' AND o.ShipRegion NOT GLOB '*[^0-9]*'
+            THEN CAST(o.ShipRegion AS INTEGER)
+        END AS ShipRegion_NK,
+        CASE
+            WHEN (SELECT as_of FROM load_ctx) = 1 THEN COALESCE(o.OrderDate, '9999-12-30')
+            ELSE '9999-12-30'
+        END AS KeyDate
+    FROM @orders_staging_table o, load_ctx X
+    WHERE o.OrderDay BETWEEN X.window_start AND X.window_end
+       OR (X.undated = 1 AND o.OrderDay IS NULL)
+)
+SELECT
+    o.OrderID         AS Order_NK,
+    d.ProductID       AS Product_NK,
+
+    dc.Customer_SK,
+    de.Employee_SK,
+    dp.Product_SK,
+    ds.Shipper_SK,
+    dt.Territory_SK,
+    dr.Region_SK,
+
+    o.OrderDate,
+    o.RequiredDate,
+    o.ShippedDate,
+    o.Freight,
+
+    d.UnitPrice,
+    d.Quantity,
+    d.Discount,
+
+    d.staging_raw_id_sk,
+    d.SourceFile,
+
+    CASE
+        WHEN o.OrderDay IS NULL THEN 'INVALID_ORDER_DATE'
+        WHEN dc.Customer_SK IS NULL THEN 'MISSING_CUSTOMER'
+        WHEN de.Employee_SK IS NULL THEN 'MISSING_EMPLOYEE'
+        WHEN dp.Product_SK IS NULL THEN 'MISSING_PRODUCT'
+        WHEN ds.Shipper_SK IS NULL THEN 'MISSING_SHIPPER'
+        WHEN dt.Territory_SK IS NULL THEN 'MISSING_TERRITORY'
+        WHEN dr.Region_SK IS NULL AND o.ShipRegion_NK IS NOT NULL THEN 'MISSING_REGION'
+    END AS ErrorCode
+
+FROM @details_staging_table d
+JOIN ORDERS o
+      ON o.OrderID = d.OrderID
+
+LEFT JOIN customer_versions dc
+       ON dc.Customer_NK = o.CustomerID
+      AND o.KeyDate >= dc.ValidFrom AND o.KeyDate < dc.ValidTo
+
+LEFT JOIN DimEmployees de
+       ON de.Employee_NK = o.EmployeeID AND de.IsDeleted = 0
+
+LEFT JOIN product_versions dp
+       ON dp.Product_NK = d.ProductID
+      AND o.KeyDate >= dp.ValidFrom AND o.KeyDate < dp.ValidTo
+
+LEFT JOIN DimShippers ds
+       ON ds.Shipper_NK = o.ShipVia
+
+LEFT JOIN DimTerritories dt
+       ON dt.Territory_NK = o.TerritoryID
+
+LEFT JOIN DimRegion dr
+       ON dr.Region_NK = o.ShipRegion_NK;
+
+
+---------------------------------------------------------------
+-- 5. Delete existing fact and error rows in the window
+---------------------------------------------------------------
+DELETE FROM @fact_table_name
+WHERE OrderDay BETWEEN (SELECT window_start FROM load_ctx)
+                          AND (SELECT window_end FROM load_ctx)
+   OR ((SELECT undated FROM load_ctx) = 1 AND OrderDay IS NULL);
+
+DELETE FROM @fact_error_table_name
+WHERE OrderDay BETWEEN (SELECT window_start FROM load_ctx)
+                          AND (SELECT window_end FROM load_ctx)
+   OR ((SELECT undated FROM load_ctx) = 1 AND OrderDay IS NULL);
+
+
+---------------------------------------------------------------
+-- 6. Valid rows -> fact table
+---------------------------------------------------------------
+INSERT INTO @fact_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    F.Order_NK,
+    F.Product_NK,
+    F.Customer_SK,
+    F.Employee_SK,
+    F.Product_SK,
+    F.Shipper_SK,
+    F.Territory_SK,
+    F.Region_SK,
+    F.OrderDate,
+    F.RequiredDate,
+    F.ShippedDate,
+    F.Freight,
+    F.UnitPrice,
+    F.Quantity,
+    F.Discount,
+    X.SOR_SK,
+    F.staging_raw_id_sk,
+    F.SourceFile,
+    X.load_time
+FROM fact_stage F, load_ctx X
+WHERE F.ErrorCode IS NULL;
+
+
+---------------------------------------------------------------
+-- 7. Rejected rows -> error table
+---------------------------------------------------------------
+INSERT INTO @fact_error_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    ErrorMessage,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    F.Order_NK,
+    F.Product_NK,
+    F.Customer_SK,
+    F.Employee_SK,
+    F.Product_SK,
+    F.Shipper_SK,
+    F.Territory_SK,
+    F.Region_SK,
+    F.OrderDate,
+    F.ErrorCode,
+    CASE F.ErrorCode
+        WHEN 'INVALID_ORDER_DATE' THEN 'Missing or invalid OrderDate'
+        WHEN 'MISSING_CUSTOMER' THEN 'Missing Customer_SK'
+        WHEN 'MISSING_EMPLOYEE' THEN 'Missing Employee_SK'
+        WHEN 'MISSING_PRODUCT' THEN 'Missing Product_SK'
+        WHEN 'MISSING_SHIPPER' THEN 'Missing Shipper_SK'
+        WHEN 'MISSING_TERRITORY' THEN 'Missing Territory_SK'
+        WHEN 'MISSING_REGION' THEN 'Missing Region_SK'
+    END,
+    X.ERROR_SOR_SK,
+    F.staging_raw_id_sk,
+    F.SourceFile,
+    X.load_time
+FROM fact_stage F, load_ctx X
+WHERE F.ErrorCode IS NOT NULL;
+
+
+---------------------------------------------------------------
+-- 8. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN ErrorCode IS NULL THEN 1 END) AS loaded_rows,
+    COUNT(ErrorCode)                              AS rejected_rows
+FROM fact_stage;
+
+DROP TABLE temp.fact_stage;
+DROP TABLE temp.customer_versions;
+DROP TABLE temp.product_versions;
@@ -0,0 +1,151 @@
+/* ===========================================================
+   update_aggregates.sql
+   Dashboard aggregates of FactOrders, refreshed for the OrderDate
+   window of the last fact load (or rebuilt on a full refresh):
+     - day x customer
+     - month x product
+     - month x employee x territory
+   Month-grain tables are recomputed for every month the window
+   touches, first to last day, so a partial month stays complete.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+-- @fact_table_name
+-- @day_customer_table
+-- @product_month_table
+-- @employee_territory_month_table
+-- @full_refresh          (1 = rebuild, 0 = OrderDate window)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+---------------------------------------------------------------
+
+
+---------------------------------------------------------------
+-- 1. Window, widened to whole months for the month grain
+---------------------------------------------------------------
+DECLARE @rebuild      BIT  = @full_refresh;
+DECLARE @window_start DATE = CAST(@start_date AS DATE);
+DECLARE @window_end   DATE = CAST(@end_date AS DATE);
+DECLARE @month_start  DATE = DATEFROMPARTS(YEAR(@window_start), MONTH(@window_start), 1);
+DECLARE @month_end    DATE = EOMONTH(@window_end);
+DECLARE @load_time    DATETIME = GETDATE();
+
+DECLARE @day_customer_rows INT;
+DECLARE @product_month_rows INT;
+DECLARE @employee_territory_month_rows INT;
+
+
+---------------------------------------------------------------
+-- 2. Fact lines of the touched months (by the computed OrderDay)
+---------------------------------------------------------------
+DROP TABLE IF EXISTS #agg_lines;
+
+SELECT
+    f.OrderDay                                        AS OrderDate,
+    DATEFROMPARTS(YEAR(f.OrderDay), MONTH(f.OrderDay), 1) AS MonthStart,
+    f.Order_NK,
+    f.Customer_SK,
+    f.Product_SK,
+    f.Employee_SK,
+    f.Territory_SK,
+    f.Quantity,
+    f.UnitPrice * f.Quantity                          AS GrossAmount,
+    f.UnitPrice * f.Quantity * (1 - ISNULL(f.Discount, 0)) AS NetAmount
+INTO #agg_lines
+FROM @database_name.@schema_name.@fact_table_name f
+WHERE f.OrderDay IS NOT NULL
+  AND (@rebuild = 1 OR f.OrderDay BETWEEN @month_start AND @month_end)
+OPTION (RECOMPILE);  -- plan for the actual @rebuild: an OrderDay seek for a window
+
+
+---------------------------------------------------------------
+-- 3. Day x customer (the window's days)
+---------------------------------------------------------------
+DELETE FROM @database_name.@schema_name.@day_customer_table
+WHERE @rebuild = 1 OR OrderDate BETWEEN @window_start AND @window_end;
+
+INSERT INTO @database_name.@schema_name.@day_customer_table (
+    OrderDate, Customer_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    OrderDate,
+    Customer_SK,
+    COUNT(DISTINCT Order_NK),
+    COUNT(*),
+    SUM(Quantity),
+    SUM(GrossAmount),
+    SUM(NetAmount),
+    @load_time
+FROM #agg_lines
+WHERE Customer_SK IS NOT NULL
+  AND (@rebuild = 1 OR OrderDate BETWEEN @window_start AND @window_end)
+GROUP BY OrderDate, Customer_SK;
+
+SET @day_customer_rows = @@ROWCOUNT;
+
+
+---------------------------------------------------------------
+-- 4. Month x product (the window's months)
+---------------------------------------------------------------
+DELETE FROM @database_name.@schema_name.@product_month_table
+WHERE @rebuild = 1 OR MonthStart BETWEEN @month_start AND @month_end;
+
+INSERT INTO @database_name.@schema_name.@product_month_table (
+    MonthStart, Product_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    MonthStart,
+    Product_SK,
+    COUNT(DISTINCT Order_NK),
+    COUNT(*),
+    SUM(Quantity),
+    SUM(GrossAmount),
+    SUM(NetAmount),
+    @load_time
+FROM #agg_lines
+WHERE Product_SK IS NOT NULL
+GROUP BY MonthStart, Product_SK;
+
+SET @product_month_rows = @@ROWCOUNT;
+
+
+---------------------------------------------------------------
+-- 5. Month x employee x territory (the window's months)
+---------------------------------------------------------------
+DELETE FROM @database_name.@schema_name.@employee_territory_month_table
+WHERE @rebuild = 1 OR MonthStart BETWEEN @month_start AND @month_end;
+
+INSERT INTO @database_name.@schema_name.@employee_territory_month_table (
+    MonthStart, Employee_SK, Territory_SK, Orders, OrderLines, Quantity, GrossAmount, NetAmount, LoadDate
+)
+SELECT
+    MonthStart,
+    Employee_SK,
+    Territory_SK,
+    COUNT(DISTINCT Order_NK),
+    COUNT(*),
+    SUM(Quantity),
+    SUM(GrossAmount),
+    SUM(NetAmount),
+    @load_time
+FROM #agg_lines
+WHERE Employee_SK IS NOT NULL
+  AND Territory_SK IS NOT NULL
+GROUP BY MonthStart, Employee_SK, Territory_SK;
+
+SET @employee_territory_month_rows = @@ROWCOUNT;
+
+
+---------------------------------------------------------------
+-- 6. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    (SELECT COUNT(*) FROM #agg_lines)  AS fact_lines,
+    @day_customer_rows                 AS day_customer_rows,
+    @product_month_rows                AS product_month_rows,
+    @employee_territory_month_rows     AS employee_territory_month_rows;
+
+DROP TABLE #agg_lines;
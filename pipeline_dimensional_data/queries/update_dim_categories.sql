@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_categories.sql  
    SCD1 with Delete Handling — DimCategories
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -26,37 +27,58 @@ WHERE NOT EXISTS (
 -- 2. Fetch SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @deleted_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 ---------------------------------------------------------------
 -- 3. MERGE — SCD1 with delete-flag reset
+--    Unchanged rows (same hash, not deleted) are filtered out
+--    before the MERGE.
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         CategoryID AS Category_NK,
         CategoryName,
         Description,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(CategoryName, '|', Description)) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Category_NK = S.Category_NK
+          AND D.RowHash     = S.RowHash
+          AND D.IsDeleted   = 0
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Category_NK = SOURCE.Category_NK
 
 -- Update changed or previously deleted rows
-WHEN MATCHED AND (
-       ISNULL(TARGET.CategoryName, '') <> ISNULL(SOURCE.CategoryName, '')
-    OR ISNULL(TARGET.Description, '')  <> ISNULL(SOURCE.Description, '')
-    OR TARGET.IsDeleted = 1
-)
+WHEN MATCHED
 THEN UPDATE SET
        TARGET.CategoryName      = SOURCE.CategoryName,
        TARGET.Description       = SOURCE.Description,
+       TARGET.RowHash           = SOURCE.RowHash,
        TARGET.IsDeleted         = 0,
        TARGET.SOR_SK            = @SOR_SK,
        TARGET.staging_raw_id_sk = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile        = SOURCE.SourceFile,
        TARGET.LoadDate          = GETDATE()
 
 -- Insert new rows
@@ -65,20 +87,26 @@ THEN INSERT (
         Category_NK,
         CategoryName,
         Description,
+        RowHash,
         IsDeleted,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
      )
      VALUES (
         SOURCE.Category_NK,
         SOURCE.CategoryName,
         SOURCE.Description,
+        SOURCE.RowHash,
         0,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-     );
+     )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
 
 ---------------------------------------------------------------
 -- 4. Soft-delete rows missing in staging
@@ -91,4 +119,16 @@ FROM   @database_name.@schema_name.@dim_table_name T
 LEFT JOIN @database_name.@schema_name.@staging_table_name S
        ON S.CategoryID = T.Category_NK
 WHERE  S.CategoryID IS NULL
-  AND  T.IsDeleted = 0;
\ No newline at end of file
+  AND  T.IsDeleted = 0;
+
+SET @deleted_rows = @@ROWCOUNT;
+
+---------------------------------------------------------------
+-- 5. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows,
+    @deleted_rows                                      AS deleted_rows
+FROM @merge_actions;
@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_customers.sql
    SCD2 (Historical) — DimCustomers
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -26,13 +27,26 @@ WHERE NOT EXISTS (
 -- 2. Fetch SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @load_time DATETIME = GETDATE();
+DECLARE @merge_actions TABLE (
+    MergeAction       NVARCHAR(10),
+    Customer_NK       NVARCHAR(50),
+    RowHash           VARBINARY(32),
+    staging_raw_id_sk INT
+);
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 ---------------------------------------------------------------
 -- 3. SCD2 MERGE Logic — Close old row on change
+--    Unchanged rows (same hash as the current version) are
+--    filtered out before the MERGE.
 ---------------------------------------------------------------
 ;WITH INCOMING AS (
     SELECT
@@ -47,9 +61,25 @@ WHERE SOR_Name = '@staging_table_name';
         Country,
         Phone,
         Fax,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            CompanyName, '|', ContactName, '|', ContactTitle, '|', Address, '|',
+            City, '|', Region, '|', PostalCode, '|', Country, '|', Phone, '|', Fax
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
 ),
+CHANGED AS (
+    SELECT S.*
+    FROM INCOMING S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Customer_NK = S.Customer_NK
+          AND D.IsCurrent   = 1
+          AND D.RowHash     = S.RowHash
+    )
+),
 CURRENT_ROWS AS (
     SELECT *
     FROM @database_name.@schema_name.@dim_table_name
@@ -57,24 +87,13 @@ CURRENT_ROWS AS (
 )
 
 MERGE CURRENT_ROWS AS TARGET
-USING INCOMING AS SOURCE
+USING CHANGED AS SOURCE
 ON TARGET.Customer_NK = SOURCE.Customer_NK
 
 -- 3A. Change detected → close the current row
-WHEN MATCHED AND (
-       ISNULL(TARGET.CompanyName,'')   <> ISNULL(SOURCE.CompanyName,'')
-    OR ISNULL(TARGET.ContactName,'')   <> ISNULL(SOURCE.ContactName,'')
-    OR ISNULL(TARGET.ContactTitle,'')  <> ISNULL(SOURCE.ContactTitle,'')
-    OR ISNULL(TARGET.Address,'')       <> ISNULL(SOURCE.Address,'')
-    OR ISNULL(TARGET.City,'')          <> ISNULL(SOURCE.City,'')
-    OR ISNULL(TARGET.Region,'')        <> ISNULL(SOURCE.Region,'')
-    OR ISNULL(TARGET.PostalCode,'')    <> ISNULL(SOURCE.PostalCode,'')
-    OR ISNULL(TARGET.Country,'')       <> ISNULL(SOURCE.Country,'')
-    OR ISNULL(TARGET.Phone,'')         <> ISNULL(SOURCE.Phone,'')
-    OR ISNULL(TARGET.Fax,'')           <> ISNULL(SOURCE.Fax,'')
-)
+WHEN MATCHED
 THEN UPDATE SET
-       TARGET.ValidTo      = GETDATE(),
+       TARGET.ValidTo      = @load_time,
        TARGET.IsCurrent    = 0
 
 -- 3B. New customer → insert fresh version
@@ -91,11 +110,13 @@ THEN INSERT (
         Country,
         Phone,
         Fax,
+        RowHash,
         ValidFrom,
         ValidTo,
         IsCurrent,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -110,16 +131,22 @@ THEN INSERT (
         SOURCE.Country,
         SOURCE.Phone,
         SOURCE.Fax,
-        GETDATE(),          -- ValidFrom
+        SOURCE.RowHash,
+        @load_time,         -- ValidFrom
         '9999-12-31',       -- ValidTo open-ended
         1,                  -- IsCurrent
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
+    )
+
+OUTPUT $action, SOURCE.Customer_NK, SOURCE.RowHash, SOURCE.staging_raw_id_sk
+INTO @merge_actions (MergeAction, Customer_NK, RowHash, staging_raw_id_sk);
 
 ---------------------------------------------------------------
--- 4. Insert new versions for closed rows (historical SCD2)
+-- 4. Insert new versions for the rows closed above
+--    (taken from the MERGE output — no second dimension scan)
 ---------------------------------------------------------------
 INSERT INTO @database_name.@schema_name.@dim_table_name (
         Customer_NK,
@@ -133,11 +160,13 @@ INSERT INTO @database_name.@schema_name.@dim_table_name (
         Country,
         Phone,
         Fax,
+        RowHash,
         ValidFrom,
         ValidTo,
         IsCurrent,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
 )
 SELECT 
@@ -152,17 +181,24 @@ SELECT
     S.Country,
     S.Phone,
     S.Fax,
-    GETDATE(),          -- ValidFrom
+    A.RowHash,
+    @load_time,         -- ValidFrom
     '9999-12-31',       -- ValidTo
     1,                  -- IsCurrent
     @SOR_SK,
     S.staging_raw_id_sk,
+    S.SourceFile,
     GETDATE()
-FROM @database_name.@schema_name.@staging_table_name S
-WHERE EXISTS (
-    SELECT 1
-    FROM @database_name.@schema_name.@dim_table_name D
-    WHERE D.Customer_NK = S.CustomerID
-      AND D.IsCurrent = 0
-      AND CAST(D.ValidTo AS DATE) = CAST(GETDATE() AS DATE)
-);
\ No newline at end of file
+FROM @merge_actions A
+JOIN @database_name.@schema_name.@staging_table_name S
+      ON S.staging_raw_id_sk = A.staging_raw_id_sk
+WHERE A.MergeAction = 'UPDATE';
+
+---------------------------------------------------------------
+-- 5. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows
+FROM @merge_actions;
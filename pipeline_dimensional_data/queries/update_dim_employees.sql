@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_employees.sql  
    SCD1 with Delete Flag — DimEmployees
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -28,17 +29,24 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @deleted_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 
 ---------------------------------------------------------------
 -- 3. MERGE — SCD1 + Delete Reset
+--    Unchanged rows (same hash, not deleted) are filtered out
+--    before the MERGE.
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         EmployeeID AS Employee_NK,
         LastName,
@@ -56,30 +64,34 @@ USING (
         Extension,
         Notes,
         ReportsTo,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            LastName, '|', FirstName, '|', Title, '|', TitleOfCourtesy, '|',
+            BirthDate, '|', HireDate, '|', Address, '|', City, '|', Region, '|',
+            PostalCode, '|', Country, '|', HomePhone, '|', Extension, '|',
+            Notes, '|', ReportsTo
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Employee_NK = S.Employee_NK
+          AND D.RowHash     = S.RowHash
+          AND D.IsDeleted   = 0
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Employee_NK = SOURCE.Employee_NK
 
--- Update existing if any attribute changed OR if previously deleted
-WHEN MATCHED AND (
-       ISNULL(TARGET.LastName,'')         <> ISNULL(SOURCE.LastName,'')
-    OR ISNULL(TARGET.FirstName,'')        <> ISNULL(SOURCE.FirstName,'')
-    OR ISNULL(TARGET.Title,'')            <> ISNULL(SOURCE.Title,'')
-    OR ISNULL(TARGET.TitleOfCourtesy,'')  <> ISNULL(SOURCE.TitleOfCourtesy,'')
-    OR ISNULL(TARGET.BirthDate,'')        <> ISNULL(SOURCE.BirthDate,'')
-    OR ISNULL(TARGET.HireDate,'')         <> ISNULL(SOURCE.HireDate,'')
-    OR ISNULL(TARGET.Address,'')          <> ISNULL(SOURCE.Address,'')
-    OR ISNULL(TARGET.City,'')             <> ISNULL(SOURCE.City,'')
-    OR ISNULL(TARGET.Region,'')           <> ISNULL(SOURCE.Region,'')
-    OR ISNULL(TARGET.PostalCode,'')       <> ISNULL(SOURCE.PostalCode,'')
-    OR ISNULL(TARGET.Country,'')          <> ISNULL(SOURCE.Country,'')
-    OR ISNULL(TARGET.HomePhone,'')        <> ISNULL(SOURCE.HomePhone,'')
-    OR ISNULL(TARGET.Extension,'')        <> ISNULL(SOURCE.Extension,'')
-    OR ISNULL(TARGET.Notes,'')            <> ISNULL(SOURCE.Notes,'')
-    OR ISNULL(TARGET.ReportsTo,-1)        <> ISNULL(SOURCE.ReportsTo,-1)
-    OR TARGET.IsDeleted = 1
-)
+-- Update existing rows that changed or were previously deleted
+WHEN MATCHED
 THEN UPDATE SET
        TARGET.LastName         = SOURCE.LastName,
        TARGET.FirstName        = SOURCE.FirstName,
@@ -96,9 +108,11 @@ THEN UPDATE SET
        TARGET.Extension        = SOURCE.Extension,
        TARGET.Notes            = SOURCE.Notes,
        TARGET.ReportsTo        = SOURCE.ReportsTo,
+       TARGET.RowHash          = SOURCE.RowHash,
        TARGET.IsDeleted        = 0,
        TARGET.SOR_SK           = @SOR_SK,
        TARGET.staging_raw_id_sk = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile        = SOURCE.SourceFile,
        TARGET.LoadDate         = GETDATE()
 
 -- Insert new employees
@@ -120,9 +134,11 @@ THEN INSERT (
         Extension,
         Notes,
         ReportsTo,
+        RowHash,
         IsDeleted,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -142,11 +158,15 @@ THEN INSERT (
         SOURCE.Extension,
         SOURCE.Notes,
         SOURCE.ReportsTo,
+        SOURCE.RowHash,
         0,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
+    )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
 
 
 ---------------------------------------------------------------
@@ -161,4 +181,17 @@ FROM @database_name.@schema_name.@dim_table_name T
 LEFT JOIN @database_name.@schema_name.@staging_table_name S
        ON S.EmployeeID = T.Employee_NK
 WHERE S.EmployeeID IS NULL
-  AND T.IsDeleted = 0;
\ No newline at end of file
+  AND T.IsDeleted = 0;
+
+SET @deleted_rows = @@ROWCOUNT;
+
+
+---------------------------------------------------------------
+-- 5. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows,
+    @deleted_rows                                      AS deleted_rows
+FROM @merge_actions;
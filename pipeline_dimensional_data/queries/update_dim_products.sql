@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_products.sql
    SCD2 + Delete Closing — DimProducts
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -28,14 +29,28 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @deleted_rows INT;
+DECLARE @load_time DATETIME = GETDATE();
+DECLARE @merge_actions TABLE (
+    MergeAction       NVARCHAR(10),
+    Product_NK        INT,
+    RowHash           VARBINARY(32),
+    staging_raw_id_sk INT
+);
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 
 ---------------------------------------------------------------
 -- 3. SCD2 MERGE (detect changes → close old version)
+--    Unchanged rows (same hash as the current version) are
+--    filtered out before the MERGE.
 ---------------------------------------------------------------
 ;WITH INCOMING AS (
     SELECT
@@ -49,9 +64,26 @@ WHERE SOR_Name = '@staging_table_name';
         UnitsOnOrder,
         ReorderLevel,
         Discontinued,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            ProductName, '|', SupplierID, '|', CategoryID, '|', QuantityPerUnit, '|',
+            CONVERT(VARCHAR(30), UnitPrice, 2), '|', UnitsInStock, '|',
+            UnitsOnOrder, '|', ReorderLevel, '|', Discontinued
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
 ),
+CHANGED AS (
+    SELECT S.*
+    FROM INCOMING S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Product_NK = S.Product_NK
+          AND D.IsCurrent  = 1
+          AND D.RowHash    = S.RowHash
+    )
+),
 CURRENT_ROWS AS (
     SELECT *
     FROM @database_name.@schema_name.@dim_table_name
@@ -59,26 +91,16 @@ CURRENT_ROWS AS (
 )
 
 MERGE CURRENT_ROWS AS TARGET
-USING INCOMING AS SOURCE
+USING CHANGED AS SOURCE
 ON TARGET.Product_NK = SOURCE.Product_NK
 
 -- 3A. Change detected → close existing version
-WHEN MATCHED AND (
-       ISNULL(TARGET.ProductName,'')      <> ISNULL(SOURCE.ProductName,'')
-    OR ISNULL(TARGET.Supplier_NK,-1)      <> ISNULL(SOURCE.Supplier_NK,-1)
-    OR ISNULL(TARGET.Category_NK,-1)      <> ISNULL(SOURCE.Category_NK,-1)
-    OR ISNULL(TARGET.QuantityPerUnit,'')  <> ISNULL(SOURCE.QuantityPerUnit,'')
-    OR ISNULL(TARGET.UnitPrice,-1)        <> ISNULL(SOURCE.UnitPrice,-1)
-    OR ISNULL(TARGET.UnitsInStock,-1)     <> ISNULL(SOURCE.UnitsInStock,-1)
-    OR ISNULL(TARGET.UnitsOnOrder,-1)     <> ISNULL(SOURCE.UnitsOnOrder,-1)
-    OR ISNULL(TARGET.ReorderLevel,-1)     <> ISNULL(SOURCE.ReorderLevel,-1)
-    OR ISNULL(TARGET.Discontinued,'')     <> ISNULL(SOURCE.Discontinued,'')
-)
+WHEN MATCHED
 THEN UPDATE SET
-       TARGET.ValidTo   = GETDATE(),
+       TARGET.ValidTo   = @load_time,
        TARGET.IsCurrent = 0
 
--- 3B. Insert new NKs or fresh versions
+-- 3B. Insert new NKs
 WHEN NOT MATCHED BY TARGET
 THEN INSERT (
         Product_NK,
@@ -91,12 +113,14 @@ THEN INSERT (
         UnitsOnOrder,
         ReorderLevel,
         Discontinued,
+        RowHash,
         ValidFrom,
         ValidTo,
         IsCurrent,
         IsClosed,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -110,18 +134,24 @@ THEN INSERT (
         SOURCE.UnitsOnOrder,
         SOURCE.ReorderLevel,
         SOURCE.Discontinued,
-        GETDATE(),           -- ValidFrom
+        SOURCE.RowHash,
+        @load_time,          -- ValidFrom
         '9999-12-31',        -- ValidTo open-ended
         1,                   -- IsCurrent
         0,                   -- IsClosed
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
+    )
+
+OUTPUT $action, SOURCE.Product_NK, SOURCE.RowHash, SOURCE.staging_raw_id_sk
+INTO @merge_actions (MergeAction, Product_NK, RowHash, staging_raw_id_sk);
 
 
 ---------------------------------------------------------------
--- 4. Insert new versions for rows closed today (new SCD2 versions)
+-- 4. Insert new versions for the rows closed above
+--    (taken from the MERGE output — no second dimension scan)
 ---------------------------------------------------------------
 INSERT INTO @database_name.@schema_name.@dim_table_name (
         Product_NK,
@@ -134,12 +164,14 @@ INSERT INTO @database_name.@schema_name.@dim_table_name (
         UnitsOnOrder,
         ReorderLevel,
         Discontinued,
+        RowHash,
         ValidFrom,
         ValidTo,
         IsCurrent,
         IsClosed,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
 )
 SELECT 
@@ -153,21 +185,19 @@ SELECT
     S.UnitsOnOrder,
     S.ReorderLevel,
     S.Discontinued,
-    GETDATE(),
+    A.RowHash,
+    @load_time,
     '9999-12-31',
     1,              -- new current row
     0,              -- not closed
     @SOR_SK,
     S.staging_raw_id_sk,
+    S.SourceFile,
     GETDATE()
-FROM @database_name.@schema_name.@staging_table_name S
-WHERE EXISTS (
-    SELECT 1
-    FROM @database_name.@schema_name.@dim_table_name D
-    WHERE D.Product_NK = S.ProductID
-      AND D.IsCurrent = 0
-      AND CAST(D.ValidTo AS DATE) = CAST(GETDATE() AS DATE)
-);
+FROM @merge_actions A
+JOIN @database_name.@schema_name.@staging_table_name S
+      ON S.staging_raw_id_sk = A.staging_raw_id_sk
+WHERE A.MergeAction = 'UPDATE';
 
 
 ---------------------------------------------------------------
@@ -175,13 +205,26 @@ WHERE EXISTS (
 ---------------------------------------------------------------
 UPDATE T
 SET
-    T.ValidTo   = GETDATE(),
+    T.ValidTo   = @load_time,
     T.IsCurrent = 0,
     T.IsClosed  = 1,
     T.SOR_SK    = @SOR_SK,
     T.LoadDate  = GETDATE()
 FROM @database_name.@schema_name.@dim_table_name T
-LEFT JOIN INCOMING S
-       ON S.Product_NK = T.Product_NK
-WHERE S.Product_NK IS NULL
-  AND T.IsCurrent = 1;
\ No newline at end of file
+LEFT JOIN @database_name.@schema_name.@staging_table_name S
+       ON S.ProductID = T.Product_NK
+WHERE S.ProductID IS NULL
+  AND T.IsCurrent = 1;
+
+SET @deleted_rows = @@ROWCOUNT;
+
+
+---------------------------------------------------------------
+-- 6. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows,
+    @deleted_rows                                      AS deleted_rows
+FROM @merge_actions;
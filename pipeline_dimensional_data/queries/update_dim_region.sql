@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_region.sql  
    SCD1 — DimRegion (Group 1)
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -27,39 +28,58 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 
 ---------------------------------------------------------------
--- 3. MERGE (SCD1)
+-- 3. MERGE (SCD1) — unchanged rows filtered out by hash
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         RegionID AS Region_NK,
         RegionDescription,
         RegionCategory,
         RegionImportance,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            RegionDescription, '|', RegionCategory, '|', RegionImportance
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Region_NK = S.Region_NK
+          AND D.RowHash   = S.RowHash
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Region_NK = SOURCE.Region_NK
 
 -- Update changed records
-WHEN MATCHED AND (
-       ISNULL(TARGET.RegionDescription, '') <> ISNULL(SOURCE.RegionDescription, '')
-    OR ISNULL(TARGET.RegionCategory, '')    <> ISNULL(SOURCE.RegionCategory, '')
-    OR ISNULL(TARGET.RegionImportance, '')  <> ISNULL(SOURCE.RegionImportance, '')
-)
+WHEN MATCHED
 THEN UPDATE SET
        TARGET.RegionDescription = SOURCE.RegionDescription,
        TARGET.RegionCategory    = SOURCE.RegionCategory,
        TARGET.RegionImportance  = SOURCE.RegionImportance,
+       TARGET.RowHash           = SOURCE.RowHash,
        TARGET.SOR_SK            = @SOR_SK,
        TARGET.staging_raw_id_sk = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile        = SOURCE.SourceFile,
        TARGET.LoadDate          = GETDATE()
 
 -- Insert new records
@@ -69,8 +89,10 @@ THEN INSERT (
         RegionDescription,
         RegionCategory,
         RegionImportance,
+        RowHash,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -78,7 +100,21 @@ THEN INSERT (
         SOURCE.RegionDescription,
         SOURCE.RegionCategory,
         SOURCE.RegionImportance,
+        SOURCE.RowHash,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
\ No newline at end of file
+    )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
+
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows
+FROM @merge_actions;
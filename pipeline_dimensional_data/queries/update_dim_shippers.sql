@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_shippers.sql
    SCD1 — DimShippers
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -28,36 +29,54 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 
 ---------------------------------------------------------------
--- 3. MERGE — SCD1
+-- 3. MERGE — SCD1, unchanged rows filtered out by hash
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         ShipperID AS Shipper_NK,
         CompanyName,
         Phone,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(CompanyName, '|', Phone)) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Shipper_NK = S.Shipper_NK
+          AND D.RowHash    = S.RowHash
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Shipper_NK = SOURCE.Shipper_NK
 
--- Update if any attribute changed
-WHEN MATCHED AND (
-       ISNULL(TARGET.CompanyName,'') <> ISNULL(SOURCE.CompanyName,'')
-    OR ISNULL(TARGET.Phone,'')       <> ISNULL(SOURCE.Phone,'')
-)
+-- Update changed rows
+WHEN MATCHED
 THEN UPDATE SET
        TARGET.CompanyName       = SOURCE.CompanyName,
        TARGET.Phone             = SOURCE.Phone,
+       TARGET.RowHash           = SOURCE.RowHash,
        TARGET.SOR_SK            = @SOR_SK,
        TARGET.staging_raw_id_sk = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile        = SOURCE.SourceFile,
        TARGET.LoadDate          = GETDATE()
 
 -- Insert new rows
@@ -66,15 +85,31 @@ THEN INSERT (
         Shipper_NK,
         CompanyName,
         Phone,
+        RowHash,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
         SOURCE.Shipper_NK,
         SOURCE.CompanyName,
         SOURCE.Phone,
+        SOURCE.RowHash,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
\ No newline at end of file
+    )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
+
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows
+FROM @merge_actions;
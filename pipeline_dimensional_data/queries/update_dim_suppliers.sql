@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_suppliers.sql
    SCD4 — DimSuppliers
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -28,16 +29,21 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 ---------------------------------------------------------------
 -- 3. MERGE — SCD4 (overwrite existing record)
+--    Unchanged rows are filtered out by hash before the MERGE.
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         SupplierID AS Supplier_NK,
         CompanyName,
@@ -51,28 +57,35 @@ USING (
         Phone,
         Fax,
         HomePage,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            CompanyName, '|', ContactName, '|', ContactTitle, '|', Address, '|',
+            City, '|', Region, '|', PostalCode, '|', Country, '|',
+            Phone, '|', Fax, '|', HomePage
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Supplier_NK = S.Supplier_NK
+          AND D.RowHash     = S.RowHash
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Supplier_NK = SOURCE.Supplier_NK
 
 
 ---------------------------------------------------------------
--- 3A. Update existing rows when any attribute changed
+-- 3A. Update existing rows whose hash changed
 ---------------------------------------------------------------
-WHEN MATCHED AND (
-       ISNULL(TARGET.CompanyName,'')   <> ISNULL(SOURCE.CompanyName,'')
-    OR ISNULL(TARGET.ContactName,'')   <> ISNULL(SOURCE.ContactName,'')
-    OR ISNULL(TARGET.ContactTitle,'')  <> ISNULL(SOURCE.ContactTitle,'')
-    OR ISNULL(TARGET.Address,'')       <> ISNULL(SOURCE.Address,'')
-    OR ISNULL(TARGET.City,'')          <> ISNULL(SOURCE.City,'')
-    OR ISNULL(TARGET.Region,'')        <> ISNULL(SOURCE.Region,'')
-    OR ISNULL(TARGET.PostalCode,'')    <> ISNULL(SOURCE.PostalCode,'')
-    OR ISNULL(TARGET.Country,'')       <> ISNULL(SOURCE.Country,'')
-    OR ISNULL(TARGET.Phone,'')         <> ISNULL(SOURCE.Phone,'')
-    OR ISNULL(TARGET.Fax,'')           <> ISNULL(SOURCE.Fax,'')
-    OR ISNULL(TARGET.HomePage,'')      <> ISNULL(SOURCE.HomePage,'')
-)
+WHEN MATCHED
 THEN UPDATE SET
        TARGET.CompanyName       = SOURCE.CompanyName,
        TARGET.ContactName       = SOURCE.ContactName,
@@ -85,8 +98,10 @@ THEN UPDATE SET
        TARGET.Phone             = SOURCE.Phone,
        TARGET.Fax               = SOURCE.Fax,
        TARGET.HomePage          = SOURCE.HomePage,
+       TARGET.RowHash           = SOURCE.RowHash,
        TARGET.SOR_SK            = @SOR_SK,
        TARGET.staging_raw_id_sk = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile        = SOURCE.SourceFile,
        TARGET.LoadDate          = GETDATE()
 
 
@@ -107,8 +122,10 @@ THEN INSERT (
         Phone,
         Fax,
         HomePage,
+        RowHash,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -124,7 +141,21 @@ THEN INSERT (
         SOURCE.Phone,
         SOURCE.Fax,
         SOURCE.HomePage,
+        SOURCE.RowHash,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
\ No newline at end of file
+    )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
+
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows
+FROM @merge_actions;
@@ -1,6 +1,7 @@
 /* ===========================================================
    update_dim_territories.sql
    SCD3 — One Historical Attribute (TerritoryDescription)
+   Change detection via RowHash (SHA2_256 over tracked attributes)
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -27,36 +28,53 @@ WHERE NOT EXISTS (
 -- 2. Retrieve SOR_SK
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @staged_rows INT;
+DECLARE @merge_actions TABLE (MergeAction NVARCHAR(10));
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = '@staging_table_name';
 
+SELECT @staged_rows = COUNT(*)
+FROM @database_name.@schema_name.@staging_table_name;
+
 
 ---------------------------------------------------------------
--- 3. MERGE (Unified SCD3 Logic)
+-- 3. MERGE (Unified SCD3 Logic) — unchanged rows filtered by hash
 ---------------------------------------------------------------
-MERGE @database_name.@schema_name.@dim_table_name AS TARGET
-USING (
+;WITH STAGED AS (
     SELECT
         TerritoryID AS Territory_NK,
         TerritoryDescription,
         TerritoryCode,
         RegionID AS Region_NK,
-        staging_raw_id_sk
+        staging_raw_id_sk,
+        SourceFile,
+        HASHBYTES('SHA2_256', CONCAT(
+            TerritoryDescription, '|', TerritoryCode, '|', RegionID
+        )) AS RowHash
     FROM @database_name.@schema_name.@staging_table_name
-) AS SOURCE
+),
+CHANGED AS (
+    SELECT S.*
+    FROM STAGED S
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM @database_name.@schema_name.@dim_table_name D
+        WHERE D.Territory_NK = S.Territory_NK
+          AND D.RowHash      = S.RowHash
+    )
+)
+
+MERGE @database_name.@schema_name.@dim_table_name AS TARGET
+USING CHANGED AS SOURCE
 ON TARGET.Territory_NK = SOURCE.Territory_NK
 
 
 ---------------------------------------------------------------
 -- SINGLE MATCHED CLAUSE 
 ---------------------------------------------------------------
-WHEN MATCHED AND (
-       ISNULL(TARGET.TerritoryDescription_Current,'') <> ISNULL(SOURCE.TerritoryDescription,'')
-    OR ISNULL(TARGET.TerritoryCode,'') <> ISNULL(SOURCE.TerritoryCode,'')
-    OR ISNULL(TARGET.Region_NK,-1) <> ISNULL(SOURCE.Region_NK,-1)
-)
+WHEN MATCHED
 THEN UPDATE SET
 
        -- Only shift prior value when description actually changed
@@ -72,9 +90,11 @@ THEN UPDATE SET
        TARGET.TerritoryDescription_Current = SOURCE.TerritoryDescription,
        TARGET.TerritoryCode                = SOURCE.TerritoryCode,
        TARGET.Region_NK                    = SOURCE.Region_NK,
+       TARGET.RowHash                      = SOURCE.RowHash,
 
        TARGET.SOR_SK                       = @SOR_SK,
        TARGET.staging_raw_id_sk            = SOURCE.staging_raw_id_sk,
+       TARGET.SourceFile                   = SOURCE.SourceFile,
        TARGET.LoadDate                     = GETDATE()
 
 
@@ -88,8 +108,10 @@ THEN INSERT (
         TerritoryDescription_Prior,
         TerritoryCode,
         Region_NK,
+        RowHash,
         SOR_SK,
         staging_raw_id_sk,
+        SourceFile,
         LoadDate
     )
     VALUES (
@@ -98,7 +120,21 @@ THEN INSERT (
         NULL,
         SOURCE.TerritoryCode,
         SOURCE.Region_NK,
+        SOURCE.RowHash,
         @SOR_SK,
         SOURCE.staging_raw_id_sk,
+        SOURCE.SourceFile,
         GETDATE()
-    );
\ No newline at end of file
+    )
+
+OUTPUT $action INTO @merge_actions (MergeAction);
+
+
+---------------------------------------------------------------
+-- 4. Report load counts
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN MergeAction = 'INSERT' THEN 1 END) AS inserted_rows,
+    COUNT(CASE WHEN MergeAction = 'UPDATE' THEN 1 END) AS updated_rows,
+    @staged_rows - COUNT(*)                            AS unchanged_rows
+FROM @merge_actions;
@@ -1,6 +1,12 @@
 /* ===========================================================
    update_fact.sql
-   SNAPSHOT FACT LOADER WITH DATE FILTERING
+   SNAPSHOT FACT LOADER WITH DATE FILTERING (incremental)
+   Only the requested OrderDate window is deleted and reloaded
+   (with @undated = 1 also the orders without a parseable OrderDate,
+   which no window covers; they are all rejected).
+   Dimension keys are resolved once into #fact_stage; rows with
+   every key resolved go to the fact table, the rest go to the
+   error table with a reason code (no second join pass).
    =========================================================== */
 
 ---------------------------------------------------------------
@@ -8,64 +14,102 @@
 -- @database_name
 -- @schema_name
 -- @fact_table_name
--- @staging_table_name   
--- @start_date
--- @end_date
+-- @fact_error_table_name
+-- @orders_staging_table
+-- @details_staging_table
+-- @as_of                 (1 = SCD2 keys as of OrderDate, 0 = current versions)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also reload the orders with a NULL OrderDay)
 ---------------------------------------------------------------
 
 
 ---------------------------------------------------------------
--- 1. Ensure SOR entry exists
+-- 1. Ensure SOR entries exist
 ---------------------------------------------------------------
 INSERT INTO @database_name.@schema_name.Dim_SOR (SOR_Name)
-SELECT 'FACT_ORDERS_SNAPSHOT'
+SELECT sor.SOR_Name
+FROM (VALUES ('FACT_ORDERS_SNAPSHOT'), ('FACT_ORDERS_ERROR')) AS sor (SOR_Name)
 WHERE NOT EXISTS (
     SELECT 1
-    FROM @database_name.@schema_name.Dim_SOR
-    WHERE SOR_Name = 'FACT_ORDERS_SNAPSHOT'
+    FROM @database_name.@schema_name.Dim_SOR existing
+    WHERE existing.SOR_Name = sor.SOR_Name
 );
 
 
 ---------------------------------------------------------------
--- 2. Load SOR_SK
+-- 2. Load SOR_SK and the date window
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @ERROR_SOR_SK INT;
+DECLARE @window_start DATE = CAST(@start_date AS DATE);
+DECLARE @window_end   DATE = CAST(@end_date AS DATE);
+DECLARE @with_undated BIT  = @undated;
 
 SELECT @SOR_SK = SOR_SK
 FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = 'FACT_ORDERS_SNAPSHOT';
 
+SELECT @ERROR_SOR_SK = SOR_SK
+FROM @database_name.@schema_name.Dim_SOR
+WHERE SOR_Name = 'FACT_ORDERS_ERROR';
+
 
 ---------------------------------------------------------------
--- 3. Delete existing snapshot rows in date range
+-- 3. Version intervals of the SCD2 dimensions, [ValidFrom, ValidTo)
+--    @as_of = 0: only the current version of each key
+--    @as_of = 1: every version; a key's first version is extended
+--                back to 1900-01-01, so orders older than the first
+--                dimension load still resolve
+--    Keys are looked up at KeyDate: the OrderDate when resolving as
+--    of the order, otherwise (or without an OrderDate) 9999-12-30,
+--    which only a current version covers.
 ---------------------------------------------------------------
-DELETE FROM @database_name.@schema_name.@fact_table_name
-WHERE OrderDate BETWEEN @start_date AND @end_date;
+DECLARE @resolve_as_of    BIT      = @as_of;
+DECLARE @current_key_date DATETIME = '9999-12-30';
 
+DROP TABLE IF EXISTS #customer_versions;
 
----------------------------------------------------------------
--- 4. Insert refreshed snapshot rows
----------------------------------------------------------------
-INSERT INTO @database_name.@schema_name.@fact_table_name (
-    Order_NK,
-    Product_NK,
+SELECT
+    Customer_NK,
     Customer_SK,
-    Employee_SK,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Customer_NK ORDER BY ValidFrom) = 1
+        THEN CAST('1900-01-01' AS DATETIME)
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+INTO #customer_versions
+FROM @database_name.@schema_name.DimCustomers
+WHERE @resolve_as_of = 1 OR IsCurrent = 1;
+
+CREATE CLUSTERED INDEX IX_customer_versions ON #customer_versions (Customer_NK, ValidFrom);
+
+DROP TABLE IF EXISTS #product_versions;
+
+SELECT
+    Product_NK,
     Product_SK,
-    Shipper_SK,
-    Territory_SK,
-    Region_SK,
-    OrderDate,
-    RequiredDate,
-    ShippedDate,
-    Freight,
-    UnitPrice,
-    Quantity,
-    Discount,
-    SOR_SK,
-    staging_raw_id_sk,
-    LoadDate
-)
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Product_NK ORDER BY ValidFrom) = 1
+        THEN CAST('1900-01-01' AS DATETIME)
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+INTO #product_versions
+FROM @database_name.@schema_name.DimProducts
+WHERE @resolve_as_of = 1 OR IsCurrent = 1;
+
+CREATE CLUSTERED INDEX IX_product_versions ON #product_versions (Product_NK, ValidFrom);
+
+
+---------------------------------------------------------------
+-- 4. Resolve dimension keys once for the window
+--    ShipRegion is free text in the source; only values that are
+--    region ids are looked up (and rejected if unknown).
+---------------------------------------------------------------
+DROP TABLE IF EXISTS #fact_stage;
+
 SELECT
     o.OrderID         AS Order_NK,
     d.ProductID       AS Product_NK,
@@ -86,23 +130,43 @@ SELECT
     d.Quantity,
     d.Discount,
 
-    @SOR_SK,
     d.staging_raw_id_sk,
-    GETDATE()
+    d.SourceFile,
+
+    CASE
+        WHEN o.OrderDay IS NULL THEN 'INVALID_ORDER_DATE'
+        WHEN dc.Customer_SK IS NULL THEN 'MISSING_CUSTOMER'
+        WHEN de.Employee_SK IS NULL THEN 'MISSING_EMPLOYEE'
+        WHEN dp.Product_SK IS NULL THEN 'MISSING_PRODUCT'
+        WHEN ds.Shipper_SK IS NULL THEN 'MISSING_SHIPPER'
+        WHEN dt.Territory_SK IS NULL THEN 'MISSING_TERRITORY'
+        WHEN dr.Region_SK IS NULL AND TRY_CONVERT(INT, o.ShipRegion) IS NOT NULL THEN 'MISSING_REGION'
+    END AS ErrorCode
+
+INTO #fact_stage
 
-FROM @database_name.@schema_name.staging_OrderDetails d
-JOIN @database_name.@schema_name.@staging_table_name o
+FROM @database_name.@schema_name.@details_staging_table d
+JOIN @database_name.@schema_name.@orders_staging_table o
       ON o.OrderID = d.OrderID
-     AND o.OrderDate BETWEEN @start_date AND @end_date
+     AND (o.OrderDay BETWEEN @window_start AND @window_end
+          OR (@with_undated = 1 AND o.OrderDay IS NULL))
+CROSS APPLY (
+    SELECT CASE
+        WHEN @resolve_as_of = 1 THEN ISNULL(TRY_CONVERT(DATETIME, LEFT(o.OrderDate, 19), 120), @current_key_date)
+        ELSE @current_key_date
+    END AS KeyDate
+) k
 
-LEFT JOIN @database_name.@schema_name.DimCustomers dc
-       ON dc.Customer_NK = o.CustomerID AND dc.IsCurrent = 1
+LEFT JOIN #customer_versions dc
+       ON dc.Customer_NK = o.CustomerID
+      AND k.KeyDate >= dc.ValidFrom AND k.KeyDate < dc.ValidTo
 
 LEFT JOIN @database_name.@schema_name.DimEmployees de
        ON de.Employee_NK = o.EmployeeID AND de.IsDeleted = 0
 
-LEFT JOIN @database_name.@schema_name.DimProducts dp
-       ON dp.Product_NK = d.ProductID AND dp.IsCurrent = 1
+LEFT JOIN #product_versions dp
+       ON dp.Product_NK = d.ProductID
+      AND k.KeyDate >= dp.ValidFrom AND k.KeyDate < dp.ValidTo
 
 LEFT JOIN @database_name.@schema_name.DimShippers ds
        ON ds.Shipper_NK = o.ShipVia
@@ -111,4 +175,125 @@ LEFT JOIN @database_name.@schema_name.DimTerritories dt
        ON dt.Territory_NK = o.TerritoryID
 
 LEFT JOIN @database_name.@schema_name.DimRegion dr
-       ON dr.Region_NK = o.ShipRegion;
\ No newline at end of file
+       ON dr.Region_NK = TRY_CONVERT(INT, o.ShipRegion);
+
+
+---------------------------------------------------------------
+-- 5. Delete existing fact and error rows in the window
+---------------------------------------------------------------
+DELETE FROM @database_name.@schema_name.@fact_table_name
+WHERE OrderDay BETWEEN @window_start AND @window_end
+   OR (@with_undated = 1 AND OrderDay IS NULL);
+
+DELETE FROM @database_name.@schema_name.@fact_error_table_name
+WHERE OrderDay BETWEEN @window_start AND @window_end
+   OR (@with_undated = 1 AND OrderDay IS NULL);
+
+
+---------------------------------------------------------------
+-- 6. Valid rows -> fact table
+---------------------------------------------------------------
+INSERT INTO @database_name.@schema_name.@fact_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    RequiredDate,
+    ShippedDate,
+    Freight,
+    UnitPrice,
+    Quantity,
+    Discount,
+    @SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    GETDATE()
+FROM #fact_stage
+WHERE ErrorCode IS NULL;
+
+
+---------------------------------------------------------------
+-- 7. Rejected rows -> error table
+---------------------------------------------------------------
+INSERT INTO @database_name.@schema_name.@fact_error_table_name (
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    ErrorMessage,
+    SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    LoadDate
+)
+SELECT
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    CASE ErrorCode
+        WHEN 'INVALID_ORDER_DATE' THEN 'Missing or invalid OrderDate'
+        WHEN 'MISSING_CUSTOMER' THEN 'Missing Customer_SK'
+        WHEN 'MISSING_EMPLOYEE' THEN 'Missing Employee_SK'
+        WHEN 'MISSING_PRODUCT' THEN 'Missing Product_SK'
+        WHEN 'MISSING_SHIPPER' THEN 'Missing Shipper_SK'
+        WHEN 'MISSING_TERRITORY' THEN 'Missing Territory_SK'
+        WHEN 'MISSING_REGION' THEN 'Missing Region_SK'
+    END,
+    @ERROR_SOR_SK,
+    staging_raw_id_sk,
+    SourceFile,
+    GETDATE()
+FROM #fact_stage
+WHERE ErrorCode IS NOT NULL;
+
+
+---------------------------------------------------------------
+-- 8. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT
+    COUNT(CASE WHEN ErrorCode IS NULL THEN 1 END) AS loaded_rows,
+    COUNT(ErrorCode)                              AS rejected_rows
+FROM #fact_stage;
+
+DROP TABLE #fact_stage;
+DROP TABLE #customer_versions;
+DROP TABLE #product_versions;
@@ -1,34 +1,110 @@
-USE {{database_name}}
+/* ===========================================================
+   update_fact_error.sql
+   ERROR CAPTURE ONLY — FactOrders_Error
+   Standalone re-check of the OrderDate window: rows whose
+   dimension keys do not resolve replace the window's error rows
+   (with @undated = 1 also those of the orders without a parseable
+   OrderDate, which no window covers).
+   The regular fact loads (update_fact.sql / update_factorders.sql)
+   already route rejected rows here in the same pass; this script
+   is for auditing without touching the fact table.
+   =========================================================== */
+
+---------------------------------------------------------------
+-- PARAMETERS
+-- @database_name
+-- @schema_name
+-- @fact_error_table_name
+-- @orders_staging_table
+-- @details_staging_table
+-- @as_of                 (1 = SCD2 keys as of OrderDate, 0 = current versions)
+-- @start_date            (YYYY-MM-DD, inclusive)
+-- @end_date              (YYYY-MM-DD, inclusive)
+-- @undated               (1 = also re-check the orders with a NULL OrderDay)
+---------------------------------------------------------------
+
 
 ---------------------------------------------------------------
 -- 1. Ensure SOR entry exists
 ---------------------------------------------------------------
-IF NOT EXISTS (
+INSERT INTO @database_name.@schema_name.Dim_SOR (SOR_Name)
+SELECT 'FACT_ORDERS_ERROR'
+WHERE NOT EXISTS (
     SELECT 1
-    FROM {{schema_name}}.Dim_SOR
+    FROM @database_name.@schema_name.Dim_SOR
     WHERE SOR_Name = 'FACT_ORDERS_ERROR'
-)
-BEGIN
-    INSERT INTO {{schema_name}}.Dim_SOR (SOR_Name)
-    VALUES ('FACT_ORDERS_ERROR');
-END;
+);
 
 
 ---------------------------------------------------------------
--- 2. Load SOR_SK
+-- 2. Load SOR_SK and the date window
 ---------------------------------------------------------------
 DECLARE @SOR_SK INT;
+DECLARE @window_start DATE = CAST(@start_date AS DATE);
+DECLARE @window_end   DATE = CAST(@end_date AS DATE);
+DECLARE @with_undated BIT  = @undated;
 
 SELECT @SOR_SK = SOR_SK
-FROM {{schema_name}}.Dim_SOR
+FROM @database_name.@schema_name.Dim_SOR
 WHERE SOR_Name = 'FACT_ORDERS_ERROR';
 
 
 ---------------------------------------------------------------
--- 3. Insert missing-dimension errors
+-- 3. Version intervals of the SCD2 dimensions, [ValidFrom, ValidTo)
+--    @as_of = 0: only the current version of each key
+--    @as_of = 1: every version; a key's first version is extended
+--                back to 1900-01-01, so orders older than the first
+--                dimension load still resolve
+--    Keys are looked up at KeyDate: the OrderDate when resolving as
+--    of the order, otherwise (or without an OrderDate) 9999-12-30,
+--    which only a current version covers.
 ---------------------------------------------------------------
+DECLARE @resolve_as_of    BIT      = @as_of;
+DECLARE @current_key_date DATETIME = '9999-12-30';
+
+DROP TABLE IF EXISTS #customer_versions;
+
+SELECT
+    Customer_NK,
+    Customer_SK,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Customer_NK ORDER BY ValidFrom) = 1
+        THEN CAST('1900-01-01' AS DATETIME)
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+INTO #customer_versions
+FROM @database_name.@schema_name.DimCustomers
+WHERE @resolve_as_of = 1 OR IsCurrent = 1;
+
+CREATE CLUSTERED INDEX IX_customer_versions ON #customer_versions (Customer_NK, ValidFrom);
 
-INSERT INTO {{fact_error_table}} (
+DROP TABLE IF EXISTS #product_versions;
+
+SELECT
+    Product_NK,
+    Product_SK,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY Product_NK ORDER BY ValidFrom) = 1
+        THEN CAST('1900-01-01' AS DATETIME)
+        ELSE ValidFrom
+    END AS ValidFrom,
+    ValidTo
+INTO #product_versions
+FROM @database_name.@schema_name.DimProducts
+WHERE @resolve_as_of = 1 OR IsCurrent = 1;
+
+CREATE CLUSTERED INDEX IX_product_versions ON #product_versions (Product_NK, ValidFrom);
+
+
+---------------------------------------------------------------
+-- 4. Replace the window's missing-dimension errors
+---------------------------------------------------------------
+DELETE FROM @database_name.@schema_name.@fact_error_table_name
+WHERE OrderDay BETWEEN @window_start AND @window_end
+   OR (@with_undated = 1 AND OrderDay IS NULL);
+
+INSERT INTO @database_name.@schema_name.@fact_error_table_name (
     Order_NK,
     Product_NK,
     Customer_SK,
@@ -37,62 +113,103 @@ INSERT INTO {{fact_error_table}} (
     Shipper_SK,
     Territory_SK,
     Region_SK,
+    OrderDate,
+    ErrorCode,
     ErrorMessage,
     SOR_SK,
     staging_raw_id_sk,
+    SourceFile,
     LoadDate
 )
 SELECT
-    o.OrderID,
-    d.ProductID,
-
-    dc.Customer_SK,
-    de.Employee_SK,
-    dp.Product_SK,
-    ds.Shipper_SK,
-    dt.Territory_SK,
-    dr.Region_SK,
-
-    CASE 
-         WHEN dc.Customer_SK IS NULL THEN 'Missing Customer_SK'
-         WHEN de.Employee_SK IS NULL THEN 'Missing Employee_SK'
-         WHEN dp.Product_SK IS NULL THEN 'Missing Product_SK'
-         WHEN ds.Shipper_SK IS NULL THEN 'Missing Shipper_SK'
-         WHEN dt.Territory_SK IS NULL THEN 'Missing Territory_SK'
-         WHEN dr.Region_SK IS NULL THEN 'Missing Region_SK'
+    Order_NK,
+    Product_NK,
+    Customer_SK,
+    Employee_SK,
+    Product_SK,
+    Shipper_SK,
+    Territory_SK,
+    Region_SK,
+    OrderDate,
+    ErrorCode,
+    CASE ErrorCode
+        WHEN 'INVALID_ORDER_DATE' THEN 'Missing or invalid OrderDate'
+        WHEN 'MISSING_CUSTOMER' THEN 'Missing Customer_SK'
+        WHEN 'MISSING_EMPLOYEE' THEN 'Missing Employee_SK'
+        WHEN 'MISSING_PRODUCT' THEN 'Missing Product_SK'
+        WHEN 'MISSING_SHIPPER' THEN 'Missing Shipper_SK'
+        WHEN 'MISSING_TERRITORY' THEN 'Missing Territory_SK'
+        WHEN 'MISSING_REGION' THEN 'Missing Region_SK'
     END,
-
     @SOR_SK,
-    d.staging_raw_id_sk,
+    staging_raw_id_sk,
+    SourceFile,
     GETDATE()
+FROM (
+    SELECT
+        o.OrderID   AS Order_NK,
+        d.ProductID AS Product_NK,
+
+        dc.Customer_SK,
+        de.Employee_SK,
+        dp.Product_SK,
+        ds.Shipper_SK,
+        dt.Territory_SK,
+        dr.Region_SK,
+
+        o.OrderDate,
+        d.staging_raw_id_sk,
+        d.SourceFile,
+
+        CASE
+            WHEN o.OrderDay IS NULL THEN 'INVALID_ORDER_DATE'
+            WHEN dc.Customer_SK IS NULL THEN 'MISSING_CUSTOMER'
+            WHEN de.Employee_SK IS NULL THEN 'MISSING_EMPLOYEE'
+            WHEN dp.Product_SK IS NULL THEN 'MISSING_PRODUCT'
+            WHEN ds.Shipper_SK IS NULL THEN 'MISSING_SHIPPER'
+            WHEN dt.Territory_SK IS NULL THEN 'MISSING_TERRITORY'
+            WHEN dr.Region_SK IS NULL AND TRY_CONVERT(INT, o.ShipRegion) IS NOT NULL THEN 'MISSING_REGION'
+        END AS ErrorCode
+
+    FROM @database_name.@schema_name.@details_staging_table d
+    JOIN @database_name.@schema_name.@orders_staging_table o
+          ON o.OrderID = d.OrderID
+         AND (o.OrderDay BETWEEN @window_start AND @window_end
+              OR (@with_undated = 1 AND o.OrderDay IS NULL))
+    CROSS APPLY (
+        SELECT CASE
+            WHEN @resolve_as_of = 1 THEN ISNULL(TRY_CONVERT(DATETIME, LEFT(o.OrderDate, 19), 120), @current_key_date)
+            ELSE @current_key_date
+        END AS KeyDate
+    ) k
+
+    LEFT JOIN #customer_versions dc
+           ON dc.Customer_NK = o.CustomerID
+          AND k.KeyDate >= dc.ValidFrom AND k.KeyDate < dc.ValidTo
+
+    LEFT JOIN @database_name.@schema_name.DimEmployees de
+           ON de.Employee_NK = o.EmployeeID AND de.IsDeleted = 0
+
+    LEFT JOIN #product_versions dp
+           ON dp.Product_NK = d.ProductID
+          AND k.KeyDate >= dp.ValidFrom AND k.KeyDate < dp.ValidTo
+
+    LEFT JOIN @database_name.@schema_name.DimShippers ds
+           ON ds.Shipper_NK = o.ShipVia
+
+    LEFT JOIN @database_name.@schema_name.DimTerritories dt
+           ON dt.Territory_NK = o.TerritoryID
+
+    LEFT JOIN @database_name.@schema_name.DimRegion dr
+           ON dr.Region_NK = TRY_CONVERT(INT, o.ShipRegion)
+) resolved
+WHERE ErrorCode IS NOT NULL;
 
-FROM {{schema_name}}.staging_OrderDetails d
-JOIN {{staging_table_name}} o
-    ON o.OrderID = d.OrderID
-    AND o.OrderDate BETWEEN '{{start_date}}' AND '{{end_date}}'
-
-LEFT JOIN {{schema_name}}.DimCustomers dc
-    ON dc.Customer_NK = o.CustomerID AND dc.IsCurrent = 1
-
-LEFT JOIN {{schema_name}}.DimEmployees de
-    ON de.Employee_NK = o.EmployeeID AND de.IsDeleted = 0
-
-LEFT JOIN {{schema_name}}.DimProducts dp
-    ON dp.Product_NK = d.ProductID AND dp.IsCurrent = 1
 
-LEFT JOIN {{schema_name}}.DimShippers ds
-    ON ds.Shipper_NK = o.ShipVia
-
-LEFT JOIN {{schema_name}}.DimTerritories dt
-    ON dt.Territory_NK = o.TerritoryID
-
-LEFT JOIN {{schema_name}}.DimRegion dr
-    ON dr.Region_NK = o.ShipRegion
+---------------------------------------------------------------
+-- 5. Row counts for the pipeline log
+---------------------------------------------------------------
+SELECT @@ROWCOUNT AS rejected_rows;
 
-WHERE 
-      dc.Customer_SK IS NULL
-   OR de.Employee_SK IS NULL
-   OR dp.Product_SK IS NULL
-   OR ds.Shipper_SK IS NULL
-   OR dt.Territory_SK IS NULL
-   OR dr.Region_SK IS NULL;
+DROP TABLE #customer_versions;
+DROP TABLE #product_versions;
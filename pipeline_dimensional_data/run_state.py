@@ -0,0 +1,145 @@
+"""
+run_state.py
+Persisted run state, so a failed pipeline run can be resumed.
+
+DimensionalDataFlow keeps one JSON file per execution_id in RUN_STATE_DIR
+(config.py) and rewrites it whenever a task finishes. Per task it records
+whether the task completed and a fingerprint of the task's inputs.
+`main.py --resume <execution_id>` runs that execution again with its
+original dates (or backfill ranges) and workbook; tasks that completed on
+the same inputs are skipped, so the run restarts at its first incomplete
+task.
+
+A task's input fingerprint covers its arguments, the backend, the schema
+version and the fingerprints of its upstream tasks; the staging load also
+covers the SHA-256 of its source workbook(s). If a workbook changed since
+the failed run, staging and everything downstream of it run again.
+
+Run state layout:
+    {
+      "execution_id": "...",
+      "status": "running" | "succeeded" | "failed",
+      "start_date": "1996-01-01", "end_date": "1998-12-31",
+      "source_path": null,
+      "backend": "sqlserver", "backend_options": {},
+      "database": "sqlserver:<server>/ORDER_DDS",
+      "backfill": null | {"ranges": [[start, end], ...], "partition": "month", "max_workers": 4},
+      "created": "2026-01-01T10:00:00", "updated": "...",
+      "tasks": {
+        "task_populate_staging": {
+          "success": true,
+          "skipped": false,
+          "input_fingerprint": "<sha256>",
+          "finished": "2026-01-01T10:00:12",
+          "message": null
+        },
+        ...
+      }
+    }
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+def input_fingerprint(inputs) -> str:
+    """SHA-256 of a JSON-serializable description of a task's inputs."""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def run_state_path(state_dir: str, execution_id: str) -> str:
+    if not execution_id or os.path.basename(execution_id) != execution_id:
+        raise ValueError(f"Invalid execution_id: {execution_id!r}")
+    return os.path.join(state_dir, f"{execution_id}.json")
+
+
+def prune_run_states(state_dir: str, keep: int):
+    """Delete all but the `keep` most recently updated run state files."""
+    try:
+        names = [name for name in os.listdir(state_dir) if name.endswith(".json")]
+    except FileNotFoundError:
+        return
+    paths = sorted((os.path.join(state_dir, name) for name in names), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class RunState:
+    """The recorded state of one execution_id; record() is thread-safe."""
+
+    def __init__(self, state_dir: str, execution_id: str, state: dict = None):
+        self.path = run_state_path(state_dir, execution_id)
+        self.state = state or {"execution_id": execution_id, "tasks": {}}
+        self.state.setdefault("tasks", {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, state_dir: str, execution_id: str):
+        """Return the recorded RunState of `execution_id`, or None if there is none."""
+        try:
+            with open(run_state_path(state_dir, execution_id), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(state_dir, execution_id, state)
+
+    @property
+    def start_date(self):
+        return self.state.get("start_date")
+
+    @property
+    def end_date(self):
+        return self.state.get("end_date")
+
+    @property
+    def source_path(self):
+        return self.state.get("source_path")
+
+    def completed(self, task_name: str, fingerprint: str) -> bool:
+        """True if the task completed earlier on inputs with the same fingerprint."""
+        task = self.state["tasks"].get(task_name)
+        return bool(task and task.get("success") and task.get("input_fingerprint") == fingerprint)
+
+    def start(self, **run_info):
+        """Record the run parameters (dates, workbook, backend) and mark the run as running."""
+        with self._lock:
+            self.state.update(run_info)
+            self.state["status"] = "running"
+            self.state.setdefault("created", time.strftime("%Y-%m-%dT%H:%M:%S"))
+            self._save()
+
+    def record(self, task_name: str, result: dict, fingerprint: str):
+        """Record a finished (succeeded, failed or skipped) task."""
+        if result.get("resumed"):
+            # completed in an earlier attempt; keep that record
+            return
+        with self._lock:
+            self.state["tasks"][task_name] = {
+                "success": result.get("success", False),
+                "skipped": result.get("skipped", False),
+                "input_fingerprint": fingerprint,
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "message": None if result.get("success") else result.get("message"),
+            }
+            self._save()
+
+    def finish(self, success: bool):
+        with self._lock:
+            self.state["status"] = "succeeded" if success else "failed"
+            self._save()
+
+    def _save(self):
+        """Atomically write the state file (temp file + rename)."""
+        self.state["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True, default=str)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,190 @@
+"""
+service.py
+Long-running pipeline service (`main.py --watch`).
+
+A cold `python main.py` pays for its imports, connection setup and SQL
+template parsing on every run. PipelineService stays up instead:
+  - warm() opens the connection pool's connections and compiles the
+    active backend's SQL templates once; later runs reuse both
+    (load_sql_template re-parses a script only when its file changes)
+  - the watched workbook, or every .xlsx in a watched drop directory, is
+    polled for (mtime, size) changes every WATCH_POLL_INTERVAL seconds
+  - a changed file that stays unchanged for WATCH_DEBOUNCE seconds (so a
+    workbook still being copied is not read half-written) triggers one
+    DimensionalDataFlow run with that file as its source
+
+Runs are sequential: a change seen while a run is busy is picked up by
+the next scan. Staging fingerprints (STAGING_SKIP_UNCHANGED) keep a
+small edit cheap, since only the sheets that changed are reloaded.
+"""
+
+import os
+import sys
+import time
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils import load_sql_template
+from etl_logging import get_pipeline_logger
+
+from pipeline_dimensional_data.config import (
+    FLOW_MAX_WORKERS,
+    WATCH_POLL_INTERVAL,
+    WATCH_DEBOUNCE,
+)
+from pipeline_dimensional_data.backends import get_backend
+from pipeline_dimensional_data.flow import DimensionalDataFlow
+from pipeline_dimensional_data.tasks import SOURCE_PATH, source_workbooks
+
+SQL_DIRS = [
+    os.path.join(PROJECT_ROOT, "infrastructure_initiation"),
+    os.path.join(PROJECT_ROOT, "pipeline_dimensional_data", "queries"),
+]
+
+
+def _signature(path: str):
+    """(mtime_ns, size) of a file, or None if it is gone."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PipelineService:
+    def __init__(self, start_date, end_date, watch_path=SOURCE_PATH,
+                 poll_interval=WATCH_POLL_INTERVAL, debounce=WATCH_DEBOUNCE,
+                 max_workers=FLOW_MAX_WORKERS):
+        """
+        Args:
+            start_date, end_date (str): fact window of every run (YYYY-MM-DD)
+            watch_path (str): workbook to watch, or a drop directory whose
+                              .xlsx files are each loaded when they change
+            poll_interval (float): seconds between scans
+            debounce (float): seconds a change must be stable before a run
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.watch_path = watch_path
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_workers = max_workers
+        self.runs = 0
+        self._seen = {}       # path -> signature of the last run (or of the startup scan)
+        self._pending = {}    # path -> (signature, first seen, last changed)
+        self._stop = threading.Event()
+
+    def warm(self) -> dict:
+        """
+        Open the pool's connections and compile every SQL template of the
+        active backend, so the first triggered run starts warm.
+        """
+        started = time.perf_counter()
+        backend = get_backend()
+
+        pool = backend.pool()
+        connections = [pool.acquire() for _ in range(self.max_workers)]
+        for conn in connections:
+            pool.release(conn)
+
+        templates = 0
+        for sql_dir in SQL_DIRS:
+            for name in sorted(os.listdir(sql_dir)):
+                if not name.endswith(".sql"):
+                    continue
+                try:
+                    load_sql_template(backend.script_path(os.path.join(sql_dir, name)))
+                except FileNotFoundError:
+                    # no port of this script for the backend; tasks report it if they need it
+                    continue
+                templates += 1
+
+        import openpyxl  # noqa: F401 (imported once here instead of inside the first run)
+
+        stats = {
+            "connections": len(connections),
+            "templates": templates,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        get_pipeline_logger().info(f"Service warmed | connections={stats['connections']} "
+                                   f"templates={stats['templates']} in {stats['seconds']}s",
+                                   extra={"execution_id": "service"})
+        return stats
+
+    def watched_files(self) -> list:
+        """The watched workbook, or the .xlsx files of the watched directory."""
+        if not os.path.isdir(self.watch_path):
+            return [self.watch_path]
+        # skips Excel lock files (~$book.xlsx) and hidden temp files
+        return source_workbooks(self.watch_path)
+
+    def scan(self, now=None) -> list:
+        """
+        Compare every watched file with its last signature and return the
+        files whose change has been stable for `debounce` seconds, with
+        the time the change was first seen.
+
+        Returns:
+            list: [(path, signature, first seen)]
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        for path in self.watched_files():
+            signature = _signature(path)
+            if signature is None or signature == self._seen.get(path):
+                self._pending.pop(path, None)
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None:
+                self._pending[path] = (signature, now, now)
+            elif pending[0] != signature:
+                # still being written; wait until it settles
+                self._pending[path] = (signature, pending[1], now)
+            elif now - pending[2] >= self.debounce:
+                ready.append((path, signature, pending[1]))
+        return ready
+
+    def run_once(self, path: str) -> dict:
+        """Run the pipeline on one workbook."""
+        pipeline = DimensionalDataFlow(source_path=path)
+        return pipeline.exec(self.start_date, self.end_date, max_workers=self.max_workers)
+
+    def serve(self, max_runs=None, catch_up=False):
+        """
+        Watch until stop() is called (or `max_runs` runs finished).
+
+        Files present at startup count as already loaded unless
+        `catch_up` is set, in which case they are loaded first.
+        """
+        if not catch_up:
+            for path in self.watched_files():
+                self._seen[path] = _signature(path)
+
+        print(f"Watching {self.watch_path} (poll={self.poll_interval}s, debounce={self.debounce}s)")
+        while not self._stop.is_set():
+            for path, signature, first_seen in self.scan():
+                trigger_seconds = time.monotonic() - first_seen
+                self._pending.pop(path, None)
+                # recorded before the run, so a failed run is not retried until the file changes again
+                self._seen[path] = signature
+
+                result = self.run_once(path)
+                self.runs += 1
+                status = "ok" if result["success"] else "FAILED"
+                print(f"Run {self.runs}: {path} {status} | trigger {trigger_seconds:.3f}s "
+                      f"wall {result['timings']['wall_seconds']}s | execution_id={result['execution_id']}")
+                if not result["success"]:
+                    print(f"Resume with: python main.py --resume={result['execution_id']}")
+
+                if max_runs is not None and self.runs >= max_runs:
+                    self.stop()
+                if self._stop.is_set():
+                    break
+            self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        """Ask serve() to return after the current run (safe from signal handlers and other threads)."""
+        self._stop.set()
@@ -0,0 +1,240 @@
+"""
+staging_validation.py
+Typed validation of staging rows before they are inserted
+(STAGING_VALIDATION = True in config.py).
+
+The column types of each staging table are read from its CREATE TABLE
+statement in infrastructure_initiation/staging_raw_table_creation.sql.
+Every batch of sheet rows becomes a pandas DataFrame, and each column is
+coerced and checked in one vectorized pass:
+  - INT / BIGINT / SMALLINT / TINYINT: numeric text is coerced ("12" -> 12);
+    values that are not whole numbers or are out of range are rejected
+  - FLOAT / REAL / DECIMAL / NUMERIC: numeric text is coerced; other
+    values are rejected
+  - NVARCHAR(n) / VARCHAR(n) / NCHAR(n) / CHAR(n): text longer than n
+    characters is rejected (MAX is unbounded)
+  - date columns (DATE_COLUMNS, staged as text): anything but an ISO date
+    or datetime on a real calendar day is rejected, so no order reaches
+    staging_Orders with an OrderDay that does not convert
+  - blank text in a numeric or date column becomes NULL
+Other values pass through unchanged. Rejected rows are appended to
+STAGING_REJECTS_PATH as JSON lines with their sheet row, values and the
+reasons; the rest of the batch is inserted.
+
+pandas and NumPy are optional dependencies, only needed for validation.
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+# optional, imported on first use by _require_pandas: only validation needs them
+np = pd = None
+
+from etl_logging import EXECUTION_ID
+from pipeline_dimensional_data.config import STAGING_REJECTS_PATH
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGING_DDL_PATH = os.path.join(PROJECT_ROOT, "infrastructure_initiation", "staging_raw_table_creation.sql")
+
+# columns the loader fills itself, not read from the sheet
+LOADER_COLUMNS = ("SourceFile",)
+
+INTEGER_RANGES = {
+    "TINYINT": (0, 2 ** 8 - 1),
+    "SMALLINT": (-2 ** 15, 2 ** 15 - 1),
+    "INT": (-2 ** 31, 2 ** 31 - 1),
+    "BIGINT": (-2 ** 63, 2 ** 63 - 1),
+}
+DECIMAL_TYPES = ("FLOAT", "REAL", "DECIMAL", "NUMERIC")
+TEXT_TYPES = ("NVARCHAR", "VARCHAR", "NCHAR", "CHAR")
+
+# text columns that hold dates, as iter_sheet_rows stages them ("1996-07-04 00:00:00")
+DATE_COLUMNS = ("OrderDate", "RequiredDate", "ShippedDate", "BirthDate", "HireDate")
+_ISO_DATE_PATTERN = r"\d{4}-\d{2}-\d{2}(?: (?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d+)?)?"
+
+_TABLE_PATTERN = re.compile(r"CREATE TABLE (\w+)\s*\((.*?)\n\);", re.DOTALL)
+_COLUMN_PATTERN = re.compile(r"^\s*(\w+)\s+(\w+)(?:\s*\(\s*(\w+)(?:\s*,\s*\d+)?\s*\))?")
+
+_rejects_lock = threading.Lock()
+
+
+def _require_pandas():
+    global np, pd
+    if pd is None or np is None:
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "STAGING_VALIDATION = True needs pandas and numpy "
+                "(pip install pandas numpy)"
+            )
+
+
+def _texts(values):
+    """The str values of an object column (the .str accessor rejects columns without any)."""
+    return values[values.map(type).eq(str)].astype(str)
+
+
+@lru_cache(maxsize=4)
+def _parse_staging_schema(path: str, mtime_ns: int) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        ddl = f.read()
+
+    schema = {}
+    for table_name, body in _TABLE_PATTERN.findall(ddl):
+        columns = []
+        for line in body.splitlines():
+            match = _COLUMN_PATTERN.match(line)
+            if not match or "IDENTITY" in line.upper():
+                continue
+            name, sql_type, length = match.groups()
+            # computed columns (name AS expression) are not inserted
+            if name in LOADER_COLUMNS or sql_type.upper() == "AS":
+                continue
+            length = int(length) if length and length.isdigit() else None
+            columns.append((name, sql_type.upper(), length))
+        schema[table_name] = columns
+    return schema
+
+
+def load_staging_schema(path: str = STAGING_DDL_PATH) -> dict:
+    """
+    Column types of every staging table, parsed from its DDL script (cached
+    until the file changes). The IDENTITY key, computed columns and the
+    loader's own columns are left out, so the columns line up with the sheet's.
+
+    Returns:
+        dict: {table_name: [(column, SQL type, length or None)]}
+    """
+    return _parse_staging_schema(path, os.stat(path).st_mtime_ns)
+
+
+def write_rejects(records, path: str = STAGING_REJECTS_PATH):
+    """Append rejected rows as JSON lines."""
+    if not records:
+        return
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _rejects_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class StagingValidator:
+    """
+    Validates the rows of one sheet against the typed columns of its
+    staging table; `rejected` counts the rows diverted to the rejects file.
+    """
+
+    def __init__(self, table_name, sheet_name=None, source_file=None,
+                 rejects_path=STAGING_REJECTS_PATH, schema=None):
+        _require_pandas()
+        schema = load_staging_schema() if schema is None else schema
+        if table_name not in schema:
+            raise ValueError(f"No CREATE TABLE for {table_name} in {os.path.basename(STAGING_DDL_PATH)}")
+        self.table_name = table_name
+        self.sheet_name = sheet_name
+        self.source_file = source_file
+        self.rejects_path = rejects_path
+        self.columns = schema[table_name]
+        self.rejected = 0
+
+    def filter(self, numbered_rows, num_cols: int, batch_size: int):
+        """
+        Yield the valid, coerced rows of (sheet row, values) pairs,
+        validating `batch_size` rows at a time.
+        """
+        if num_cols != len(self.columns):
+            raise ValueError(
+                f"Sheet {self.sheet_name} has {num_cols} columns, "
+                f"{self.table_name} defines {len(self.columns)}"
+            )
+
+        batch = []
+        for item in numbered_rows:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield from self._validate_batch(batch)
+                batch = []
+        if batch:
+            yield from self._validate_batch(batch)
+
+    def _validate_batch(self, batch) -> list:
+        """Coerce one batch column by column; write its rejects and return the valid rows."""
+        names = [name for name, _, _ in self.columns]
+        frame = pd.DataFrame([values for _, values in batch], columns=names, dtype=object)
+        errors = pd.Series([""] * len(frame), index=frame.index, dtype=object)
+
+        for name, sql_type, length in self.columns:
+            values = frame[name]
+            texts = _texts(values)
+            if name in DATE_COLUMNS:
+                blank = texts.str.strip().eq("").reindex(values.index, fill_value=False)
+                present = values.notna() & ~blank
+                iso = texts.where(texts.str.fullmatch(_ISO_DATE_PATTERN))
+                days = pd.to_datetime(iso.str[:10], format="%Y-%m-%d", errors="coerce")
+                not_date = present & ~days.notna().reindex(values.index, fill_value=False)
+                errors = self._add_error(errors, not_date, f"{name}: not an ISO date")
+                frame[name] = values.where(present, None)
+
+            if sql_type in INTEGER_RANGES or sql_type in DECIMAL_TYPES:
+                blank = texts.str.strip().eq("").reindex(values.index, fill_value=False)
+                present = values.notna() & ~blank
+                numbers = pd.to_numeric(values.where(present), errors="coerce")
+
+                if sql_type in INTEGER_RANGES:
+                    low, high = INTEGER_RANGES[sql_type]
+                    not_number = present & (numbers.isna() | (numbers % 1 != 0))
+                    out_of_range = present & ~not_number & ((numbers < low) | (numbers > high))
+                    errors = self._add_error(errors, not_number, f"{name}: not an integer")
+                    errors = self._add_error(errors, out_of_range, f"{name}: out of {sql_type} range")
+                    valid = present & ~not_number & ~out_of_range
+                    coerced = numbers.where(valid).astype("Int64").astype(object)
+                else:
+                    not_number = present & ~np.isfinite(numbers.astype(float))
+                    errors = self._add_error(errors, not_number, f"{name}: not a number")
+                    valid = present & ~not_number
+                    coerced = numbers.astype(object)
+
+                frame[name] = coerced.where(valid, None)
+
+            elif sql_type in TEXT_TYPES and length is not None:
+                too_long = texts.str.len().gt(length).reindex(values.index, fill_value=False)
+                errors = self._add_error(errors, too_long, f"{name}: longer than {length} characters")
+
+        rejected = errors.ne("")
+        if rejected.any():
+            self._reject(batch, errors, rejected)
+        return list(frame[~rejected].itertuples(index=False, name=None))
+
+    @staticmethod
+    def _add_error(errors, mask, reason):
+        """Append `reason` to the error text of the rows in `mask`."""
+        if not mask.any():
+            return errors
+        return errors.where(~mask, errors + reason + "; ")
+
+    def _reject(self, batch, errors, rejected):
+        names = [name for name, _, _ in self.columns]
+        rejected_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        execution_id = EXECUTION_ID.get()
+        records = [
+            {
+                "execution_id": execution_id,
+                "rejected_at": rejected_at,
+                "table": self.table_name,
+                "source_file": self.source_file,
+                "sheet": self.sheet_name,
+                "row": batch[position][0],
+                "errors": errors.iat[position].rstrip("; ").split("; "),
+                "values": dict(zip(names, batch[position][1])),
+            }
+            for position in np.flatnonzero(rejected.to_numpy())
+        ]
+        write_rejects(records, self.rejects_path)
+        self.rejected += len(records)
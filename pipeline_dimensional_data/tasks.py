@@ -10,72 +10,284 @@ Each task:
 
 import os
 import sys
-import openpyxl
-
-from pipeline_dimensional_data.config import database_name, schema_name
+import glob
+import time
+import pickle
+import tempfile
+import threading
+import contextvars
+import multiprocessing
+from itertools import islice
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from pipeline_dimensional_data.config import (
+    database_name,
+    schema_name,
+    STAGING_BATCH_SIZE,
+    STAGING_MAX_WORKERS,
+    STAGING_PARSE_PROCESSES,
+    FACT_TABLE,
+    FACT_ERROR_TABLE,
+    STAGING_FACT_TABLE,
+    STAGING_FACT_DETAILS_TABLE,
+    AGG_DAY_CUSTOMER_TABLE,
+    AGG_PRODUCT_MONTH_TABLE,
+    AGG_EMPLOYEE_TERRITORY_MONTH_TABLE,
+    FACT_LOAD_MODE,
+    FACT_ASSEMBLY_ENGINE,
+    FACT_KEY_RESOLUTION,
+    FACT_BACKFILL_PARTITION,
+    FACT_BACKFILL_MAX_WORKERS,
+    FACT_BACKFILL_RETRIES,
+    FACT_BACKFILL_RETRY_BACKOFF,
+    REFRESH_STATISTICS,
+    STAGING_SKIP_UNCHANGED,
+    STAGING_FINGERPRINT_PATH,
+    STAGING_VALIDATION,
+    STAGING_REJECTS_PATH,
+    SCHEMA_VERSION,
+    SQL_TRANSACTION_MODE,
+    SQL_SAVEPOINTS,
+    SQL_ISOLATION_LEVEL,
+    SQL_LOCK_TIMEOUT
+)
+from pipeline_dimensional_data.backends import get_backend
+from pipeline_dimensional_data.fact_assembly import assemble_fact_orders
+from pipeline_dimensional_data.staging_validation import StagingValidator
+from pipeline_dimensional_data.fingerprints import (
+    load_manifest,
+    save_manifest,
+    invalidate_manifest,
+    manifest_path,
+    table_fingerprint,
+    file_fingerprint,
+    RowsFingerprint
+)
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from utils import (
-    load_db_config,
-    create_db_connection,
-    read_sql_file,
-    render_sql,
-    execute_sql
-)
+from utils import load_sql_template
 
 
 # ==============================================================
 # Helper — run a single parametrized SQL script
 # ==============================================================
 
-def run_sql_task(sql_path: str, params: dict) -> dict:
+def run_sql_task(sql_path: str, params: dict, bind_params: dict = None,
+                 transaction: str = SQL_TRANSACTION_MODE, savepoints: bool = SQL_SAVEPOINTS) -> dict:
     """
     Execute a parametrized SQL script.
     Handles:
-      - @parameter substitution
-      - splitting batches by GO
-      - atomicity
+      - @parameter substitution (identifiers, from `params`)
+      - ODBC bind parameters (data values such as dates, from `bind_params`)
+      - splitting batches by GO (parsed once per file, see utils.load_sql_template)
+      - atomicity:
+          transaction="task"  — all batches in one transaction, one commit;
+                                any failure rolls the whole script back
+          transaction="batch" — commit after every batch (e.g. DDL that
+                                cannot run inside a transaction)
+        With `savepoints` (task mode) a failed batch is rolled back to its
+        savepoint and the batches before it are committed.
+        Isolation level and lock timeout: SQL_ISOLATION_LEVEL / SQL_LOCK_TIMEOUT.
+    Runs on a connection borrowed from the shared pool, through the configured
+    backend (which swaps in its own port of the script, see backends.py).
+
+    If the script ends with a single-row SELECT (e.g. inserted / updated /
+    unchanged counts), that row is returned under "counts".
+
+    Timing and row counts are returned under "metrics":
+        connect_seconds, execute_seconds, commit_seconds, commits, rows_affected,
+        batches: [{"batch": n, "rows_affected": n, "seconds": s}]
     """
+    if transaction not in ("task", "batch"):
+        return {"success": False, "message": f"Unknown transaction mode: {transaction}"}
+    savepoints = savepoints and transaction == "task"
+
+    metrics = {"connect_seconds": 0.0, "execute_seconds": 0.0, "commit_seconds": 0.0, "commits": 0,
+               "rows_affected": 0, "batches": []}
+
+    def _commit(conn):
+        started = time.perf_counter()
+        conn.commit()
+        metrics["commit_seconds"] += time.perf_counter() - started
+        metrics["commits"] += 1
+
     try:
-        cfg = load_db_config()
-        conn = create_db_connection(cfg)
+        backend = get_backend()
+        batches = load_sql_template(backend.script_path(sql_path)).render(params, bind_params)
+
+        output = []
+        pool = backend.pool()
+
+        started = time.perf_counter()
+        with pool.connection() as conn:
+            metrics["connect_seconds"] = round(time.perf_counter() - started, 4)
+            backend.set_session(conn, SQL_ISOLATION_LEVEL, SQL_LOCK_TIMEOUT, xact_abort=not savepoints)
+
+            number = 0
+            try:
+                for number, (batch, values) in enumerate(batches, start=1):
+                    if savepoints:
+                        backend.savepoint(conn, f"batch_{number}")
+                    rowcounts = []
+                    batch_started = time.perf_counter()
+                    rows = backend.execute(conn, batch, rowcounts=rowcounts, params=values, commit=False)
+                    batch_seconds = time.perf_counter() - batch_started
+
+                    metrics["execute_seconds"] += batch_seconds
+                    metrics["rows_affected"] += sum(rowcounts)
+                    metrics["batches"].append({
+                        "batch": number,
+                        "rows_affected": sum(rowcounts),
+                        "seconds": round(batch_seconds, 4),
+                    })
+                    if rows:
+                        output = rows
+                    if transaction == "batch":
+                        _commit(conn)
+
+                if transaction == "task":
+                    _commit(conn)
+
+            except Exception as e:
+                kept = _undo_failed_batch(backend, conn, number if savepoints else None)
+                if not kept:
+                    raise
+                _commit(conn)
+                raise RuntimeError(f"{e} (batch {number} rolled back to its savepoint, "
+                                   f"batches 1-{kept} committed)")
+
+        metrics["execute_seconds"] = round(metrics["execute_seconds"], 4)
+        metrics["commit_seconds"] = round(metrics["commit_seconds"], 4)
+        result = {"success": True, "metrics": metrics}
+        if len(output) == 1:
+            result["counts"] = output[0]
+        return result
 
-        sql_text = read_sql_file(sql_path)
-        sql_rendered = render_sql(sql_text, params)
+    except Exception as e:
+        return {"success": False, "message": str(e), "metrics": metrics}
 
-        # split into batches
-        batches = [
-            batch.strip() for batch in sql_rendered.split("\nGO")
-            if batch.strip()
-        ]
 
-        for batch in batches:
-            execute_sql(conn, batch)
+def _undo_failed_batch(backend, conn, savepoint_batch=None) -> int:
+    """
+    Roll back after a failed batch. With a savepoint (`savepoint_batch` is
+    the failed batch's number) only that batch is undone, and the number of
+    earlier batches still in the transaction is returned. Otherwise, or if
+    the error left no partial rollback possible, everything is rolled back
+    and 0 is returned.
+    """
+    if savepoint_batch and savepoint_batch > 1:
+        try:
+            backend.rollback_to_savepoint(conn, f"batch_{savepoint_batch}")
+            return savepoint_batch - 1
+        except Exception:
+            pass
+    conn.rollback()
+    return 0
+
+
+def merge_metrics(total: dict, part: dict) -> dict:
+    """Add the metrics of one run_sql_task call into a running total."""
+    if not part:
+        return total
+    for key in ("connect_seconds", "execute_seconds", "commit_seconds", "commits", "rows_affected"):
+        total[key] = round(total.get(key, 0) + part.get(key, 0), 4)
+    total.setdefault("batches", []).extend(part.get("batches", []))
+    return total
+
+
+def refresh_statistics(table_names) -> dict:
+    """
+    Refresh optimizer statistics (UPDATE STATISTICS / ANALYZE) for freshly loaded
+    tables, so the next stage's joins are planned against current row counts.
+    """
+    if not REFRESH_STATISTICS:
+        return {"success": True, "message": "Statistics refresh disabled"}
 
-        conn.close()
+    try:
+        backend = get_backend()
+        with backend.pool().connection() as conn:
+            for table_name in table_names:
+                backend.execute(conn, backend.update_statistics_sql(table_name))
         return {"success": True}
 
     except Exception as e:
         return {"success": False, "message": str(e)}
 
 
-def task_initialize_dimensional_db(prereq=None) -> dict:
+def _with_statistics(result: dict, table_names) -> dict:
+    """Refresh statistics after a successful load; a failed refresh does not fail the load."""
+    if result.get("success"):
+        stats_result = refresh_statistics(table_names)
+        result["statistics"] = stats_result
+        if not stats_result.get("success"):
+            print(f"Statistics refresh failed for {', '.join(table_names)}: {stats_result.get('message')}")
+    return result
+
+
+def get_applied_schema_version():
+    """Return the highest version recorded in dbo.SchemaVersion, or None."""
+    sql_path = os.path.join(PROJECT_ROOT, "infrastructure_initiation", "schema_version_check.sql")
+    result = run_sql_task(sql_path, {"database_name": database_name, "schema_name": schema_name})
+    if not result.get("success"):
+        raise RuntimeError(f"Schema version check failed: {result.get('message')}")
+    return (result.get("counts") or {}).get("schema_version")
+
+
+def task_initialize_dimensional_db(prereq=None, force=False) -> dict:
+    """
+    Versioned, idempotent bootstrap.
+
+    When ORDER_DDS already records SCHEMA_VERSION the DDL is skipped
+    entirely. Otherwise every script runs (each one only creates missing
+    objects and upgrades older ones, nothing is dropped) and the version
+    is recorded. `force=True` re-applies the scripts regardless.
+    """
+    try:
+        applied_version = get_applied_schema_version()
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+    if not force and applied_version is not None and applied_version >= SCHEMA_VERSION:
+        print(f"Schema version {applied_version} already applied, skipping DDL")
+        return {
+            "success": True,
+            "message": f"Schema version {applied_version} already applied",
+            "schema_version": applied_version,
+            "ddl_applied": False,
+        }
+
     sql_files = [
         ("infrastructure_initiation/dimensional_db_creation.sql", "dimensional_db_creation.sql"),
         ("infrastructure_initiation/staging_raw_table_creation.sql", "staging_raw_table_creation.sql"),
         ("infrastructure_initiation/dimensional_db_table_creation.sql", "dimensional_db_table_creation.sql"),
+        ("infrastructure_initiation/dimensional_db_index_creation.sql", "dimensional_db_index_creation.sql"),
+        ("infrastructure_initiation/schema_version_record.sql", "schema_version_record.sql"),
     ]
+    params = {"database_name": database_name, "schema_name": schema_name}
 
+    metrics = {}
     for rel_path, label in sql_files:
         sql_path = os.path.join(PROJECT_ROOT, rel_path)
         print(f"Running {label}...")
-        result = run_sql_task(sql_path, {"database_name": database_name, "schema_name": schema_name})
+        # batch mode: CREATE DATABASE and friends cannot run inside a user transaction
+        result = run_sql_task(sql_path, params, {"schema_version": SCHEMA_VERSION}, transaction="batch")
+        merge_metrics(metrics, result.get("metrics"))
         if not result.get("success"):
-            return {"success": False, "message": f"{label} failed: {result.get('message')}"}
+            return {"success": False, "message": f"{label} failed: {result.get('message')}", "metrics": metrics}
+
+    # the database may have been (re)created — cached sheet fingerprints no longer apply
+    invalidate_manifest(staging_manifest_path())
 
-    return {"success": True, "message": "Dimensional database initialized"}
+    return {
+        "success": True,
+        "message": f"Schema version {SCHEMA_VERSION} applied",
+        "schema_version": SCHEMA_VERSION,
+        "ddl_applied": True,
+        "metrics": metrics,
+    }
 
 # ==============================================================
 # 1. Create Dimensional Tables
@@ -96,177 +308,419 @@ def task_create_dimensional_tables(prereq=None) -> dict:
 # Dimensional Load Tasks (SCD1 / SCD2 / SCD3 / SCD4)
 # ==============================================================
 
-def task_update_dim_categories(prereq=None) -> dict:
+def _run_dim_task(prereq, sql_file, dim_table_name, staging_table_name) -> dict:
+    """
+    Run one update_dim_*.sql script and refresh the dimension's statistics.
+
+    Each script compares a row hash of the tracked attributes, skips unchanged
+    rows before its MERGE and reports inserted / updated / unchanged counts.
+    """
     if prereq and not prereq.get("success"):
         return {"success": False, "message": "Prerequisite failed"}
 
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_categories.sql")
+    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries", sql_file)
     params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimCategories",
-        "staging_table_name": "staging_Categories"
+        "database_name": database_name,
+        "schema_name": schema_name,
+        "dim_table_name": dim_table_name,
+        "staging_table_name": staging_table_name
     }
-    return run_sql_task(sql_path, params)
+    result = run_sql_task(sql_path, params)
+    counts = result.get("counts")
+    if counts:
+        print(f"{dim_table_name}: " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+    return _with_statistics(result, [dim_table_name])
 
 
-def task_update_dim_customers(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
+def task_update_dim_categories(prereq=None) -> dict:
+    return _run_dim_task(prereq, "update_dim_categories.sql", "DimCategories", "staging_Categories")
 
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_customers.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimCustomers",
-        "staging_table_name": "staging_Customers"
-    }
-    return run_sql_task(sql_path, params)
 
+def task_update_dim_customers(prereq=None) -> dict:
+    return _run_dim_task(prereq, "update_dim_customers.sql", "DimCustomers", "staging_Customers")
 
-def task_update_dim_employees(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
 
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_employees.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimEmployees",
-        "staging_table_name": "staging_Employees"
-    }
-    return run_sql_task(sql_path, params)
+def task_update_dim_employees(prereq=None) -> dict:
+    return _run_dim_task(prereq, "update_dim_employees.sql", "DimEmployees", "staging_Employees")
 
 
 def task_update_dim_products(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
-
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_products.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimProducts",
-        "staging_table_name": "staging_Products"
-    }
-    return run_sql_task(sql_path, params)
+    return _run_dim_task(prereq, "update_dim_products.sql", "DimProducts", "staging_Products")
 
 
 def task_update_dim_region(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
-
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_region.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimRegion",
-        "staging_table_name": "staging_Region"
-    }
-    return run_sql_task(sql_path, params)
+    return _run_dim_task(prereq, "update_dim_region.sql", "DimRegion", "staging_Region")
 
 
 def task_update_dim_shippers(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
-
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_shippers.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimShippers",
-        "staging_table_name": "staging_Shippers"
-    }
-    return run_sql_task(sql_path, params)
+    return _run_dim_task(prereq, "update_dim_shippers.sql", "DimShippers", "staging_Shippers")
 
 
 def task_update_dim_suppliers(prereq=None) -> dict:
-    if prereq and not prereq.get("success"):
-        return {"success": False, "message": "Prerequisite failed"}
-
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_suppliers.sql")
-    params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimSuppliers",
-        "staging_table_name": "staging_Suppliers"
-    }
-    return run_sql_task(sql_path, params)
+    return _run_dim_task(prereq, "update_dim_suppliers.sql", "DimSuppliers", "staging_Suppliers")
 
 
 def task_update_dim_territories(prereq=None) -> dict:
+    return _run_dim_task(prereq, "update_dim_territories.sql", "DimTerritories", "staging_Territories")
+
+
+# ==============================================================
+# Fact Tasks (Snapshot Fact + Fact Error)
+# ==============================================================
+
+KEY_RESOLUTIONS = ("current", "as_of")
+
+
+def task_update_factorders(prereq=None, start_date=None, end_date=None,
+                           load_mode=FACT_LOAD_MODE, engine=FACT_ASSEMBLY_ENGINE,
+                           key_resolution=FACT_KEY_RESOLUTION) -> dict:
+    """
+    Load FactOrders.
+
+    Dimension keys are resolved once per load; rows with an unresolved key
+    are written to FactOrders_Error (with an ErrorCode) in the same pass.
+
+    load_mode:
+        "incremental" — delete and reinsert only the OrderDate window
+                        [start_date, end_date] (update_fact.sql), plus the
+                        orders without a parseable OrderDate
+        "full"        — truncate and reload the whole table (update_factorders.sql);
+                        also used when no date window is given
+
+    engine:
+        "sql"    — keys resolved by the scripts' dimension joins
+        "python" — keys resolved in memory by fact_assembly.py
+
+    key_resolution (SCD2 dimensions):
+        "current" — the current version of each key
+        "as_of"   — the version valid on the order's OrderDate
+    """
     if prereq and not prereq.get("success"):
         return {"success": False, "message": "Prerequisite failed"}
 
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_dim_territories.sql")
+    result = _load_fact_orders(start_date, end_date, load_mode, engine, key_resolution)
+    counts = result.get("counts")
+    if counts:
+        print(f"{FACT_TABLE}: " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+    return _with_statistics(result, [FACT_TABLE, FACT_ERROR_TABLE])
+
+
+def _load_fact_orders(start_date, end_date, load_mode, engine, key_resolution=FACT_KEY_RESOLUTION,
+                      undated=True) -> dict:
+    """
+    One FactOrders load (see task_update_factorders), without the statistics
+    refresh. A window load with `undated` also reloads the orders whose
+    OrderDay is NULL (rejected as INVALID_ORDER_DATE), which no window covers.
+    """
+    if load_mode not in ("incremental", "full"):
+        return {"success": False, "message": f"Unknown fact load mode: {load_mode}"}
+
+    if engine not in ("sql", "python"):
+        return {"success": False, "message": f"Unknown fact assembly engine: {engine}"}
+
+    if key_resolution not in KEY_RESOLUTIONS:
+        return {"success": False, "message": f"Unknown fact key resolution: {key_resolution}"}
+
+    full_refresh = not (load_mode == "incremental" and start_date and end_date)
+    as_of = key_resolution == "as_of"
+
+    if engine == "python":
+        try:
+            return assemble_fact_orders(start_date, end_date, full_refresh=full_refresh, as_of=as_of,
+                                        undated=undated)
+        except Exception as e:
+            return {"success": False, "message": str(e)}
+
+    if not full_refresh:
+        script = "update_fact.sql"
+    else:
+        script = "update_factorders.sql"
+
+    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries", script)
+
     params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "dim_table_name": "DimTerritories",
-        "staging_table_name": "staging_Territories"
+        "database_name": database_name,
+        "schema_name": schema_name,
+        "fact_table_name": FACT_TABLE,
+        "fact_error_table_name": FACT_ERROR_TABLE,
+        "orders_staging_table": STAGING_FACT_TABLE,
+        "details_staging_table": STAGING_FACT_DETAILS_TABLE
     }
-    return run_sql_task(sql_path, params)
+    # dates are sent as ODBC parameters so the window batch keeps one cached plan
+    bind_params = {"start_date": start_date, "end_date": end_date, "as_of": int(as_of),
+                   "undated": int(undated)}
+
+    return run_sql_task(sql_path, params, bind_params)
 
 
 # ==============================================================
-# Fact Tasks (Snapshot Fact + Fact Error)
+# Fact Backfill (date-partitioned window loads)
 # ==============================================================
 
-def task_update_factorders(prereq=None, start_date=None, end_date=None) -> dict:
+BACKFILL_PARTITION_MONTHS = {"month": 1, "quarter": 3}
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def merge_date_ranges(ranges) -> list:
+    """
+    Sort (start_date, end_date) ranges and merge the overlapping or adjacent
+    ones, so no two backfill partitions ever cover the same day.
+
+    Returns:
+        list: [(date, date)]
+    """
+    parsed = []
+    for start_date, end_date in ranges:
+        start, end = _as_date(start_date), _as_date(end_date)
+        if start > end:
+            raise ValueError(f"Backfill range starts after it ends: {start_date} > {end_date}")
+        parsed.append((start, end))
+
+    merged = []
+    for start, end in sorted(parsed):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def partition_windows(ranges, partition="month") -> list:
+    """
+    Split date ranges into calendar month / quarter windows, clipped to the
+    ranges: 1996-07-10..1996-09-05 by month is 1996-07-10..1996-07-31,
+    1996-08-01..1996-08-31 and 1996-09-01..1996-09-05.
+
+    Returns:
+        list: [(start_date, end_date)] as YYYY-MM-DD strings, in date order
+    """
+    if partition not in BACKFILL_PARTITION_MONTHS:
+        raise ValueError(f"Unknown backfill partition: {partition} (expected month or quarter)")
+    months = BACKFILL_PARTITION_MONTHS[partition]
+
+    windows = []
+    for start, end in merge_date_ranges(ranges):
+        window_start = start
+        while window_start <= end:
+            last_month = (window_start.month - 1) // months * months + months
+            next_start = date(window_start.year + last_month // 12, last_month % 12 + 1, 1)
+            window_end = min(end, next_start - timedelta(days=1))
+            windows.append((window_start.isoformat(), window_end.isoformat()))
+            window_start = next_start
+    return windows
+
+
+def task_backfill_factorders(prereq=None, ranges=None, partition=FACT_BACKFILL_PARTITION,
+                             max_workers=FACT_BACKFILL_MAX_WORKERS, retries=FACT_BACKFILL_RETRIES,
+                             engine=FACT_ASSEMBLY_ENGINE, key_resolution=FACT_KEY_RESOLUTION) -> dict:
+    """
+    Reload FactOrders for one or more date ranges, one calendar partition
+    (month / quarter) at a time.
+
+    Every partition is an incremental window load (delete + reinsert, as in
+    task_update_factorders) committed on its own pooled connection, so a
+    partition holds its locks on FactOrders only while it loads, and one
+    failure does not roll back the other partitions. Up to `max_workers`
+    partitions load concurrently (one at a time on a backend with a single
+    writer). A failed partition is retried `retries` times with exponential
+    backoff (deadlock victims, lock timeouts). Progress is printed per
+    partition; statistics are refreshed once at the end.
+
+    Each window delete seeks IX_FactOrders_OrderDay (on the computed
+    OrderDay date), so concurrent partitions touch only their own rows.
+    The fact SOR entries are seeded once before the partitions start
+    (seed_fact_sor.sql), so the partitions never race to insert them.
+    The orders without an OrderDay, which no partition covers, are
+    reloaded (as INVALID_ORDER_DATE rejects) by the first partition only.
+
+    Args:
+        ranges (list): [(start_date, end_date)], YYYY-MM-DD, inclusive
+        partition (str): "month" or "quarter"
+
+    Returns:
+        dict: {'success': True/False, 'message': "...",
+               'counts': {'loaded_rows', 'rejected_rows'} summed over partitions,
+               'partitions': {"start..end": {'success', 'attempts', 'seconds', 'counts' / 'message'}}}
+    """
+    if prereq and not prereq.get("success"):
+        return {"success": False, "message": "Prerequisite failed"}
+
+    try:
+        windows = partition_windows(ranges or [], partition)
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    if not windows:
+        return {"success": False, "message": "No backfill range given"}
+
+    if not get_backend().parallel_writes:
+        max_workers = 1
+
+    seeded = run_sql_task(
+        os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/seed_fact_sor.sql"),
+        {"database_name": database_name, "schema_name": schema_name},
+    )
+    if not seeded.get("success"):
+        return {"success": False, "message": f"Dim_SOR seed failed: {seeded.get('message')}"}
+
+    def _load_window(window):
+        start_date, end_date = window
+        started = time.perf_counter()
+        attempt = 1
+        while True:
+            result = _load_fact_orders(start_date, end_date, "incremental", engine, key_resolution,
+                                       undated=window == windows[0])
+            if result.get("success") or attempt > retries:
+                break
+            delay = FACT_BACKFILL_RETRY_BACKOFF * 2 ** (attempt - 1)
+            print(f"Backfill {start_date}..{end_date}: attempt {attempt} failed "
+                  f"({result.get('message')}), retrying in {delay:g}s")
+            time.sleep(delay)
+            attempt += 1
+        result["attempts"] = attempt
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+    partitions = {}
+    counts = {}
+    metrics = {}
+    merge_metrics(metrics, seeded.get("metrics"))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(_load_window, window): window for window in windows}
+        for done, future in enumerate(as_completed(futures), start=1):
+            label = "..".join(futures[future])
+            result = future.result()
+            merge_metrics(metrics, result.get("metrics"))
+
+            stats = {"success": result.get("success", False),
+                     "attempts": result["attempts"], "seconds": result["seconds"]}
+            if stats["success"]:
+                stats["counts"] = result.get("counts") or {}
+                for key, value in stats["counts"].items():
+                    counts[key] = counts.get(key, 0) + (value or 0)
+                outcome = ", ".join(f"{key}={value}" for key, value in stats["counts"].items()) or "ok"
+            else:
+                stats["message"] = result.get("message")
+                outcome = f"FAILED: {stats['message']}"
+            partitions[label] = stats
+
+            retried = f", {stats['attempts']} attempts" if stats["attempts"] > 1 else ""
+            print(f"Backfill [{done}/{len(windows)}] {label}: {outcome} ({stats['seconds']}s{retried})")
+
+    partitions = dict(sorted(partitions.items()))
+    failed = [label for label, stats in partitions.items() if not stats["success"]]
+    result = {"success": not failed, "counts": counts, "partitions": partitions, "metrics": metrics}
+    if failed:
+        result["message"] = f"Backfill failed for {len(failed)} of {len(windows)} partitions: {', '.join(failed)}"
+    else:
+        print(f"{FACT_TABLE} backfill: {len(windows)} {partition} partitions, "
+              + ", ".join(f"{key}={value}" for key, value in counts.items()))
+
+    # partitions that did load keep their statistics current even if others failed
+    if len(failed) < len(windows):
+        result["statistics"] = refresh_statistics([FACT_TABLE, FACT_ERROR_TABLE])
+    return result
+
+
+def task_update_fact(start_date, end_date, prereq=None) -> dict:
+    """Date-windowed (incremental) FactOrders load."""
+    return task_update_factorders(
+        prereq=prereq,
+        start_date=start_date,
+        end_date=end_date,
+        load_mode="incremental",
+    )
+
+
+def task_update_fact_error(prereq=None, start_date=None, end_date=None,
+                           key_resolution=FACT_KEY_RESOLUTION) -> dict:
+    """
+    Re-check the OrderDate window and rewrite its FactOrders_Error rows
+    without touching FactOrders. Not part of the regular flow: the fact
+    loads already route rejected rows in the same pass.
+    """
     if prereq and not prereq.get("success"):
         return {"success": False, "message": "Prerequisite failed"}
 
     sql_path = os.path.join(
         PROJECT_ROOT,
-        "pipeline_dimensional_data/queries/update_factorders.sql"
+        "pipeline_dimensional_data/queries/update_fact_error.sql"
     )
 
     params = {
         "database_name": database_name,
         "schema_name": schema_name,
-        "fact_table_name": "FactOrders",
-        "orders_staging_table": "staging_Orders",
-        "details_staging_table": "staging_OrderDetails",
-        "start_date": start_date,
-        "end_date": end_date
+        "fact_error_table_name": FACT_ERROR_TABLE,
+        "orders_staging_table": STAGING_FACT_TABLE,
+        "details_staging_table": STAGING_FACT_DETAILS_TABLE
     }
+    bind_params = {"start_date": start_date, "end_date": end_date,
+                   "as_of": int(key_resolution == "as_of"), "undated": 1}
 
-    return run_sql_task(sql_path, params)
+    return _with_statistics(run_sql_task(sql_path, params, bind_params), [FACT_ERROR_TABLE])
 
+# ==============================================================
+# Aggregates (dashboard summaries of FactOrders)
+# ==============================================================
 
-def task_update_fact(start_date, end_date, prereq=None) -> dict:
+AGGREGATE_TABLES = [AGG_DAY_CUSTOMER_TABLE, AGG_PRODUCT_MONTH_TABLE, AGG_EMPLOYEE_TERRITORY_MONTH_TABLE]
+
+
+def task_update_aggregates(prereq=None, start_date=None, end_date=None, ranges=None,
+                           load_mode=FACT_LOAD_MODE) -> dict:
+    """
+    Refresh the dashboard aggregates from FactOrders (update_aggregates.sql):
+        AggSalesDayCustomer             — day x customer
+        AggSalesProductMonth            — month x product
+        AggSalesEmployeeTerritoryMonth  — month x employee x territory
+
+    Only the OrderDate ranges the fact load touched are refreshed: the
+    start_date / end_date window, or each backfill range in `ranges`.
+    Month-grain tables recompute every month a range touches. After a
+    full fact load (load_mode "full", or no window) they are rebuilt.
+    """
     if prereq and not prereq.get("success"):
         return {"success": False, "message": "Prerequisite failed"}
 
-    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_fact.sql")
+    if ranges:
+        try:
+            windows = [(start.isoformat(), end.isoformat()) for start, end in merge_date_ranges(ranges)]
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+    elif load_mode == "incremental" and start_date and end_date:
+        windows = [(start_date, end_date)]
+    else:
+        windows = [(None, None)]
+
+    sql_path = os.path.join(PROJECT_ROOT, "pipeline_dimensional_data/queries/update_aggregates.sql")
     params = {
-        "database_name": "ORDER_DDS",
-        "schema_name": "dbo",
-        "fact_table_name": "FactOrders",
-        "staging_table_name": "staging_Orders",
-        "start_date": start_date,
-        "end_date": end_date
+        "database_name": database_name,
+        "schema_name": schema_name,
+        "fact_table_name": FACT_TABLE,
+        "day_customer_table": AGG_DAY_CUSTOMER_TABLE,
+        "product_month_table": AGG_PRODUCT_MONTH_TABLE,
+        "employee_territory_month_table": AGG_EMPLOYEE_TERRITORY_MONTH_TABLE,
     }
-    return run_sql_task(sql_path, params)
 
+    counts = {}
+    metrics = {}
+    for window_start, window_end in windows:
+        bind_params = {
+            "full_refresh": int(window_start is None),
+            "start_date": window_start,
+            "end_date": window_end,
+        }
+        result = run_sql_task(sql_path, params, bind_params)
+        merge_metrics(metrics, result.get("metrics"))
+        if not result.get("success"):
+            return {"success": False, "message": result.get("message"), "counts": counts, "metrics": metrics}
+        for key, value in (result.get("counts") or {}).items():
+            counts[key] = counts.get(key, 0) + (value or 0)
 
-# def task_update_fact_error(prereq=None, start_date=None, end_date=None) -> dict:
-#     if prereq and not prereq.get("success"):
-#         return {"success": False, "message": "Prerequisite failed"}
-
-#     sql_path = os.path.join(
-#         PROJECT_ROOT,
-#         "pipeline_dimensional_data/queries/update_fact_error.sql"
-#     )
-
-#     params = {
-#         "database_name": database_name,
-#         "schema_name": schema_name,
-#         "start_date": start_date,
-#         "end_date": end_date
-#     }
-
-#     return run_sql_task(sql_path, params)
+    print("Aggregates: " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+    return _with_statistics({"success": True, "counts": counts, "metrics": metrics}, AGGREGATE_TABLES)
 
 # ==============================================================
 # Table Population
@@ -286,49 +740,768 @@ STAGING_TABLES = {
     "staging_Territories": (SOURCE_PATH, "Territories"),
 }
 
-def populate_table_from_excel(cursor, table_name, sheet):
-    """Insert all rows from an Excel sheet into the corresponding staging table."""
-    num_cols = sheet.max_column
-    placeholders = ", ".join(["?"] * num_cols)
-    query = f"INSERT INTO {table_name} VALUES ({placeholders})"
+# Natural key of each staging table. When several workbooks feed a table,
+# a key found in more than one of them keeps the row of the last workbook.
+STAGING_KEYS = {
+    "staging_Categories": ("CategoryID",),
+    "staging_Customers": ("CustomerID",),
+    "staging_Employees": ("EmployeeID",),
+    "staging_OrderDetails": ("OrderID", "ProductID"),
+    "staging_Orders": ("OrderID",),
+    "staging_Products": ("ProductID",),
+    "staging_Region": ("RegionID",),
+    "staging_Shippers": ("ShipperID",),
+    "staging_Suppliers": ("SupplierID",),
+    "staging_Territories": ("TerritoryID",),
+}
+
+
+def staging_manifest_path() -> str:
+    """The fingerprint manifest of the current backend's database (see fingerprints.manifest_path)."""
+    return manifest_path(STAGING_FINGERPRINT_PATH, get_backend().identity)
+
+
+def source_workbooks(source_path) -> list:
+    """
+    Workbooks named by a source path, in sorted (load) order.
+
+    `source_path` is a workbook, a directory (its .xlsx files) or a glob
+    pattern such as "extracts/*_region.xlsx". Excel lock files (~$...)
+    and hidden files are left out.
+    """
+    if os.path.isdir(source_path):
+        paths = [os.path.join(source_path, name) for name in os.listdir(source_path)
+                 if name.endswith(".xlsx")]
+    elif any(char in source_path for char in "*?["):
+        paths = [path for path in glob.glob(source_path) if os.path.isfile(path)]
+    else:
+        return [source_path]
+    return sorted(path for path in paths if not os.path.basename(path).startswith(("~$", ".")))
+
+
+def source_file_name(file_path, source_path) -> str:
+    """
+    The SourceFile recorded for a workbook read through `source_path`: its
+    path relative to the source root (the directory itself, the fixed
+    leading directories of a glob, or a workbook's own folder), with "/"
+    separators. It stays short however deep the root is, and names the
+    same workbook the same way from any working directory.
+    """
+    if os.path.isdir(source_path):
+        root = source_path
+    elif any(char in source_path for char in "*?["):
+        fixed = source_path[:min(source_path.find(char) for char in "*?[" if char in source_path)]
+        root = os.path.dirname(fixed)
+    else:
+        root = os.path.dirname(source_path)
+    return os.path.relpath(os.path.abspath(file_path), os.path.abspath(root or ".")).replace(os.sep, "/")
+
+
+def staging_source_files(source_path=None) -> list:
+    """Workbook paths task_populate_staging reads (source_path replaces the defaults)."""
+    return sorted({
+        path
+        for default_file, _ in STAGING_TABLES.values()
+        for path in source_workbooks(source_path or default_file)
+    })
+
+
+def open_source_workbook(file_path):
+    """Open an Excel workbook in read-only (streaming) mode."""
+    import openpyxl  # imported on first use: runs that skip staging never load it
+
+    return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
 
-    for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row, values_only=True):
-        cursor.execute(query, row)
-    cursor.commit()
 
+def _iso_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
 
-def task_populate_staging(prereq=None) -> dict:
+
+def iter_sheet_rows(sheet, numbered=False):
     """
-    Populate all staging tables from Excel file.
+    Lazily stream the data rows of a read-only worksheet.
+
+    The header row fixes the column count. Read-only sheets omit
+    trailing empty cells, so each row is padded / trimmed to that width.
+    Fully empty rows are skipped. Date and datetime cells become ISO text
+    ("1996-07-04 00:00:00"), whatever the backend, so the text date
+    columns convert the same way everywhere (see staging_Orders.OrderDay).
+    With `numbered`, each row comes as a (sheet row number, row) pair.
+
+    Returns:
+        (int, generator): column count and row iterator (header excluded)
+    """
+    rows = sheet.iter_rows(values_only=True)
+    header = list(next(rows, None) or [])
+    while header and header[-1] is None:
+        header.pop()
+    num_cols = len(header)
+
+    def _data_rows():
+        for row_number, row in enumerate(rows, start=2):
+            row = tuple(row[:num_cols])
+            if all(value is None for value in row):
+                continue
+            if len(row) < num_cols:
+                row += (None,) * (num_cols - len(row))
+            if any(isinstance(value, date) for value in row):
+                row = tuple(_iso_text(value) for value in row)
+            yield (row_number, row) if numbered else row
+
+    return num_cols, _data_rows()
+
+
+def populate_table_from_excel(cursor, table_name, sheet, batch_size=STAGING_BATCH_SIZE,
+                              source_file=None, truncate=True, validator=None, fingerprint=None) -> int:
+    """
+    Load all rows from an Excel sheet into a staging table. Each row gets
+    `source_file` as its last column (SourceFile). With a `validator`
+    (StagingValidator), each batch is coerced to the table's column types
+    first and rows that fail are written to the rejects file instead.
+    With a `fingerprint` (fingerprints.RowsFingerprint), the sheet rows are
+    hashed as they stream past, before validation.
+
+    With `truncate` the table is emptied (and committed) first, since
+    bulk_insert may roll back a failed first batch; task_populate_staging
+    truncates its tables up front instead, as several workbooks may feed
+    one table. Rows are streamed from the sheet and sent in batches of
+    `batch_size` (see the backend's bulk_insert), so memory stays flat
+    regardless of sheet size.
+
+    Returns:
+        int: number of rows inserted
+    """
+    backend = get_backend()
+    if truncate:
+        cursor.execute(backend.truncate_table_sql(table_name))
+        cursor.connection.commit()
+
+    num_cols, rows = iter_sheet_rows(sheet, numbered=validator is not None)
+    if fingerprint is not None:
+        rows = fingerprint.tap(rows, numbered=validator is not None)
+    return _insert_staging_rows(cursor, table_name, num_cols, rows, batch_size=batch_size,
+                                source_file=source_file, validator=validator)
+
+
+def _insert_staging_rows(cursor, table_name, num_cols, rows, batch_size=STAGING_BATCH_SIZE,
+                         source_file=None, validator=None) -> int:
+    """
+    Insert streamed sheet rows ((sheet row, row) pairs with a `validator`)
+    with `source_file` appended, and commit; see populate_table_from_excel.
+    """
+    if num_cols == 0:
+        return 0
+    if validator is not None:
+        rows = validator.filter(rows, num_cols, batch_size)
+
+    tagged_rows = (row + (source_file,) for row in rows)
+    row_count = get_backend().bulk_insert(cursor, table_name, tagged_rows, num_cols + 1, batch_size=batch_size)
+    cursor.connection.commit()
+    return row_count
+
+
+def _parse_workbook_to_spools(file_path, sheets, batch_size=STAGING_BATCH_SIZE, fingerprint=False) -> list:
+    """
+    Process pool entry point for staging: open one workbook once and stream
+    each of its (sheet name, spool path) `sheets` (iter_sheet_rows) into its
+    spool as pickled batches of (sheet row, row) pairs. openpyxl parsing is
+    CPU-bound, so in threads it would hold the GIL the inserts need; in its
+    own process it overlaps with them, and memory stays flat.
+
+    Returns:
+        list: per sheet, in order, {'num_cols', 'rows', 'parse_seconds'},
+              plus 'sheet_fingerprint' and 'sheet_rows' with `fingerprint`
+              (see _load_staging_table), or {'message'} if the sheet failed
+    """
+    started = time.perf_counter()
+    wb = open_source_workbook(file_path)
+    open_seconds = time.perf_counter() - started
+    results = []
+    try:
+        for sheet_name, spool_path in sheets:
+            started = time.perf_counter()
+            try:
+                num_cols, rows = iter_sheet_rows(wb[sheet_name], numbered=True)
+                sheet_fingerprint = RowsFingerprint() if fingerprint else None
+                if sheet_fingerprint is not None:
+                    rows = sheet_fingerprint.tap(rows, numbered=True)
+
+                row_count = 0
+                with open(spool_path, "wb") as spool:
+                    for batch in iter(lambda: list(islice(rows, batch_size)), []):
+                        pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+                        row_count += len(batch)
+            except Exception as e:
+                results.append({"message": str(e)})
+                continue
+
+            # the workbook open counts towards its first sheet
+            parsed = {"num_cols": num_cols, "rows": row_count,
+                      "parse_seconds": round(time.perf_counter() - started + open_seconds, 3)}
+            open_seconds = 0.0
+            if sheet_fingerprint is not None:
+                parsed["sheet_fingerprint"] = sheet_fingerprint.hexdigest()
+                parsed["sheet_rows"] = sheet_fingerprint.rows
+            results.append(parsed)
+    finally:
+        wb.close()
+    return results
+
+
+def _read_spool(spool_path):
+    """Stream the (sheet row, row) pairs written by _parse_workbook_to_spools."""
+    with open(spool_path, "rb") as spool:
+        while True:
+            try:
+                batch = pickle.load(spool)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _load_staging_table(cursor, workbook, table_name, sheet_name, source_file=None, truncate=True,
+                        validate=STAGING_VALIDATION, fingerprint=False) -> dict:
+    """
+    Load one sheet into its staging table and return its stats; with
+    `fingerprint`, also the 'sheet_fingerprint' and 'sheet_rows' of the
+    sheet values it streamed (see fingerprints.RowsFingerprint).
+    """
+    started = time.perf_counter()
+    validator = StagingValidator(table_name, sheet_name, source_file) if validate else None
+    sheet_fingerprint = RowsFingerprint() if fingerprint else None
+    row_count = populate_table_from_excel(cursor, table_name, workbook[sheet_name],
+                                          source_file=source_file, truncate=truncate,
+                                          validator=validator, fingerprint=sheet_fingerprint)
+    stats = _staging_load_stats(table_name, sheet_name, source_file, row_count,
+                                time.perf_counter() - started, validator)
+    if sheet_fingerprint is not None:
+        stats["sheet_fingerprint"] = sheet_fingerprint.hexdigest()
+        stats["sheet_rows"] = sheet_fingerprint.rows
+    return stats
+
+
+def _staging_load_stats(table_name, sheet_name, source_file, row_count, elapsed, validator) -> dict:
+    """Print and return the stats of one sheet loaded in `elapsed` seconds."""
+    rows_per_sec = row_count / elapsed if elapsed > 0 else float(row_count)
+    source = f" from {os.path.basename(source_file)}" if source_file else ""
+    print(f"Loaded {row_count} rows into {table_name}{source} "
+          f"in {elapsed:.2f}s ({rows_per_sec:.0f} rows/s)")
+
+    stats = {
+        "success": True,
+        "rows": row_count,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows_per_sec, 1),
+    }
+    if validator is not None:
+        stats["rejected"] = validator.rejected
+        if validator.rejected:
+            print(f"Rejected {validator.rejected} rows of {sheet_name}{source}, see {STAGING_REJECTS_PATH}")
+    return stats
+
+
+def _load_staging_table_isolated(table_name, file_path, sheet_name, source_file, workbooks,
+                                 fingerprint=False) -> dict:
+    """
+    Worker entry point for parallel staging: loads one sheet of one
+    workbook on its own pooled connection, reading it through the calling
+    thread's read-only handle of the workbook (`workbooks`, see
+    _ThreadWorkbooks); neither is shared across threads.
+    """
+    print(f"Populating {table_name} from {file_path} / sheet {sheet_name}")
+    try:
+        started = time.perf_counter()
+        with get_backend().pool().connection() as conn:
+            connect_seconds = time.perf_counter() - started
+            stats = _load_staging_table(conn.cursor(), workbooks.get(file_path), table_name, sheet_name,
+                                        source_file=source_file, truncate=False, fingerprint=fingerprint)
+            stats["connect_seconds"] = round(connect_seconds, 4)
+            return stats
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+
+class _ThreadWorkbooks:
+    """
+    Read-only workbook handles for the threads of a parallel staging load:
+    each thread opens a workbook once and reuses it for all the sheets it
+    loads (openpyxl handles are not thread-safe, so threads never share
+    one). close() closes every handle once the threads are done.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._opened = []
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        handles = getattr(self._local, "handles", None)
+        if handles is None:
+            handles = self._local.handles = {}
+        if file_path not in handles:
+            handles[file_path] = open_source_workbook(file_path)
+            with self._lock:
+                self._opened.append(handles[file_path])
+        return handles[file_path]
+
+    def close(self):
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for wb in opened:
+            wb.close()
+
+
+def _load_staging_spool(table_name, sheet_name, source_file, spool_path, parsed,
+                        validate=STAGING_VALIDATION) -> dict:
+    """
+    Worker entry point for process-parsed staging: inserts one sheet
+    spooled by _parse_workbook_to_spools on its own pooled connection.
+    """
+    try:
+        started = time.perf_counter()
+        with get_backend().pool().connection() as conn:
+            connect_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            validator = StagingValidator(table_name, sheet_name, source_file) if validate else None
+            rows = _read_spool(spool_path)
+            if validator is None:
+                rows = (row for _, row in rows)
+            row_count = _insert_staging_rows(conn.cursor(), table_name, parsed["num_cols"], rows,
+                                             source_file=source_file, validator=validator)
+            stats = _staging_load_stats(table_name, sheet_name, source_file, row_count,
+                                        time.perf_counter() - started, validator)
+            stats["connect_seconds"] = round(connect_seconds, 4)
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+    finally:
+        os.remove(spool_path)
+
+    stats["parse_seconds"] = parsed["parse_seconds"]
+    for key in ("sheet_fingerprint", "sheet_rows"):
+        if key in parsed:
+            stats[key] = parsed[key]
+    return stats
+
+
+def _filter_unchanged_workbooks(pending, manifest, table_stats):
+    """
+    Drop tables whose source workbooks all match the file hashes recorded
+    in the manifest; those are not parsed at all. Every other table is
+    loaded, and its sheets are fingerprinted as they stream into staging
+    (see _staged_manifest_entries).
+
+    Returns:
+        (list, dict): tables still to load, and the SHA-256 of each
+                      workbook (file_fingerprint)
+    """
+    to_load = []
+    file_fps = {}
+    for table_name, files, sheet_name in pending:
+        known = manifest["tables"].get(table_name, {})
+        known_sources = known.get("sources", {}) if known.get("sheet") == sheet_name else {}
+
+        for file_path in files:
+            if file_path not in file_fps:
+                file_fps[file_path] = file_fingerprint(file_path)
+
+        unchanged = {os.path.abspath(file_path) for file_path in files} == known_sources.keys() and all(
+            known_sources[os.path.abspath(file_path)].get("file_fingerprint") == file_fps[file_path]
+            for file_path in files
+        )
+        if unchanged:
+            print(f"Source workbooks unchanged, skipping {table_name}")
+            table_stats[table_name] = {"success": True, "skipped": True, "unchanged": True,
+                                       "message": "Source sheet unchanged"}
+        else:
+            to_load.append((table_name, files, sheet_name))
+
+    return to_load, file_fps
+
+
+def _staged_manifest_entries(pending, file_stats, file_fps) -> dict:
+    """
+    The manifest entry of each table loaded from its workbooks, from the
+    sheet fingerprints their loads computed ('sheet_fingerprint', removed
+    from the stats). Tables with a failed load get no entry.
+    """
+    entries = {}
+    for table_name, files, sheet_name in pending:
+        results = [file_stats[(table_name, file_path)] for file_path in files]
+        if not all(stats.get("success") for stats in results):
+            continue
+        entries[table_name] = {
+            "sheet": sheet_name,
+            "sources": {
+                os.path.abspath(file_path): {
+                    "file_fingerprint": file_fps[file_path],
+                    "fingerprint": stats.pop("sheet_fingerprint"),
+                    "rows": stats.pop("sheet_rows"),
+                }
+                for file_path, stats in zip(files, results)
+            },
+        }
+    return entries
+
+
+def _truncate_staging_tables(table_names):
+    """Empty the staging tables about to be loaded, committed before any load starts."""
+    backend = get_backend()
+    with backend.pool().connection() as conn:
+        cursor = conn.cursor()
+        for table_name in table_names:
+            cursor.execute(backend.truncate_table_sql(table_name))
+        conn.commit()
+
+
+def _dedupe_staging_table(cursor, table_name, source_files) -> int:
+    """
+    Keep one row per natural key (STAGING_KEYS) of a table loaded from
+    several workbooks: the row of the last workbook in `source_files`
+    (their SourceFile names, in load order), and the last such row
+    within it. The dimension merges then see the same input in whatever
+    order the parallel loads finished. Rows with a NULL key are kept.
+
+    Returns:
+        int: number of rows removed
+    """
+    key_columns = STAGING_KEYS[table_name]
+    source_order = " UNION ALL ".join(["SELECT ? AS SourceFile, ? AS FileOrder"] + ["SELECT ?, ?"] * (len(source_files) - 1))
+    partition = ", ".join(f"s.{column}" for column in key_columns)
+    key_not_null = " AND ".join(f"s.{column} IS NOT NULL" for column in key_columns)
+
+    # derived tables rather than a CTE: sqlite3 reports no rowcount for WITH ... DELETE
+    query = f"""
+        DELETE FROM {table_name}
+        WHERE staging_raw_id_sk IN (
+            SELECT staging_raw_id_sk
+            FROM (
+                SELECT s.staging_raw_id_sk,
+                       ROW_NUMBER() OVER (PARTITION BY {partition}
+                                          ORDER BY o.FileOrder DESC, s.staging_raw_id_sk DESC) AS RowNumber
+                FROM {table_name} s
+                JOIN ({source_order}) o ON o.SourceFile = s.SourceFile
+                WHERE {key_not_null}
+            ) ranked
+            WHERE RowNumber > 1
+        )
+    """
+    params = [value for order, source_file in enumerate(source_files) for value in (source_file, order)]
+    cursor.execute(query, params)
+    removed = cursor.rowcount
+    cursor.connection.commit()
+    return removed
+
+
+def _combine_file_stats(table_name, files, file_stats) -> dict:
+    """Stats of a staging table from the stats of its per-workbook loads."""
+    results = [(file_path, file_stats[(table_name, file_path)]) for file_path in files]
+    failed = [(file_path, stats) for file_path, stats in results if not stats.get("success")]
+    if failed:
+        return {
+            "success": False,
+            "message": "; ".join(f"{os.path.basename(file_path)}: {stats.get('message')}"
+                                 for file_path, stats in failed),
+        }
+    if len(results) == 1:
+        return results[0][1]
+
+    rows = sum(stats["rows"] for _, stats in results)
+    seconds = sum(stats["seconds"] for _, stats in results)
+    combined = {
+        "success": True,
+        "rows": rows,
+        "files": len(results),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds if seconds > 0 else float(rows), 1),
+        "connect_seconds": round(sum(stats.get("connect_seconds", 0) for _, stats in results), 4),
+    }
+    if any("parse_seconds" in stats for _, stats in results):
+        combined["parse_seconds"] = round(sum(stats.get("parse_seconds", 0) for _, stats in results), 3)
+    if any("rejected" in stats for _, stats in results):
+        combined["rejected"] = sum(stats.get("rejected", 0) for _, stats in results)
+    return combined
+
+
+def _dedupe_staging_tables(pending, table_stats, source_files):
+    """Apply _dedupe_staging_table to every loaded table fed by several workbooks."""
+    multi_file = [(table_name, files) for table_name, files, _ in pending
+                  if len(files) > 1 and table_stats[table_name].get("success")]
+    if not multi_file:
+        return
+
+    with get_backend().pool().connection() as conn:
+        cursor = conn.cursor()
+        for table_name, files in multi_file:
+            stats = table_stats[table_name]
+            try:
+                removed = _dedupe_staging_table(cursor, table_name, [source_files[file_path] for file_path in files])
+            except Exception as e:
+                conn.rollback()
+                table_stats[table_name] = {"success": False, "message": f"Dedupe failed: {e}"}
+                continue
+            stats["duplicates_removed"] = removed
+            stats["rows"] -= removed
+            print(f"Staged {stats['rows']} rows into {table_name} from {len(files)} workbooks "
+                  f"({removed} rows superseded by later workbooks)")
+
+
+def task_populate_staging(prereq=None, max_workers=STAGING_MAX_WORKERS,
+                          skip_unchanged=STAGING_SKIP_UNCHANGED, source_path=None,
+                          parse_processes=STAGING_PARSE_PROCESSES) -> dict:
+    """
+    Populate all staging tables from the source workbooks.
+
+    `source_path` names one workbook, a directory or a glob of workbooks
+    (see source_workbooks); each staging table is loaded from its sheet
+    in every one of them, and each row records its workbook in SourceFile
+    (relative to the source root, see source_file_name), which the
+    dimension and fact loads copy into their rows as lineage.
+    The tables to load are truncated up front. A table fed by several
+    workbooks is then reduced to one row per natural key, the last
+    workbook in sorted order winning (see _dedupe_staging_table).
+
+    With `parse_processes` > 0, the workbooks are parsed in a pool of that
+    many spawned processes, since openpyxl parsing is CPU-bound and
+    threads would serialize on the GIL. Each process opens one workbook
+    once and spools its sheets to temp files; they are inserted as soon
+    as the workbook is parsed, each sheet on its own connection in a
+    thread pool of `max_workers` threads (one thread on backends with a
+    single writer). With parse_processes = 0 (the default) the loading
+    threads parse themselves: sequential mode (max_workers <= 1) opens
+    each source workbook once in read-only mode and streams its sheets
+    over a single connection, and parallel mode loads each sheet of each
+    workbook on its own connection in a thread pool of `max_workers`
+    threads, each thread opening a workbook once. Either way jobs start
+    workbook by workbook in sorted order, and backends with a single
+    writer (SQLite) insert one sheet at a time, since parallel loads
+    would only queue on its lock.
+
+    With skip_unchanged, tables whose source workbooks all match the file
+    hashes in the manifest from the last successful load are not parsed
+    or reloaded; they are reported as {'skipped': True, 'unchanged': True}.
+    The other tables are loaded, each sheet fingerprinted in the same pass
+    as it streams into staging; a table whose sheet values turn out to
+    match the manifest anyway (a re-saved workbook) is reported as
+    {'unchanged': True} too. Every staged or unchanged table then also
+    reports its 'fingerprint' (fingerprints.table_fingerprint), which the
+    flow records against the dimension loads that commit from it.
+
+    With STAGING_VALIDATION, rows are coerced to the staging column types
+    before they are inserted (see staging_validation.py); rows that fail
+    go to STAGING_REJECTS_PATH and are counted as 'rejected', so bad
+    cells no longer fail the table.
 
     Args:
         prereq (dict): prerequisite task result
+        max_workers (int): number of concurrent staging loads
+        parse_processes (int): processes parsing the workbooks (0 = parse
+                               in the loading threads)
+        skip_unchanged (bool): skip workbooks with an unchanged fingerprint
+        source_path (str): workbook, directory or glob to read instead of
+                           SOURCE_PATH (e.g. a generated benchmark workbook
+                           or a directory of regional extracts)
 
     Returns:
-        dict: {'success': True/False, 'message': "..."}
+        dict: {'success': True/False, 'message': "...",
+               'tables': {table_name: {'success', 'rows', 'seconds', 'rows_per_sec'}}}
+               ('parse_seconds' with parse_processes,
+                'files' and 'duplicates_removed' for tables fed by several workbooks,
+                'fingerprint' with skip_unchanged, 'rejected' with STAGING_VALIDATION)
     """
     if prereq and not prereq.get("success", False):
         return {"success": False, "message": "Prerequisite failed"}
 
+    table_stats = {}
+    pending = []
+    source_files = {}
+
+    for table_name, (default_file, sheet_name) in STAGING_TABLES.items():
+        table_source = source_path or default_file
+        files = [file_path for file_path in source_workbooks(table_source) if os.path.exists(file_path)]
+        if not files:
+            print(f"Excel file not found: {table_source}, skipping {table_name}")
+            table_stats[table_name] = {"success": True, "skipped": True,
+                                       "message": f"Excel file not found: {table_source}"}
+            continue
+        pending.append((table_name, files, sheet_name))
+        for file_path in files:
+            source_files[file_path] = source_file_name(file_path, table_source)
+
     try:
-        cfg = load_db_config()
-        conn = create_db_connection(cfg)
-        cursor = conn.cursor()
+        manifest = None
+        if skip_unchanged:
+            manifest = load_manifest(staging_manifest_path())
+            pending, file_fps = _filter_unchanged_workbooks(pending, manifest, table_stats)
+        fingerprint = manifest is not None
+
+        if pending:
+            _truncate_staging_tables([table_name for table_name, _, _ in pending])
+
+        # workbook by workbook, so each table's workbooks start loading in sorted order
+        all_files = sorted({file_path for _, files, _ in pending for file_path in files})
+        jobs = [
+            (table_name, file_path, sheet_name, source_files[file_path])
+            for file_path in all_files
+            for table_name, files, sheet_name in pending
+            if file_path in files
+        ]
 
-        for table_name, (default_file, sheet_name) in STAGING_TABLES.items():
-            file_path = default_file
-            if not os.path.exists(file_path):
-                print(f"Excel file not found: {file_path}, skipping {table_name}")
-                continue
+        file_stats = {}
+        if parse_processes and parse_processes > 0 and jobs:
+            _populate_staging_parsed(jobs, file_stats, max_workers, parse_processes, fingerprint)
+        elif max_workers and max_workers > 1 and get_backend().parallel_writes:
+            _populate_staging_threaded(jobs, file_stats, max_workers, fingerprint)
+        else:
+            _populate_staging_sequential(jobs, file_stats, fingerprint)
+
+        if manifest is not None:
+            staged_entries = _staged_manifest_entries(pending, file_stats, file_fps)
+        for table_name, files, _ in pending:
+            table_stats[table_name] = _combine_file_stats(table_name, files, file_stats)
+        _dedupe_staging_tables(pending, table_stats, source_files)
+
+        if manifest is not None:
+            for table_name, _, _ in pending:
+                entry = staged_entries.get(table_name)
+                if entry is None or not table_stats[table_name].get("success"):
+                    manifest["tables"].pop(table_name, None)
+                    continue
+                known = manifest["tables"].get(table_name)
+                if known is not None and table_fingerprint(known) == table_fingerprint(entry):
+                    # re-saved workbooks with the same values: the dimensions need no reload
+                    print(f"Source sheet values unchanged in {table_name}")
+                    table_stats[table_name]["unchanged"] = True
+                manifest["tables"][table_name] = entry
+
+            for table_name, stats in table_stats.items():
+                if table_name in manifest["tables"] and stats.get("success") and (
+                        stats.get("unchanged") or not stats.get("skipped")):
+                    # what the dimension loads fed by this table record once they commit
+                    stats["fingerprint"] = table_fingerprint(manifest["tables"][table_name])
+            save_manifest(staging_manifest_path(), manifest)
 
-            print(f"Populating {table_name} from {file_path} / sheet {sheet_name}")
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            sheet = wb[sheet_name]
-            populate_table_from_excel(cursor, table_name, sheet)
+    except Exception as e:
+        return {"success": False, "message": str(e), "tables": table_stats}
+
+    failed = [name for name, stats in table_stats.items() if not stats.get("success")]
+    if failed:
+        details = "; ".join(f"{name}: {table_stats[name].get('message')}" for name in failed)
+        return {"success": False, "message": f"Staging load failed for {details}", "tables": table_stats}
+
+    loaded = [name for name, stats in table_stats.items() if not stats.get("skipped")]
+    metrics = {
+        "connect_seconds": round(sum(table_stats[name].get("connect_seconds", 0) for name in loaded), 4),
+        "execute_seconds": round(sum(table_stats[name].get("seconds", 0) for name in loaded), 4),
+        "rows_affected": sum(table_stats[name].get("rows", 0) for name in loaded),
+        "rows_rejected": sum(table_stats[name].get("rejected", 0) for name in loaded),
+    }
+    return _with_statistics({"success": True, "tables": table_stats, "metrics": metrics}, loaded)
 
-        conn.close()
-        return {"success": True}
 
-    except Exception as e:
-        return {"success": False, "message": str(e)}
-    return run_sql_task(sql_path, params)
+def _populate_staging_sequential(jobs, file_stats, fingerprint=False):
+    """Load the (table, workbook, sheet, SourceFile) jobs one after another on a single connection."""
+    workbooks = {}
+    pool = get_backend().pool()
+    started = time.perf_counter()
+    conn = pool.acquire()
+    connect_seconds = time.perf_counter() - started
+    cursor = conn.cursor()
+
+    try:
+        for table_name, file_path, sheet_name, source_file in jobs:
+            print(f"Populating {table_name} from {file_path} / sheet {sheet_name}")
+            try:
+                if file_path not in workbooks:
+                    workbooks[file_path] = open_source_workbook(file_path)
+                stats = _load_staging_table(
+                    cursor, workbooks[file_path], table_name, sheet_name,
+                    source_file=source_file, truncate=False, fingerprint=fingerprint
+                )
+                stats["connect_seconds"] = round(connect_seconds, 4)
+                connect_seconds = 0.0
+            except Exception as e:
+                conn.rollback()
+                stats = {"success": False, "message": str(e)}
+            file_stats[(table_name, file_path)] = stats
+    finally:
+        for wb in workbooks.values():
+            wb.close()
+        pool.release(conn)
+
+
+def _populate_staging_threaded(jobs, file_stats, max_workers, fingerprint=False):
+    """
+    Load the (table, workbook, sheet, SourceFile) jobs in a pool of
+    `max_workers` threads, each sheet on its own pooled connection; a
+    thread opens each workbook once for all the sheets it loads.
+    """
+    workbooks = _ThreadWorkbooks()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                # each worker logs and rejects under the run's execution_id
+                pool.submit(contextvars.copy_context().run, _load_staging_table_isolated,
+                            table_name, file_path, sheet_name, source_file, workbooks,
+                            fingerprint): (table_name, file_path)
+                for table_name, file_path, sheet_name, source_file in jobs
+            }
+            for future in as_completed(futures):
+                file_stats[futures[future]] = future.result()
+    finally:
+        workbooks.close()
+
+
+def _populate_staging_parsed(jobs, file_stats, max_workers, parse_processes, fingerprint=False):
+    """
+    Load the (table, workbook, sheet, SourceFile) jobs with the parsing in
+    a pool of `parse_processes` processes, each workbook opened once and
+    its sheets spooled to temp files (_parse_workbook_to_spools), and the
+    inserts in threads: a workbook's spools are inserted as soon as it is
+    parsed, on up to `max_workers` pooled connections, or one at a time on
+    backends with a single writer.
+
+    The processes are spawned, not forked: the flow calls this from a
+    worker thread while the log listener and the connection pool may hold
+    their locks, and a forked child would inherit them locked.
+    """
+    parallel = max_workers and max_workers > 1 and get_backend().parallel_writes
+    workbook_jobs = {}
+    for table_name, file_path, sheet_name, source_file in jobs:
+        workbook_jobs.setdefault(file_path, []).append((table_name, sheet_name, source_file))
+
+    with tempfile.TemporaryDirectory(prefix="staging_spool_") as spool_dir, \
+            ProcessPoolExecutor(max_workers=min(parse_processes, len(workbook_jobs)),
+                                mp_context=multiprocessing.get_context("spawn")) as parsers, \
+            ThreadPoolExecutor(max_workers=max_workers if parallel else 1) as loaders:
+        parses = {}
+        for index, (file_path, sheet_jobs) in enumerate(workbook_jobs.items()):
+            spools = []
+            for table_name, sheet_name, source_file in sheet_jobs:
+                print(f"Populating {table_name} from {file_path} / sheet {sheet_name}")
+                spools.append((sheet_name, os.path.join(spool_dir, f"{index}_{len(spools)}.pickle")))
+            future = parsers.submit(_parse_workbook_to_spools, file_path, spools, fingerprint=fingerprint)
+            parses[future] = (file_path, sheet_jobs, spools)
+
+        loads = {}
+        for future in as_completed(parses):
+            file_path, sheet_jobs, spools = parses[future]
+            try:
+                parsed_sheets = future.result()
+            except Exception as e:
+                parsed_sheets = [{"message": str(e)}] * len(spools)
+            for (table_name, sheet_name, source_file), (_, spool_path), parsed in zip(
+                    sheet_jobs, spools, parsed_sheets):
+                if "message" in parsed:
+                    file_stats[(table_name, file_path)] = {"success": False, "message": parsed["message"]}
+                    continue
+                # each worker logs and rejects under the run's execution_id
+                load = loaders.submit(contextvars.copy_context().run, _load_staging_spool,
+                                      table_name, sheet_name, source_file, spool_path, parsed)
+                loads[load] = (table_name, file_path)
+
+        for future in as_completed(loads):
+            file_stats[loads[future]] = future.result()
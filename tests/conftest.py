@@ -0,0 +1,66 @@
+"""
+Fixtures for the SQLite regression tests: each test gets its own
+warehouse file, fingerprint manifest, run states and log under tmp_path,
+so nothing is written to .pipeline_cache or logs/.
+"""
+
+import os
+import sys
+import shutil
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import etl_logging
+from pipeline_dimensional_data import backends, tasks, flow
+
+SOURCE_WORKBOOK = os.path.join(PROJECT_ROOT, "raw_data_source.xlsx")
+
+
+@pytest.fixture
+def warehouse(tmp_path, monkeypatch):
+    """An initialized SQLite warehouse; yields the backend."""
+    monkeypatch.setattr(tasks, "STAGING_FINGERPRINT_PATH", str(tmp_path / "staging_fingerprints.json"))
+    monkeypatch.setattr(etl_logging, "LOG_PATH", str(tmp_path / "pipeline.log"))
+    monkeypatch.setattr(flow, "write_metrics_record", lambda record: None)
+    monkeypatch.setattr(flow, "RUN_STATE_DIR", str(tmp_path / "runs"))
+
+    backend = backends.set_backend("sqlite", path=str(tmp_path / "order_dds.sqlite"))
+    result = tasks.task_initialize_dimensional_db()
+    assert result["success"], result.get("message")
+    yield backend
+
+    backends.close_connection_pool()
+    monkeypatch.setattr(backends, "_BACKEND", None)
+
+
+@pytest.fixture
+def source_workbook(tmp_path):
+    """A copy of raw_data_source.xlsx the test may edit."""
+    path = tmp_path / "source" / "raw_data_source.xlsx"
+    path.parent.mkdir()
+    shutil.copyfile(SOURCE_WORKBOOK, path)
+    return str(path)
+
+
+@pytest.fixture
+def staged(warehouse, source_workbook):
+    """The warehouse with every staging table loaded from source_workbook."""
+    result = tasks.task_populate_staging(source_path=source_workbook)
+    assert result["success"], result.get("message")
+    return warehouse
+
+
+def query(sql, params=()):
+    """All rows of one query on the current backend."""
+    with backends.get_backend().pool().connection() as conn:
+        return conn.cursor().execute(sql, params).fetchall()
+
+
+def execute(sql, params=()):
+    """Run and commit one statement on the current backend."""
+    with backends.get_backend().pool().connection() as conn:
+        conn.cursor().execute(sql, params)
+        conn.commit()
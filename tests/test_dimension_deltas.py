@@ -0,0 +1,37 @@
+"""RowHash change detection of the dimension loads: only changed staging rows reach the merge."""
+
+from conftest import execute, query
+from pipeline_dimensional_data import tasks
+
+
+def test_scd1_dimension_updates_only_the_changed_row(staged):
+    assert tasks.task_update_dim_shippers()["counts"] == {"inserted_rows": 3, "updated_rows": 0, "unchanged_rows": 0}
+    assert tasks.task_update_dim_shippers()["counts"] == {"inserted_rows": 0, "updated_rows": 0, "unchanged_rows": 3}
+
+    hashes = dict(query("SELECT Shipper_NK, RowHash FROM DimShippers"))
+    execute("UPDATE staging_Shippers SET Phone = '(503) 555-0000', SourceFile = 'fix.xlsx' WHERE ShipperID = 1")
+    staging_id = query("SELECT staging_raw_id_sk FROM staging_Shippers WHERE ShipperID = 1")[0][0]
+
+    assert tasks.task_update_dim_shippers()["counts"] == {"inserted_rows": 0, "updated_rows": 1, "unchanged_rows": 2}
+    rows = {row[0]: row[1:] for row in query(
+        "SELECT Shipper_NK, Phone, RowHash, staging_raw_id_sk, SourceFile FROM DimShippers")}
+    assert rows[1][0] == "(503) 555-0000" and rows[1][1] != hashes[1]
+    # the changed row carries the lineage of the staging row it came from
+    assert rows[1][2:] == (staging_id, "fix.xlsx")
+    assert {nk: rows[nk][1] for nk in (2, 3)} == {nk: hashes[nk] for nk in (2, 3)}
+
+
+def test_scd2_dimension_versions_only_the_changed_row(staged):
+    assert tasks.task_update_dim_customers()["counts"]["inserted_rows"] == 91
+
+    execute("UPDATE staging_Customers SET City = 'Hamburg' WHERE CustomerID = 'ALFKI'")
+    assert tasks.task_update_dim_customers()["counts"] == {"inserted_rows": 0, "updated_rows": 1, "unchanged_rows": 90}
+
+    versions = query("SELECT City, IsCurrent, ValidTo FROM DimCustomers WHERE Customer_NK = 'ALFKI' ORDER BY Customer_SK")
+    assert [(city, current) for city, current, _ in versions] == [("Berlin", 0), ("Hamburg", 1)]
+    assert versions[1][2] == "9999-12-31"
+    assert query("SELECT COUNT(*) FROM DimCustomers WHERE IsCurrent = 1") == [(91,)]
+    assert query("SELECT COUNT(*) FROM DimCustomers") == [(92,)]
+
+    # the new version is unchanged on the next load
+    assert tasks.task_update_dim_customers()["counts"]["unchanged_rows"] == 91
@@ -0,0 +1,193 @@
+"""FactOrders loads: window reloads, partitioned backfills, undated orders, the aggregates
+window and as-of resolution of the SCD2 keys."""
+
+import pytest
+
+from conftest import execute, query
+from pipeline_dimensional_data import tasks
+
+DIMENSION_TASKS = (
+    tasks.task_update_dim_categories,
+    tasks.task_update_dim_customers,
+    tasks.task_update_dim_employees,
+    tasks.task_update_dim_products,
+    tasks.task_update_dim_region,
+    tasks.task_update_dim_shippers,
+    tasks.task_update_dim_suppliers,
+    tasks.task_update_dim_territories,
+)
+
+ENGINES = ["sql", "python"]
+
+
+@pytest.fixture
+def dimensions(staged):
+    for task_fn in DIMENSION_TASKS:
+        result = task_fn()
+        assert result["success"], f"{task_fn.__name__}: {result.get('message')}"
+    return staged
+
+
+def _require(engine):
+    if engine == "python":
+        pytest.importorskip("pandas")
+
+
+def _staged_lines(start_date, end_date):
+    """Order lines staged for the [start_date, end_date] OrderDay window."""
+    return query(
+        "SELECT COUNT(*) FROM staging_OrderDetails d "
+        "JOIN staging_Orders o ON o.OrderID = d.OrderID "
+        "WHERE o.OrderDay BETWEEN ? AND ?",
+        (start_date, end_date),
+    )[0][0]
+
+
+def _fact_lines():
+    return query("SELECT COUNT(*) FROM FactOrders")[0][0] + query("SELECT COUNT(*) FROM FactOrders_Error")[0][0]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_window_load_replaces_only_its_window(dimensions, engine):
+    _require(engine)
+    full = tasks.task_update_factorders(engine=engine)
+    assert full["success"], full.get("message")
+    assert _fact_lines() == 2155
+
+    execute("UPDATE FactOrders SET Freight = -1")
+    window = tasks.task_update_factorders(start_date="1997-01-01", end_date="1997-03-31", engine=engine)
+    assert window["success"], window.get("message")
+
+    # reloaded inside the window, untouched outside it, nothing duplicated
+    assert query("SELECT COUNT(*) FROM FactOrders WHERE Freight = -1 AND OrderDay BETWEEN '1997-01-01' AND '1997-03-31'") == [(0,)]
+    assert query("SELECT COUNT(*) FROM FactOrders WHERE Freight <> -1 AND OrderDay NOT BETWEEN '1997-01-01' AND '1997-03-31'") == [(0,)]
+    assert _fact_lines() == 2155
+    assert query("SELECT COUNT(*) FROM (SELECT DISTINCT Order_NK, Product_NK FROM FactOrders)") == \
+        query("SELECT COUNT(*) FROM FactOrders")
+
+
+def test_partition_windows_merge_overlapping_ranges():
+    ranges = [("1997-05-01", "1997-08-10"), ("1997-01-15", "1997-05-31")]
+    assert tasks.partition_windows(ranges, "quarter") == [
+        ("1997-01-15", "1997-03-31"),
+        ("1997-04-01", "1997-06-30"),
+        ("1997-07-01", "1997-08-10"),
+    ]
+    assert len(tasks.partition_windows(ranges, "month")) == 8
+    with pytest.raises(ValueError):
+        tasks.merge_date_ranges([("1997-02-01", "1997-01-01")])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_backfill_loads_every_partition_once(dimensions, engine):
+    _require(engine)
+    result = tasks.task_backfill_factorders(
+        ranges=[("1997-01-15", "1997-05-31"), ("1997-05-01", "1997-08-10")], partition="month", engine=engine
+    )
+    assert result["success"], result.get("message")
+    assert len(result["partitions"]) == 8
+    assert all(stats["success"] for stats in result["partitions"].values())
+
+    expected = _staged_lines("1997-01-15", "1997-08-10")
+    assert sum(result["counts"].values()) == expected
+    assert _fact_lines() == expected
+    first_day, last_day = query("SELECT MIN(OrderDay), MAX(OrderDay) FROM FactOrders")[0]
+    assert "1997-01-15" <= first_day and last_day <= "1997-08-10"
+
+    # a second backfill of the same ranges replaces, not appends
+    assert tasks.task_backfill_factorders(ranges=[("1997-01-15", "1997-08-10")], partition="quarter",
+                                          engine=engine)["success"]
+    assert _fact_lines() == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_undated_orders_are_rejected_not_dropped(dimensions, engine):
+    _require(engine)
+    execute("UPDATE staging_Orders SET OrderDate = '04.07.1996' WHERE OrderID = 10248")
+    undated_lines = query("SELECT COUNT(*) FROM staging_OrderDetails WHERE OrderID = 10248")[0][0]
+    rejects = ("SELECT Order_NK, ErrorCode, ErrorMessage FROM FactOrders_Error "
+               "WHERE ErrorCode = 'INVALID_ORDER_DATE'")
+
+    assert tasks.task_update_factorders(engine=engine)["success"]
+    assert _fact_lines() == 2155
+    assert query(rejects) == [(10248, "INVALID_ORDER_DATE", "Missing or invalid OrderDate")] * undated_lines
+
+    # every window load replaces them; a backfill only in its first partition
+    for _ in range(2):
+        assert tasks.task_update_factorders(start_date="1997-01-01", end_date="1997-03-31", engine=engine)["success"]
+        assert len(query(rejects)) == undated_lines
+    result = tasks.task_backfill_factorders(ranges=[("1996-07-01", "1998-06-30")], partition="quarter",
+                                            engine=engine)
+    assert result["success"], result.get("message")
+    assert len(query(rejects)) == undated_lines
+    assert _fact_lines() == 2155
+
+
+AGGREGATES = {
+    "AggSalesDayCustomer": "OrderDate, Customer_SK",
+    "AggSalesProductMonth": "MonthStart, Product_SK",
+    "AggSalesEmployeeTerritoryMonth": "MonthStart, Employee_SK, Territory_SK",
+}
+
+
+def _aggregates():
+    return {
+        table: query(f"SELECT {key}, Orders, OrderLines, Quantity, ROUND(NetAmount, 2) FROM {table} ORDER BY {key}")
+        for table, key in AGGREGATES.items()
+    }
+
+
+def test_aggregates_refresh_only_the_window_and_its_months(dimensions):
+    assert tasks.task_update_factorders()["success"]
+    assert tasks.task_update_aggregates(load_mode="full")["success"]
+    before = _aggregates()
+
+    execute("UPDATE FactOrders SET Quantity = Quantity + 1 WHERE OrderDay BETWEEN '1997-01-10' AND '1997-01-20'")
+    window = tasks.task_update_aggregates(start_date="1997-01-10", end_date="1997-01-20")
+    assert window["success"], window.get("message")
+    after = _aggregates()
+
+    # the window refresh matches a rebuild ...
+    assert tasks.task_update_aggregates(load_mode="full")["success"]
+    assert after == _aggregates()
+
+    # ... and only the window's days and months changed
+    days = {row[0] for row in after["AggSalesDayCustomer"]} | {row[0] for row in before["AggSalesDayCustomer"]}
+    for day in days:
+        changed = [row for row in after["AggSalesDayCustomer"] if row[0] == day] != \
+            [row for row in before["AggSalesDayCustomer"] if row[0] == day]
+        assert changed == ("1997-01-10" <= day <= "1997-01-20"), day
+    for table in ("AggSalesProductMonth", "AggSalesEmployeeTerritoryMonth"):
+        changed_months = {row[0] for row in set(after[table]) ^ set(before[table])}
+        assert changed_months == {"1997-01-01"}, table
+
+
+def _split_customer_history(customer_nk, changed_at):
+    """Give a customer an older version valid until `changed_at` and a current one from then on."""
+    execute(
+        "INSERT INTO DimCustomers (Customer_NK, staging_raw_id_sk, SourceFile, CompanyName, City, RowHash, "
+        "ValidFrom, ValidTo, IsCurrent, SOR_SK) "
+        "SELECT Customer_NK, staging_raw_id_sk, SourceFile, CompanyName, 'Old City', RowHash, "
+        "'1996-01-01 00:00:00', ?, 0, SOR_SK FROM DimCustomers WHERE Customer_NK = ? AND IsCurrent = 1",
+        (changed_at, customer_nk),
+    )
+    execute("UPDATE DimCustomers SET ValidFrom = ? WHERE Customer_NK = ? AND IsCurrent = 1", (changed_at, customer_nk))
+    return dict(query("SELECT IsCurrent, Customer_SK FROM DimCustomers WHERE Customer_NK = ?", (customer_nk,)))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_as_of_resolves_the_version_valid_on_the_order_date(dimensions, engine):
+    _require(engine)
+    keys = _split_customer_history("ALFKI", "1997-09-01 00:00:00")
+    orders = ("SELECT DISTINCT f.Order_NK, f.OrderDay, f.Customer_SK FROM FactOrders f "
+              "JOIN staging_Orders o ON o.OrderID = f.Order_NK WHERE o.CustomerID = 'ALFKI' ORDER BY f.Order_NK")
+
+    assert tasks.task_update_factorders(engine=engine, key_resolution="as_of")["success"]
+    resolved = query(orders)
+    assert len(resolved) == 6
+    for _, order_day, customer_sk in resolved:
+        assert customer_sk == (keys[0] if order_day < "1997-09-01" else keys[1]), order_day
+    assert any(order_day < "1997-09-01" for _, order_day, _ in resolved)
+
+    assert tasks.task_update_factorders(engine=engine, key_resolution="current")["success"]
+    assert {customer_sk for _, _, customer_sk in query(orders)} == {keys[1]}
@@ -0,0 +1,129 @@
+"""
+DimensionalDataFlow: the dimension skip rule (skip only after a committed
+load of the same staging content) and resuming failed runs.
+"""
+
+import pytest
+
+from conftest import query
+from pipeline_dimensional_data import backends, flow, tasks
+from pipeline_dimensional_data.flow import DimensionalDataFlow
+from pipeline_dimensional_data.fingerprints import load_manifest
+
+
+class FakeStaging:
+    """task_populate_staging stand-in reporting one unchanged table with a fingerprint."""
+
+    __name__ = "task_populate_staging"
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+
+    def __call__(self):
+        stats = {"success": True, "skipped": True, "unchanged": True, "fingerprint": self.fingerprint}
+        return {"success": True, "tables": {"staging_Shippers": stats}}
+
+
+class FakeDimension:
+    """Dimension load stand-in that counts its runs and fails while `fail` is set."""
+
+    __name__ = "task_update_dim_shippers"
+
+    def __init__(self):
+        self.runs = 0
+        self.fail = False
+
+    def __call__(self, prereq=None):
+        self.runs += 1
+        if self.fail:
+            return {"success": False, "message": "rolled back"}
+        return {"success": True}
+
+
+def _run(staging, dimension):
+    graph = {
+        "task_populate_staging": (staging, [], {}, None),
+        "task_update_dim_shippers": (dimension, ["task_populate_staging"], {}, ["staging_Shippers"]),
+    }
+    results, _ = DimensionalDataFlow()._run_graph(graph, max_workers=2)
+    return results["task_update_dim_shippers"]
+
+
+def test_dimension_is_skipped_only_after_a_committed_load(warehouse):
+    staging = FakeStaging("fp-1")
+    dimension = FakeDimension()
+
+    # no load recorded yet: runs even though staging is unchanged
+    dimension.fail = True
+    assert not _run(staging, dimension)["success"]
+    assert "task_update_dim_shippers" not in load_manifest(tasks.staging_manifest_path())["loads"]
+
+    # the failed load is retried, and recorded once it commits
+    dimension.fail = False
+    assert _run(staging, dimension)["success"]
+    assert load_manifest(tasks.staging_manifest_path())["loads"]["task_update_dim_shippers"] == {
+        "staging_Shippers": "fp-1"
+    }
+    assert dimension.runs == 2
+
+    result = _run(staging, dimension)
+    assert result["skipped"] and result["unchanged"]
+    assert dimension.runs == 2
+
+
+def test_dimension_runs_when_staging_content_differs_from_its_last_load(warehouse):
+    dimension = FakeDimension()
+    assert _run(FakeStaging("fp-1"), dimension)["success"]
+
+    result = _run(FakeStaging("fp-2"), dimension)
+    assert result["success"] and not result.get("skipped")
+    assert dimension.runs == 2
+
+
+def test_failed_load_forgets_the_record(warehouse):
+    dimension = FakeDimension()
+    assert _run(FakeStaging("fp-1"), dimension)["success"]
+
+    dimension.fail = True
+    assert not _run(FakeStaging("fp-2"), dimension)["success"]
+    assert "task_update_dim_shippers" not in load_manifest(tasks.staging_manifest_path())["loads"]
+
+    # nothing recorded any more, so even the previously loaded content runs again
+    dimension.fail = False
+    result = _run(FakeStaging("fp-1"), dimension)
+    assert result["success"] and not result.get("skipped")
+    assert dimension.runs == 3
+
+
+def _failing_fact_load(**kwargs):
+    return {"success": False, "message": "deadlock victim"}
+
+
+_failing_fact_load.__name__ = "task_update_factorders"
+
+
+def test_resume_reruns_only_the_failed_tasks_on_the_recorded_backend(warehouse, source_workbook, monkeypatch):
+    monkeypatch.setattr(flow, "task_update_factorders", _failing_fact_load)
+    failed = DimensionalDataFlow(source_path=source_workbook).exec("1996-07-01", "1998-06-30")
+    assert not failed["success"]
+    monkeypatch.setattr(flow, "task_update_factorders", tasks.task_update_factorders)
+
+    # a new process: default backend, no --backend given
+    backends.set_backend("sqlserver")
+    resumed = DimensionalDataFlow(execution_id=failed["execution_id"]).resume()
+
+    assert resumed["success"], resumed["tasks"]
+    assert backends.get_backend().identity == warehouse.identity
+    assert set(resumed["resumed_tasks"]) >= {"task_initialize_dimensional_db", "task_populate_staging",
+                                             "task_update_dim_customers"}
+    assert "task_update_factorders" not in resumed["resumed_tasks"]
+    assert resumed["tasks"]["task_update_dim_customers"]["resumed"]
+    assert query("SELECT COUNT(*) FROM FactOrders") == [(2155,)]
+
+
+def test_resume_refuses_another_backend(warehouse, source_workbook, monkeypatch):
+    monkeypatch.setattr(flow, "task_update_factorders", _failing_fact_load)
+    failed = DimensionalDataFlow(source_path=source_workbook).exec("1996-07-01", "1998-06-30")
+
+    with pytest.raises(ValueError, match="sqlite backend, not sqlserver"):
+        DimensionalDataFlow(execution_id=failed["execution_id"]).resume(backend="sqlserver")
@@ -0,0 +1,98 @@
+"""run_sql_task: transactions, savepoints, the compiled templates with their bind parameters
+and the connection pool."""
+
+import os
+import sqlite3
+
+import pytest
+
+from conftest import query
+from pipeline_dimensional_data import tasks
+from utils import ConnectionPool, load_sql_template
+
+BATCHES = """
+INSERT INTO Dim_SOR (SOR_Name) VALUES ('BATCH_1');
+GO
+INSERT INTO Dim_SOR (SOR_Name) VALUES ('BATCH_2');
+GO
+INSERT INTO Dim_SOR (SOR_Name) VALUES ('BATCH_1');  -- violates UX_Dim_SOR_Name
+"""
+
+
+def _script(tmp_path, name, sql_text):
+    """Write a script's SQLite port and return the path run_sql_task takes."""
+    port = tmp_path / "sqlite" / name
+    port.parent.mkdir(exist_ok=True)
+    port.write_text(sql_text, encoding="utf-8")
+    return str(tmp_path / name)
+
+
+def _batch_rows():
+    return query("SELECT SOR_Name FROM Dim_SOR WHERE SOR_Name LIKE 'BATCH_%' ORDER BY SOR_Name")
+
+
+def test_failed_batch_rolls_back_the_whole_task(warehouse, tmp_path):
+    result = tasks.run_sql_task(_script(tmp_path, "batches.sql", BATCHES), {}, savepoints=False)
+    assert not result["success"]
+    assert _batch_rows() == []
+
+
+def test_savepoint_rolls_back_only_the_failed_batch(warehouse, tmp_path):
+    result = tasks.run_sql_task(_script(tmp_path, "batches.sql", BATCHES), {}, savepoints=True)
+    assert not result["success"]
+    assert "batch 3 rolled back to its savepoint, batches 1-2 committed" in result["message"]
+    assert _batch_rows() == [("BATCH_1",), ("BATCH_2",)]
+
+
+def test_batch_mode_commits_every_batch_before_the_failure(warehouse, tmp_path):
+    result = tasks.run_sql_task(_script(tmp_path, "batches.sql", BATCHES), {}, transaction="batch")
+    assert not result["success"]
+    assert result["metrics"]["commits"] == 2
+    assert _batch_rows() == [("BATCH_1",), ("BATCH_2",)]
+
+
+def test_bind_parameters_keep_the_statement_text(warehouse, tmp_path):
+    path = _script(tmp_path, "count.sql", (
+        "-- PARAMETERS: @table_name, @sor_name (comments are never bound)\n"
+        "SELECT COUNT(*) AS matches FROM @table_name WHERE SOR_Name = @sor_name;"
+    ))
+    template = load_sql_template(warehouse.script_path(path))
+    first = template.render({"table_name": "Dim_SOR"}, {"sor_name": "A"})
+    second = template.render({"table_name": "Dim_SOR"}, {"sor_name": "B"})
+    assert [values for _, values in first] == [["A"]]
+    assert first[0][0] == second[0][0] and "?" in first[0][0] and "Dim_SOR" in first[0][0]
+
+    tasks.run_sql_task(_script(tmp_path, "seed.sql", "INSERT INTO Dim_SOR (SOR_Name) VALUES ('A');"), {})
+    counts = [
+        tasks.run_sql_task(path, {"table_name": "Dim_SOR"}, {"sor_name": name})["counts"]["matches"]
+        for name in ("A", "B")
+    ]
+    assert counts == [1, 0]
+
+
+def test_template_is_compiled_once_until_the_file_changes(tmp_path):
+    path = tmp_path / "cached.sql"
+    path.write_text("SELECT 1;", encoding="utf-8")
+    template = load_sql_template(str(path))
+    assert load_sql_template(str(path)) is template
+
+    path.write_text("SELECT 2;\nGO\nSELECT 3;", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = load_sql_template(str(path))
+    assert reloaded is not template and len(reloaded.batches) == 2
+
+
+def test_close_all_closes_checked_out_connections_on_release():
+    pool = ConnectionPool(lambda: sqlite3.connect(":memory:"), size=2)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+
+    pool.close_all()
+    pool.release(busy)
+
+    for conn in (idle, busy):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,71 @@
+"""Staging loads: the fingerprint manifest skip rule and the parse paths."""
+
+import openpyxl
+
+from conftest import query
+from pipeline_dimensional_data import tasks
+from pipeline_dimensional_data.fingerprints import load_manifest
+
+
+def _set_cell(workbook_path, sheet_name, cell, value):
+    wb = openpyxl.load_workbook(workbook_path)
+    wb[sheet_name][cell] = value
+    wb.save(workbook_path)
+
+
+def test_unchanged_workbook_is_not_reloaded(warehouse, source_workbook):
+    first = tasks.task_populate_staging(source_path=source_workbook)
+    assert first["success"], first.get("message")
+    assert not any(stats.get("unchanged") for stats in first["tables"].values())
+
+    second = tasks.task_populate_staging(source_path=source_workbook)
+    assert second["success"], second.get("message")
+    for table_name, stats in second["tables"].items():
+        assert stats["skipped"] and stats["unchanged"], table_name
+        assert stats["fingerprint"] == first["tables"][table_name]["fingerprint"]
+    # skipped, not truncated
+    assert query("SELECT COUNT(*) FROM staging_Orders") == [(830,)]
+
+
+def test_changed_sheet_is_reloaded_and_resaved_sheets_stay_unchanged(warehouse, source_workbook):
+    first = tasks.task_populate_staging(source_path=source_workbook)
+    assert first["success"], first.get("message")
+
+    _set_cell(source_workbook, "Shippers", "C2", "(503) 555-0000")
+    result = tasks.task_populate_staging(source_path=source_workbook)
+    assert result["success"], result.get("message")
+
+    shippers = result["tables"]["staging_Shippers"]
+    assert not shippers.get("skipped") and not shippers.get("unchanged")
+    assert shippers["fingerprint"] != first["tables"]["staging_Shippers"]["fingerprint"]
+    assert query("SELECT Phone FROM staging_Shippers WHERE ShipperID = 1") == [("(503) 555-0000",)]
+
+    # the whole workbook was rewritten, but these sheets kept their values
+    region = result["tables"]["staging_Region"]
+    assert not region.get("skipped") and region["unchanged"]
+    assert region["fingerprint"] == first["tables"]["staging_Region"]["fingerprint"]
+
+    manifest = load_manifest(tasks.staging_manifest_path())
+    assert manifest["tables"]["staging_Shippers"]["sources"][source_workbook]["rows"] == 3
+
+
+def test_failed_load_forgets_the_fingerprint(warehouse, source_workbook, monkeypatch):
+    assert tasks.task_populate_staging(source_path=source_workbook)["success"]
+
+    _set_cell(source_workbook, "Shippers", "C2", "(503) 555-0000")
+    monkeypatch.setitem(tasks.STAGING_TABLES, "staging_Shippers", (tasks.SOURCE_PATH, "NoSuchSheet"))
+    failed = tasks.task_populate_staging(source_path=source_workbook)
+    assert not failed["success"]
+    assert "staging_Shippers" not in load_manifest(tasks.staging_manifest_path())["tables"]
+
+
+def test_parse_processes_and_threads_stage_the_same_rows(warehouse, source_workbook):
+    in_processes = tasks.task_populate_staging(source_path=source_workbook, skip_unchanged=False,
+                                               parse_processes=2)
+    process_rows = query("SELECT OrderID, CustomerID, OrderDate, OrderDay FROM staging_Orders ORDER BY OrderID")
+
+    in_threads = tasks.task_populate_staging(source_path=source_workbook, skip_unchanged=False,
+                                             parse_processes=0)
+    assert in_processes["success"] and in_threads["success"]
+    assert query("SELECT OrderID, CustomerID, OrderDate, OrderDay FROM staging_Orders ORDER BY OrderID") == process_rows
+    assert process_rows[0][2] == "1996-07-04 00:00:00" and process_rows[0][3] == "1996-07-04"
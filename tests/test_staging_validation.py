@@ -0,0 +1,77 @@
+"""Typed validation of staging rows and the rejects file."""
+
+import json
+
+import openpyxl
+import pytest
+
+from conftest import query
+from pipeline_dimensional_data import tasks
+
+
+def test_validation_coerces_and_rejects(warehouse, tmp_path):
+    pytest.importorskip("pandas")
+    from pipeline_dimensional_data.staging_validation import StagingValidator
+
+    rejects_path = tmp_path / "rejects.jsonl"
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.append(["ShipperID", "CompanyName", "Phone"])
+    sheet.append([1, "Speedy Express", "(503) 555-9831"])
+    sheet.append(["2", "United Package", "(503) 555-3199"])   # numeric text, coerced
+    sheet.append(["three", "Federal Shipping", None])         # not an integer
+    sheet.append([4, "x" * 300, None])                        # longer than NVARCHAR(255)
+
+    validator = StagingValidator("staging_Shippers", "Shippers", "shippers.xlsx",
+                                 rejects_path=str(rejects_path))
+    with warehouse.pool().connection() as conn:
+        inserted = tasks.populate_table_from_excel(conn.cursor(), "staging_Shippers", sheet,
+                                                   source_file="shippers.xlsx", validator=validator)
+
+    assert inserted == 2 and validator.rejected == 2
+    assert query("SELECT ShipperID, typeof(ShipperID), SourceFile FROM staging_Shippers ORDER BY ShipperID") == [
+        (1, "integer", "shippers.xlsx"),
+        (2, "integer", "shippers.xlsx"),
+    ]
+
+    rejects = [json.loads(line) for line in rejects_path.read_text(encoding="utf-8").splitlines()]
+    assert [(reject["row"], reject["errors"]) for reject in rejects] == [
+        (4, ["ShipperID: not an integer"]),
+        (5, ["CompanyName: longer than 255 characters"]),
+    ]
+    assert rejects[0]["table"] == "staging_Shippers" and rejects[0]["source_file"] == "shippers.xlsx"
+
+
+def test_validation_rejects_dates_that_are_not_iso(tmp_path):
+    pytest.importorskip("pandas")
+    from pipeline_dimensional_data.staging_validation import StagingValidator
+
+    rejects_path = tmp_path / "rejects.jsonl"
+    validator = StagingValidator("staging_Employees", "Employees", "employees.xlsx",
+                                 rejects_path=str(rejects_path))
+    names = [name for name, _, _ in validator.columns]
+
+    def employee(employee_id, birth_date, hire_date):
+        values = dict.fromkeys(names)
+        values.update(EmployeeID=employee_id, LastName="Davolio", BirthDate=birth_date, HireDate=hire_date)
+        return [values[name] for name in names]
+
+    rows = [
+        (2, employee(1, "1948-12-08 00:00:00", "1992-05-01")),
+        (3, employee(2, "", None)),                          # blank / missing: NULL
+        (4, employee(3, "08/12/1948", "1992-05-01")),        # not ISO
+        (5, employee(4, "1948-02-30 00:00:00", "1992-05-01 25:00:00")),  # no such day / hour
+        (6, employee(5, 19481208, "1992-05-01")),            # not text
+    ]
+    valid = list(validator.filter(rows, len(names), batch_size=10))
+
+    assert [(row[names.index("EmployeeID")], row[names.index("BirthDate")]) for row in valid] == [
+        (1, "1948-12-08 00:00:00"),
+        (2, None),
+    ]
+    rejects = [json.loads(line) for line in rejects_path.read_text(encoding="utf-8").splitlines()]
+    assert [(reject["row"], reject["errors"]) for reject in rejects] == [
+        (4, ["BirthDate: not an ISO date"]),
+        (5, ["BirthDate: not an ISO date", "HireDate: not an ISO date"]),
+        (6, ["BirthDate: not an ISO date"]),
+    ]
@@ -6,16 +6,25 @@ Utility functions for DS206 Project 2 ETL Pipeline.
 Supports:
 - Reading SQL files from disk
 - Replacing T-SQL style template parameters (@param)
-- Loading SQL Server config
+- Compiling SQL scripts into cached templates with bind parameters
+- Loading SQL Server config (cached per process)
 - Creating DB connections via pyodbc
+- Pooling DB connections across tasks (any backend's connect function)
 - Executing parameterized SQL scripts
+- Bulk inserting rows in batches
 - Generating UUIDs & timestamps
 """
 
 import os
+import re
 import uuid
+import time
+import queue
+import itertools
 import datetime
-import pyodbc
+import threading
+import functools
+import contextlib
 import configparser
 
 
@@ -50,12 +59,127 @@ def render_sql(sql_text: str, params: dict) -> str:
     return sql_text
 
 
+# ==============================================================
+# 2b. Compiled SQL templates (parsed once, cached by path + mtime)
+# ==============================================================
+
+_GO_PATTERN = re.compile(r"^\s*GO\s*;?\s*$", re.IGNORECASE | re.MULTILINE)
+_PLACEHOLDER_PATTERN = re.compile(r"(?<![@\w])@(\w+)")
+# string literal | line comment | block comment | @placeholder
+_TOKEN_PATTERN = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/|(?<![@\w])@\w+", re.DOTALL)
+
+_TEMPLATE_CACHE = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+
+def _compile_batch(batch: str) -> list:
+    """
+    Split one batch into literal text and (name, bindable) placeholders.
+
+    Comments are dropped. Placeholders inside string literals (e.g.
+    OBJECT_ID('@schema_name.Table')) can only be substituted as text.
+    """
+    parts = []
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(batch):
+        parts.append(batch[position:match.start()])
+        token = match.group(0)
+        if token.startswith("'"):
+            for index, piece in enumerate(_PLACEHOLDER_PATTERN.split(token)):
+                parts.append(piece if index % 2 == 0 else (piece, False))
+        elif token.startswith("@"):
+            parts.append((token[1:], True))
+        position = match.end()
+    parts.append(batch[position:])
+    return parts
+
+
+class SqlTemplate:
+    """
+    A SQL script split into GO batches, each batch pre-split into literal
+    text and @placeholder names.
+
+    render() substitutes identifiers (database / schema / table names) as
+    text and turns data values into ODBC "?" parameters, so the batch text
+    (and therefore SQL Server's cached plan) is the same for every value.
+    @names that are not passed in (local variables such as @load_time)
+    are left untouched.
+    """
+
+    def __init__(self, path: str, sql_text: str):
+        self.path = path
+        self.batches = [
+            _compile_batch(batch.strip())
+            for batch in _GO_PATTERN.split(sql_text)
+            if batch.strip()
+        ]
+
+    @property
+    def placeholders(self) -> set:
+        return {part[0] for parts in self.batches for part in parts if isinstance(part, tuple)}
+
+    def render(self, params: dict, bind_params: dict = None) -> list:
+        """
+        Returns:
+            list of (sql_text, [bind values]) per batch
+        """
+        bind_params = bind_params or {}
+        rendered = []
+        for parts in self.batches:
+            chunks = []
+            values = []
+            for part in parts:
+                if not isinstance(part, tuple):
+                    chunks.append(part)
+                    continue
+                name, bindable = part
+                if name in bind_params:
+                    if not bindable:
+                        raise ValueError(f"@{name} is inside a string literal in {self.path} and cannot be bound")
+                    chunks.append("?")
+                    values.append(bind_params[name])
+                elif name in params:
+                    chunks.append(str(params[name]))
+                else:
+                    chunks.append("@" + name)
+            rendered.append(("".join(chunks), values))
+        return rendered
+
+
+def load_sql_template(filepath: str) -> SqlTemplate:
+    """Return the compiled template for a SQL file, re-parsing only if the file changed."""
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"SQL file not found: {filepath}")
+
+    key = os.path.abspath(filepath)
+    with _TEMPLATE_CACHE_LOCK:
+        cached = _TEMPLATE_CACHE.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    template = SqlTemplate(filepath, read_sql_file(filepath))
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE[key] = (mtime, template)
+    return template
+
+
 # ==============================================================
 # 3. Load DB config file
 # ==============================================================
 
 def load_db_config(cfg_path: str = "sql_server_config.cfg") -> dict:
-    """Load config from the project root regardless of where Python is executed."""
+    """
+    Load config from the project root regardless of where Python is executed.
+
+    The file is parsed once per process; callers get their own copy.
+    """
+    return dict(_load_db_config_cached(cfg_path))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_db_config_cached(cfg_path: str) -> dict:
 
     # Directory of this utils.py file
     utils_dir = os.path.dirname(os.path.abspath(__file__))
@@ -91,6 +215,10 @@ def load_db_config(cfg_path: str = "sql_server_config.cfg") -> dict:
 
 def create_db_connection(cfg: dict):
     """Return a live SQL Server connection."""
+    try:
+        import pyodbc  # optional, imported on first connect: only the SQL Server backend needs it
+    except ImportError:
+        raise ImportError("The SQL Server backend needs pyodbc (pip install pyodbc)")
 
     # Build connection string
     if cfg["trusted_connection"].lower() == "yes":
@@ -119,22 +247,288 @@ def create_db_connection(cfg: dict):
         raise ConnectionError(f"Failed SQL connection: {e}")
 
 # ==============================================================
-# 5. Execute SQL (with replaced params)
+# 5. Connection pool
+# ==============================================================
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable DB connections, opened with `connect`
+    (a zero-argument function, e.g. a backend's connect method).
+
+    - At most `size` connections are checked out at once
+      (acquire blocks until one is returned).
+    - Idle connections are health-checked (SELECT 1) before reuse when they
+      have been idle longer than `health_check_after` seconds; dead ones are
+      discarded and replaced.
+    - Returned connections are rolled back so no open transaction leaks
+      into the next task.
+    - close_all closes the idle connections at once and every checked-out
+      one when it is released, so none outlives the pool.
+    """
+
+    def __init__(self, connect, size: int = 8, health_check_after: float = 30.0):
+        self._connect = connect
+        self.size = size
+        self.health_check_after = health_check_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _is_healthy(self, conn) -> bool:
+        try:
+            conn.cursor().execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: float = None):
+        """Check out a connection, reusing an idle one when possible."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No pooled connection available within {timeout}s")
+
+        try:
+            while True:
+                try:
+                    conn, idle_since = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+
+                if (time.monotonic() - idle_since < self.health_check_after
+                        or self._is_healthy(conn)):
+                    with self._lock:
+                        self.reused += 1
+                    return conn
+
+                self._close_quietly(conn)
+                with self._lock:
+                    self.discarded += 1
+
+            conn = self._connect()
+            with self._lock:
+                self.created += 1
+            return conn
+
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool (rolled back, ready for reuse).
+
+        After close_all the connection is closed instead of pooled.
+        """
+        try:
+            conn.rollback()
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._idle.put((conn, time.monotonic()))
+            if closed:
+                self._close_quietly(conn)
+        except Exception:
+            self._close_quietly(conn)
+            with self._lock:
+                self.discarded += 1
+        finally:
+            self._slots.release()
+
+    @contextlib.contextmanager
+    def connection(self, timeout: float = None):
+        """Context manager: `with pool.connection() as conn: ...`"""
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+                "idle": self._idle.qsize(),
+            }
+
+    def close_all(self):
+        """
+        Close every idle connection; connections still checked out are
+        closed when they are released.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(conn)
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_connection_pool(size: int = 8, connect=None) -> ConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use.
+
+    `connect` opens one connection (default: SQL Server from
+    sql_server_config.cfg); it only matters for the call that creates the pool.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            if connect is None:
+                connect = functools.partial(create_db_connection, load_db_config())
+            _POOL = ConnectionPool(connect, size=size)
+        return _POOL
+
+
+def close_connection_pool():
+    """Close and forget the process-wide connection pool."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close_all()
+            _POOL = None
+
+
+# ==============================================================
+# 6. Execute SQL (with replaced params)
 # ==============================================================
 
-def execute_sql(conn, sql_text: str):
-    """Execute SQL using pyodbc."""
+def execute_sql(conn, sql_text: str, rowcounts: list = None, params: list = None,
+                commit: bool = True) -> list:
+    """
+    Execute SQL using pyodbc.
+
+    `params` are bound to the "?" markers in `sql_text` (see SqlTemplate).
+
+    Every result set of the batch is drained (so errors raised by later
+    statements surface before commit). If `rowcounts` is given, the
+    cursor.rowcount of every statement that reports one is appended to it.
+
+    With commit=False the batch is left in the open transaction, and on
+    error nothing is rolled back: the caller owns the transaction.
+
+    Returns:
+        list: rows of the last result set produced by the batch, as dicts
+    """
     cursor = conn.cursor()
     try:
-        cursor.execute(sql_text)
-        conn.commit()
+        if params:
+            cursor.execute(sql_text, *params)
+        else:
+            cursor.execute(sql_text)
+        rows = []
+        while True:
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            elif rowcounts is not None and cursor.rowcount >= 0:
+                rowcounts.append(cursor.rowcount)
+            if not cursor.nextset():
+                break
+        if commit:
+            conn.commit()
+        return rows
     except Exception as e:
-        conn.rollback()
+        if commit:
+            conn.rollback()
         raise RuntimeError(f"SQL execution failed: {e}")
 
 
 # ==============================================================
-# 6. UUID + timestamp helpers
+# 7. Bulk insert (fast_executemany, multi-row VALUES fallback)
+# ==============================================================
+
+# SQL Server limits: 2100 parameters per statement,
+# 1000 rows per table value constructor.
+MAX_SQL_PARAMS = 2100
+MAX_VALUES_ROWS = 1000
+
+
+def _insert_values_chunks(cursor, table_name: str, rows: list, num_cols: int, columns_sql: str):
+    """Insert rows as multi-row INSERT ... VALUES statements."""
+    chunk_size = max(1, min(MAX_VALUES_ROWS, (MAX_SQL_PARAMS - 1) // num_cols))
+    row_sql = "(" + ", ".join(["?"] * num_cols) + ")"
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        query = (
+            f"INSERT INTO {table_name}{columns_sql} VALUES "
+            + ", ".join([row_sql] * len(chunk))
+        )
+        cursor.execute(query, [value for row in chunk for value in row])
+
+
+def bulk_insert(cursor, table_name: str, rows, num_cols: int,
+                batch_size: int = 5000, columns: list = None) -> int:
+    """
+    Insert an iterable of row tuples into a table in batches.
+
+    Each batch is sent with pyodbc executemany + fast_executemany.
+    If the driver cannot do fast_executemany (first batch fails),
+    the load falls back to multi-row INSERT ... VALUES chunks.
+    The caller is responsible for committing.
+
+    Returns:
+        int: number of rows inserted
+    """
+    columns_sql = f" ({', '.join(columns)})" if columns else ""
+    placeholders = ", ".join(["?"] * num_cols)
+    query = f"INSERT INTO {table_name}{columns_sql} VALUES ({placeholders})"
+
+    try:
+        cursor.fast_executemany = True
+        use_fast = True
+    except AttributeError:
+        use_fast = False
+
+    rows = iter(rows)
+    total = 0
+    first_batch = True
+
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+
+        if use_fast:
+            try:
+                cursor.executemany(query, batch)
+            except Exception:
+                if not first_batch:
+                    raise
+                # Driver rejected fast_executemany — undo and fall back
+                cursor.rollback()
+                cursor.fast_executemany = False
+                use_fast = False
+                _insert_values_chunks(cursor, table_name, batch, num_cols, columns_sql)
+        else:
+            _insert_values_chunks(cursor, table_name, batch, num_cols, columns_sql)
+
+        total += len(batch)
+        first_batch = False
+
+    return total
+
+
+# ==============================================================
+# 8. UUID + timestamp helpers
 # ==============================================================
 
 def get_uuid() -> str: